@@ -5,7 +5,8 @@ from .models import (
     Mission,
     FuelEntry,
     Notification,
-    WeeklyStats
+    WeeklyStats,
+    DriverHoursCredit
 )
 
 # ======================================================
@@ -176,3 +177,19 @@ class WeeklyStatsAdmin(admin.ModelAdmin):
 
     list_filter = ('week_start',)
     ordering = ('-week_start',)
+
+
+# ======================================================
+# DRIVER HOURS CREDIT
+# ======================================================
+@admin.register(DriverHoursCredit)
+class DriverHoursCreditAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'driver',
+        'mission',
+        'hours',
+        'created_at',
+    )
+
+    ordering = ('-created_at',)
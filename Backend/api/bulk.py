@@ -0,0 +1,183 @@
+import codecs
+import csv
+from itertools import islice
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .models import Driver, Truck, Mission
+from .scheduling import load_schedules
+from .stats import invalidate_dashboard_summary
+
+
+# =========================
+# IMPORT DE MISSIONS EN MASSE
+# =========================
+BULK_CHUNK_SIZE = 1000
+
+
+class MissionBulkRowSerializer(serializers.ModelSerializer):
+    """
+    Validation d'une ligne d'import, sans aucune requête SQL
+
+    driver_id / truck_id sont de simples entiers : ils sont résolus
+    par lot (in_bulk) au lieu d'un SELECT par ligne.
+    """
+    driver_id = serializers.IntegerField(required=False, allow_null=True)
+    truck_id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Mission
+        fields = [
+            'driver_id',
+            'truck_id',
+            'departure_city',
+            'departure_address',
+            'departure_lat',
+            'departure_lng',
+            'departure_place_id',
+            'pickup_time',
+            'arrival_city',
+            'arrival_address',
+            'arrival_lat',
+            'arrival_lng',
+            'arrival_place_id',
+            'expected_dropoff_time',
+            'container_number',
+            'container_type',
+            'distance',
+            'estimated_fuel_cost',
+        ]
+        extra_kwargs = {'estimated_fuel_cost': {'required': False}}
+
+
+def read_csv_rows(stream, encoding='utf-8'):
+    """Lit un CSV (avec en-tête) ligne par ligne, sans charger tout le corps en mémoire"""
+    for row in csv.DictReader(codecs.iterdecode(stream, encoding)):
+        # Cellule vide = champ absent (lat / lng / place_id optionnels)
+        yield {key: value for key, value in row.items() if key and value != ''}
+
+
+def _validate_chunk(rows, offset, schedules):
+    """
+    Valide un lot de lignes avec un nombre constant de requêtes :
+    1 pour les camions, 1 pour les chauffeurs, 1 pour les camions déjà en mission,
+    1 par type de ressource pour les créneaux pas encore chargés
+
+    `schedules` ({'truck': {id: Schedule}, 'driver': {...}}) est partagé entre
+    les lots : un double booking à l'intérieur même de l'import est aussi refusé.
+    """
+    errors = []
+    valid = []
+
+    for index, row in enumerate(rows, start=offset):
+        serializer = MissionBulkRowSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({'row': index, 'errors': serializer.errors})
+
+    truck_ids = {data['truck_id'] for _, data in valid if data.get('truck_id')}
+    driver_ids = {data['driver_id'] for _, data in valid if data.get('driver_id')}
+
+    trucks = Truck.objects.in_bulk(truck_ids)
+    drivers = Driver.objects.in_bulk(driver_ids)
+    busy_trucks = dict(
+        Mission.objects.filter(truck_id__in=truck_ids, status='in_progress').values_list('truck_id', 'id')
+    )
+    load_schedules('truck', trucks.keys(), schedules['truck'])
+    load_schedules('driver', drivers.keys(), schedules['driver'])
+
+    missions = []
+
+    for index, data in valid:
+        row_errors = {}
+        truck = trucks.get(data.get('truck_id'))
+        driver = drivers.get(data.get('driver_id'))
+
+        # Mêmes règles que MissionSerializer.validate
+        if data.get('truck_id') and truck is None:
+            row_errors['truck_id'] = 'Camion introuvable.'
+        elif truck and truck.id in busy_trucks:
+            row_errors['truck'] = f'Ce camion est déjà assigné à la mission #{busy_trucks[truck.id]} en cours.'
+
+        if data.get('driver_id') and driver is None:
+            row_errors['driver_id'] = 'Chauffeur introuvable.'
+        elif driver:
+            estimated_hours = (data['expected_dropoff_time'] - data['pickup_time']).total_seconds() / 3600
+            if estimated_hours > 0 and not driver.has_capacity_for_mission(estimated_hours):
+                row_errors['driver'] = (
+                    f'{driver.name} n\'a que {driver.get_remaining_hours():.1f}h disponibles '
+                    f'(besoin : {estimated_hours:.1f}h)'
+                )
+
+        start, end = data['pickup_time'], data['expected_dropoff_time']
+        if not row_errors:
+            for field, resource, label in (('truck', truck, 'Ce camion'), ('driver', driver, 'Ce chauffeur')):
+                conflict = resource and schedules[field][resource.id].conflict(start, end)
+                if conflict:
+                    where = f'mission #{conflict}' if isinstance(conflict, int) else f'ligne {conflict[1]}'
+                    row_errors[field] = f'{label} est déjà réservé sur ce créneau ({where}).'
+
+        if row_errors:
+            errors.append({'row': index, 'errors': row_errors})
+            continue
+
+        if truck:
+            schedules['truck'][truck.id].add(start, end, ('row', index))
+        if driver:
+            schedules['driver'][driver.id].add(start, end, ('row', index))
+
+        distance = data.get('distance', 0)
+        if truck and distance > 0:
+            data['estimated_fuel_cost'] = round(truck.calculate_fuel_cost(distance), 2)
+        else:
+            data.setdefault('estimated_fuel_cost', 0)
+
+        missions.append(Mission(**data))
+
+    return missions, errors
+
+
+def bulk_create_missions(rows, partial=False, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Crée des missions en masse depuis un itérable de dicts (JSON ou CSV)
+
+    Les lignes sont traitées par lots (validation + bulk_create) dans une
+    seule transaction. Sans `partial`, la moindre erreur annule tout l'import ;
+    avec `partial`, seules les lignes valides sont créées.
+
+    Retourne {'created': n, 'ids': [...], 'errors': [{'row': i, 'errors': {...}}]}
+    """
+    rows = iter(rows)
+    created_ids = []
+    errors = []
+    offset = 0
+    schedules = {'truck': {}, 'driver': {}}
+
+    with transaction.atomic():
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            missions, chunk_errors = _validate_chunk(chunk, offset, schedules)
+            errors.extend(chunk_errors)
+            offset += len(chunk)
+
+            if errors and not partial:
+                # Continuer la validation pour tout rapporter, sans insérer
+                continue
+
+            created = Mission.objects.bulk_create(missions, batch_size=chunk_size)
+            created_ids.extend(m.pk for m in created)
+
+        if errors and not partial:
+            transaction.set_rollback(True)
+            created_ids = []
+
+    if created_ids:
+        invalidate_dashboard_summary()
+
+    errors.sort(key=lambda e: e['row'])
+    return {'created': len(created_ids), 'ids': created_ids, 'errors': errors}
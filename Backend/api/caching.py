@@ -0,0 +1,114 @@
+import math
+import random
+import threading
+import time
+
+from django.core.cache import cache
+
+
+# =========================
+# CACHE AVEC PROTECTION CONTRE LES STAMPEDES
+# =========================
+# Chaque entrée est stockée avec son coût de calcul et son expiration logique :
+#   { 'value': ..., 'delta': secondes de calcul, 'expires': timestamp }
+#
+# - Expiration anticipée probabiliste (XFetch) : plus l'échéance approche et
+#   plus le calcul est coûteux, plus une requête a de chances de recalculer
+#   avant l'expiration — les recalculs sont étalés au lieu d'arriver tous en même temps.
+# - Single-flight : un verrou (cache.add, atomique en Redis / locmem) garantit
+#   qu'un seul worker recalcule ; les autres servent l'ancienne valeur
+#   (conservée STALE_GRACE fois le TTL) ou attendent brièvement le résultat.
+# - Un verrou local (pool fixe, indexé par hash de la clé) regroupe aussi les
+#   threads d'un même processus ; mémoire bornée quel que soit le nombre de clés.
+
+EARLY_EXPIRATION_BETA = 1.0
+STALE_GRACE = 2
+LOCK_TIMEOUT = 10  # secondes
+WAIT_STEP = 0.05
+LOCAL_LOCK_STRIPES = 64
+
+_local_locks = tuple(threading.Lock() for _ in range(LOCAL_LOCK_STRIPES))
+
+
+def _local_lock(key):
+    # Deux clés peuvent partager un verrou : au pire elles se recalculent l'une après l'autre
+    return _local_locks[hash(key) % LOCAL_LOCK_STRIPES]
+
+
+def _is_fresh(entry, beta):
+    if entry is None:
+        return False
+    # XFetch : now - delta * beta * log(rand) >= expires → recalcul anticipé
+    jitter = entry['delta'] * beta * math.log(random.random() or 1e-12)
+    return time.time() - jitter < entry['expires']
+
+
+def get_or_compute(key, compute, ttl, version=None, beta=EARLY_EXPIRATION_BETA):
+    """
+    Retourne la valeur en cache ou la calcule avec `compute()`
+
+    Au plus un recalcul simultané par clé (tous workers confondus) ;
+    pendant ce recalcul, les autres requêtes reçoivent la valeur précédente.
+    """
+    entry = cache.get(key, version=version)
+    if _is_fresh(entry, beta):
+        return entry['value']
+
+    with _local_lock(key):
+        # Un autre thread de ce processus a peut-être déjà recalculé
+        entry = cache.get(key, version=version)
+        if _is_fresh(entry, beta):
+            return entry['value']
+
+        lock_key = f'{key}:lock'
+        deadline = time.time() + LOCK_TIMEOUT
+
+        while not (locked := cache.add(lock_key, True, LOCK_TIMEOUT, version=version)):
+            # Un autre worker recalcule : servir l'ancienne valeur si elle existe
+            if entry is not None:
+                return entry['value']
+            if time.time() >= deadline:
+                # Verrou toujours pris : on calcule sans lui, et sans le libérer
+                break
+            time.sleep(WAIT_STEP)
+            entry = cache.get(key, version=version)
+            if entry is not None:
+                return entry['value']
+
+        try:
+            start = time.time()
+            value = compute()
+            delta = time.time() - start
+
+            cache.set(
+                key,
+                {'value': value, 'delta': delta, 'expires': time.time() + ttl},
+                ttl * STALE_GRACE,
+                version=version,
+            )
+            return value
+        finally:
+            if locked:
+                cache.delete(lock_key, version=version)
+
+
+def _fresh_version():
+    # Horodatage en ns : supérieur à toute version déjà utilisée (ancienne
+    # graine + un incr par invalidation), même si la clé a été évincée
+    return time.time_ns()
+
+
+def get_namespace_version(namespace):
+    """Version courante d'un espace de clés (voir bump_namespace_version)"""
+    return cache.get_or_set(f'{namespace}:version', _fresh_version, None)
+
+
+def bump_namespace_version(namespace):
+    """Invalide en une opération toutes les clés d'un espace (ex. stats chauffeurs)"""
+    try:
+        cache.incr(f'{namespace}:version')
+    except ValueError:
+        # Clé évincée : repartir de 2 pourrait resservir des entrées
+        # déjà stockées sous cette version ; add() laisse gagner un
+        # éventuel worker concurrent
+        cache.add(f'{namespace}:version', _fresh_version(), None)
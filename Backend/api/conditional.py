@@ -0,0 +1,109 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+# =========================
+# GET CONDITIONNEL (ETAG / LAST-MODIFIED)
+# =========================
+def _related(instance, path):
+    """Suit un chemin 'driver__user' sur des relations déjà chargées (select_related)"""
+    for name in path.split('__'):
+        if instance is None:
+            return None
+        instance = getattr(instance, name)
+    return instance
+
+
+class ConditionalGetMixin:
+    """
+    ETag fort + Last-Modified sur list / retrieve
+
+    Les validateurs sont calculés à partir des seules lignes de la page
+    (id + updated_at, y compris des relations imbriquées déclarées dans
+    `etag_related`) : la page est de toute façon chargée, aucun agrégat
+    sur la table entière. Si le client envoie If-None-Match /
+    If-Modified-Since et que rien n'a changé, on répond 304 sans sérialiser.
+
+    `etag_related_fields` couvre les relations sans updated_at (User) :
+    leurs champs exposés entrent dans l'ETag, et Last-Modified n'est alors
+    pas envoyé (il ne verrait pas ces modifications).
+    """
+    etag_related = ()
+    etag_related_fields = {}
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+
+        parts = [request.get_full_path()]
+        if page is not None:
+            # Une ligne ajoutée / supprimée après la page change les liens
+            parts += [self.paginator.get_next_link(), self.paginator.get_previous_link()]
+
+        timestamps = []
+        for instance in rows:
+            row_timestamps = self._timestamps(instance)
+            timestamps.extend(row_timestamps)
+            parts += [instance.pk, *row_timestamps, *self._related_fields(instance)]
+
+        def render():
+            serializer = self.get_serializer(rows, many=True)
+            if page is not None:
+                return self.get_paginated_response(serializer.data)
+            return Response(serializer.data)
+
+        return self._conditional_response(
+            request,
+            parts,
+            max(timestamps) if timestamps else None,
+            render,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        timestamps = self._timestamps(instance)
+
+        def render():
+            return Response(self.get_serializer(instance).data)
+
+        return self._conditional_response(
+            request,
+            [request.get_full_path(), *timestamps, *self._related_fields(instance)],
+            max(timestamps),
+            render,
+        )
+
+    def _timestamps(self, instance):
+        timestamps = [instance.updated_at]
+        for relation in self.etag_related:
+            related = _related(instance, relation)
+            if related is not None:
+                timestamps.append(related.updated_at)
+        return timestamps
+
+    def _related_fields(self, instance):
+        values = []
+        for relation, fields in self.etag_related_fields.items():
+            related = _related(instance, relation)
+            values += [getattr(related, field) for field in fields] if related is not None else [None]
+        return values
+
+    def _conditional_response(self, request, parts, last_modified, render):
+        etag = '"%s"' % hashlib.sha1('|'.join(str(p) for p in parts).encode()).hexdigest()
+        if self.etag_related_fields:
+            last_modified = None
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = render()
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
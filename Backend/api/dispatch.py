@@ -0,0 +1,360 @@
+import heapq
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Driver, Truck, Mission, FUEL_PRICE_PER_LITER
+from .scheduling import Schedule, ACTIVE_STATUSES
+
+
+# =========================
+# AFFECTATION AUTOMATIQUE (DISPATCH)
+# =========================
+# Le cœur (hungarian / plan_assignments) travaille sur des dicts simples,
+# sans base de données : il est réutilisé tel quel par le benchmark.
+INFEASIBLE = 1e12
+DISPATCH_BATCH_SIZE = 64
+
+
+def hungarian(cost):
+    """
+    Affectation de coût minimal (algorithme hongrois, potentiels + plus courts chemins)
+
+    `cost` est une matrice n × m avec n ≤ m ; chaque ligne reçoit une colonne
+    distincte. Complexité O(n² · m). Retourne la liste des colonnes par ligne.
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    inf = float('inf')
+
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)       # p[j] = ligne affectée à la colonne j (1-indexé)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            ui0 = u[i0]
+            delta = inf
+            j1 = 0
+
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - ui0 - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    # À égalité, préférer une colonne libre : chemins augmentants courts
+                    if minv[j] < delta or (minv[j] == delta and not p[j] and p[j1]):
+                        delta = minv[j]
+                        j1 = j
+
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    assignment = [-1] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            assignment[p[j] - 1] = j - 1
+    return assignment
+
+
+def _solve(cost):
+    """hungarian() pour une matrice quelconque : retourne les paires (ligne, colonne) faisables"""
+    if not cost or not cost[0]:
+        return []
+
+    if len(cost) <= len(cost[0]):
+        pairs = enumerate(hungarian(cost))
+    else:
+        transposed = [list(col) for col in zip(*cost)]
+        pairs = ((row, col) for col, row in enumerate(hungarian(transposed)))
+
+    return [(r, c) for r, c in pairs if c >= 0 and cost[r][c] < INFEASIBLE]
+
+
+def _assign_batches(missions, resources, schedules, feasible, cost, on_assign=None, batch_size=DISPATCH_BATCH_SIZE):
+    """
+    Affecte des ressources (camions ou chauffeurs) aux missions, par vagues chronologiques
+
+    Les missions sont traitées par lots de `batch_size` dans l'ordre de départ ;
+    chaque lot est résolu de façon optimale par l'algorithme hongrois, une
+    ressource recevant au plus une mission du lot. Une mission non servie est
+    reportée au lot suivant (une ressource déjà utilisée peut alors la prendre
+    si les créneaux ne se chevauchent pas).
+
+    Élagage exact : pour un lot de B missions, il existe une solution optimale
+    où chaque mission utilise l'une de ses B ressources faisables les moins
+    chères — la matrice reste donc de taille B × O(B) quel que soit le parc.
+    """
+    assigned = {}
+    pending = sorted(missions, key=lambda m: m['start'])
+
+    while pending:
+        batch, pending = pending[:batch_size], pending[batch_size:]
+
+        candidates = []
+        for mission in batch:
+            options = [
+                (cost(mission, resource), index)
+                for index, resource in enumerate(resources)
+                if feasible(mission, resource) and schedules[resource['id']].is_free(mission['start'], mission['end'])
+            ]
+            candidates.append(heapq.nsmallest(len(batch), options))
+
+        columns = sorted({index for options in candidates for _, index in options})
+        position = {index: col for col, index in enumerate(columns)}
+
+        matrix = []
+        for options in candidates:
+            row = [INFEASIBLE] * len(columns)
+            for value, index in options:
+                row[position[index]] = value
+            matrix.append(row)
+
+        matched = set()
+        for r, c in _solve(matrix):
+            mission, resource = batch[r], resources[columns[c]]
+            assigned[mission['id']] = resource
+            schedules[resource['id']].add(mission['start'], mission['end'])
+            if on_assign:
+                on_assign(mission, resource)
+            matched.add(r)
+
+        # Missions non servies mais encore possibles : retentées au lot suivant.
+        # Toute ligne ayant un candidat garantit au moins une affectation : la boucle termine.
+        pending = [m for r, m in enumerate(batch) if r not in matched and candidates[r]] + pending
+
+    return assigned
+
+
+def _fuel_cost(mission, truck):
+    return mission['distance'] * truck['avg_consumption'] / 100 * FUEL_PRICE_PER_LITER
+
+
+def _schedules(kind, resources, busy_slots):
+    schedules = {resource['id']: Schedule() for resource in resources}
+    for slot_kind, resource_id, start, end in busy_slots:
+        if slot_kind == kind and resource_id in schedules:
+            schedules[resource_id].add(start, end)
+    return schedules
+
+
+def plan_assignments(missions, trucks, drivers, busy_slots=()):
+    """
+    Calcule une affectation faisable et de coût carburant minimal
+
+    - missions : [{'id', 'start', 'end', 'distance', 'truck_id', 'driver_id'}]
+    - trucks   : [{'id', 'avg_consumption'}]
+    - drivers  : [{'id', 'remaining_hours'}]
+    - busy_slots : [('truck' | 'driver', id, start, end)] déjà engagés
+
+    Contraintes : pas de chevauchement de créneaux par camion / chauffeur,
+    heures contractuelles restantes du chauffeur. Coût : carburant du camion.
+    Retourne {mission_id: {'truck_id', 'driver_id', 'estimated_fuel_cost'}}.
+
+    Les chauffeurs (ressource contrainte) sont affectés d'abord, puis les
+    camions aux seules missions pourvues d'un chauffeur : un camion n'est
+    jamais bloqué par une mission que personne ne peut conduire. Une mission
+    qui obtient un chauffeur mais aucun camion est retirée et le plan est
+    recalculé, pour rendre ses heures et son créneau aux autres missions.
+    """
+    for mission in missions:
+        mission['hours'] = (mission['end'] - mission['start']).total_seconds() / 3600
+
+    candidates = list(missions)
+
+    while True:
+        # 1) Chauffeurs : respecter les heures restantes, équilibrer la charge
+        remaining_hours = {d['id']: d['remaining_hours'] for d in drivers}
+
+        def driver_feasible(mission, driver):
+            return mission['hours'] <= remaining_hours[driver['id']]
+
+        def driver_cost(mission, driver):
+            return -remaining_hours[driver['id']]
+
+        def consume_hours(mission, driver):
+            remaining_hours[driver['id']] -= mission['hours']
+
+        driver_by_mission = _assign_batches(
+            [m for m in candidates if not m.get('driver_id')],
+            drivers,
+            _schedules('driver', drivers, busy_slots),
+            feasible=driver_feasible,
+            cost=driver_cost,
+            on_assign=consume_hours,
+        )
+
+        # 2) Camions : minimiser le coût carburant, pour les missions avec chauffeur
+        staffed = [m for m in candidates if m.get('driver_id') or m['id'] in driver_by_mission]
+        truck_by_mission = _assign_batches(
+            [m for m in staffed if not m.get('truck_id')],
+            trucks,
+            _schedules('truck', trucks, busy_slots),
+            feasible=lambda mission, truck: True,
+            cost=_fuel_cost,
+        )
+
+        stranded = {
+            m['id'] for m in staffed
+            if m['id'] in driver_by_mission and not m.get('truck_id') and m['id'] not in truck_by_mission
+        }
+        if not stranded:
+            break
+        candidates = [m for m in candidates if m['id'] not in stranded]
+
+    plan = {}
+    for mission in staffed:
+        truck = truck_by_mission.get(mission['id'])
+        driver = driver_by_mission.get(mission['id'])
+        truck_id = truck['id'] if truck else mission.get('truck_id')
+        driver_id = driver['id'] if driver else mission.get('driver_id')
+
+        if truck_id and driver_id:
+            entry = {'truck_id': truck_id, 'driver_id': driver_id}
+            if truck:
+                entry['estimated_fuel_cost'] = round(_fuel_cost(mission, truck), 2)
+            plan[mission['id']] = entry
+
+    return plan
+
+
+def _without_new_conflicts(missions, plan):
+    """
+    Écarte les missions dont le camion / chauffeur prévu a été réservé entre le
+    calcul du plan et son application (créneau créé ou modifié entre-temps)
+
+    Le plan est cohérent avec les créneaux lus au calcul : on relit les missions
+    actives des ressources nouvellement affectées, une requête pour toutes.
+    """
+    new = {
+        field: {mission.id: plan[mission.id][f'{field}_id'] for mission in missions if not getattr(mission, f'{field}_id')}
+        for field in ('truck', 'driver')
+    }
+
+    schedules = {}
+    for truck_id, driver_id, start, end in Mission.objects.filter(
+        Q(truck_id__in=new['truck'].values()) | Q(driver_id__in=new['driver'].values()),
+        status__in=ACTIVE_STATUSES,
+    ).values_list('truck_id', 'driver_id', 'pickup_time', 'expected_dropoff_time'):
+        for key in (('truck', truck_id), ('driver', driver_id)):
+            if key[1]:
+                schedules.setdefault(key, Schedule()).add(start, end)
+
+    return [
+        mission for mission in missions
+        if all(
+            (field, new[field][mission.id]) not in schedules
+            or schedules[field, new[field][mission.id]].is_free(mission.pickup_time, mission.expected_dropoff_time)
+            for field in ('truck', 'driver') if mission.id in new[field]
+        )
+    ]
+
+
+def dispatch_pending_missions(apply=False):
+    """
+    Charge les missions `pending` sans chauffeur ou sans camion, calcule le plan
+    et, si `apply`, l'enregistre (bulk_update dans une transaction).
+    """
+    missions = [
+        {
+            'id': mission_id,
+            'start': pickup,
+            'end': dropoff,
+            'distance': distance,
+            'truck_id': truck_id,
+            'driver_id': driver_id,
+        }
+        for mission_id, pickup, dropoff, distance, truck_id, driver_id in Mission.objects.filter(
+            Q(driver__isnull=True) | Q(truck__isnull=True),
+            status='pending',
+        ).order_by('pickup_time').values_list(
+            'id', 'pickup_time', 'expected_dropoff_time', 'distance', 'truck_id', 'driver_id'
+        )
+    ]
+
+    trucks = list(Truck.objects.filter(is_available=True).values('id', 'avg_consumption'))
+    drivers = [
+        {'id': driver_id, 'remaining_hours': max(0, contractual - worked)}
+        for driver_id, contractual, worked in Driver.objects.filter(is_active=True).values_list(
+            'id', 'contractual_hours', 'hours_worked'
+        )
+    ]
+
+    busy_slots = []
+    for truck_id, driver_id, start, end in Mission.objects.filter(
+        status__in=ACTIVE_STATUSES,
+    ).filter(
+        Q(truck__isnull=False) | Q(driver__isnull=False)
+    ).values_list('truck_id', 'driver_id', 'pickup_time', 'expected_dropoff_time'):
+        if truck_id:
+            busy_slots.append(('truck', truck_id, start, end))
+        if driver_id:
+            busy_slots.append(('driver', driver_id, start, end))
+
+    plan = plan_assignments(missions, trucks, drivers, busy_slots)
+    loaded = {m['id']: (m['truck_id'], m['driver_id']) for m in missions}
+
+    result = {
+        'pending': len(missions),
+        'assigned': len(plan),
+        'unassigned': [m['id'] for m in missions if m['id'] not in plan],
+        'assignments': [{'mission_id': mission_id, **entry} for mission_id, entry in plan.items()],
+        'applied': False,
+        'skipped': [],
+    }
+
+    if apply and plan:
+        now = timezone.now()
+        with transaction.atomic():
+            # Ne toucher que les missions encore en attente, non affectées depuis
+            # le calcul du plan et dont les ressources prévues sont encore libres
+            # (un autre admin a pu agir entre-temps)
+            locked = Mission.objects.select_for_update().filter(
+                Q(driver__isnull=True) | Q(truck__isnull=True),
+                id__in=plan.keys(),
+                status='pending',
+            )
+            to_update = [m for m in locked if (m.truck_id, m.driver_id) == loaded[m.id]]
+            to_update = _without_new_conflicts(to_update, plan)
+            result['skipped'] = sorted(plan.keys() - {m.id for m in to_update})
+
+            for mission in to_update:
+                entry = plan[mission.id]
+                mission.truck_id = entry['truck_id']
+                mission.driver_id = entry['driver_id']
+                if 'estimated_fuel_cost' in entry:
+                    mission.estimated_fuel_cost = entry['estimated_fuel_cost']
+                mission.updated_at = now
+
+            Mission.objects.bulk_update(
+                to_update,
+                ['truck', 'driver', 'estimated_fuel_cost', 'updated_at'],
+                batch_size=500
+            )
+        result['applied'] = True
+
+    return result
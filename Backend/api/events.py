@@ -0,0 +1,95 @@
+import asyncio
+import json
+import threading
+
+from django.db import transaction
+from django.utils import timezone
+
+
+# =========================
+# BUS D'ÉVÉNEMENTS (IN-PROCESS)
+# =========================
+class Subscription:
+    """
+    Abonnement d'un client au flux d'événements
+
+    Les événements sont poussés dans une asyncio.Queue bornée depuis
+    n'importe quel thread (les vues DRF sont synchrones). Si le client
+    ne consomme pas assez vite, les événements en trop sont ignorés.
+    """
+
+    def __init__(self, loop, driver_id=None, truck_id=None, maxsize=100):
+        self.loop = loop
+        self.driver_id = driver_id
+        self.truck_id = truck_id
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def matches(self, event):
+        if self.driver_id is not None and event.get('driver_id') != self.driver_id:
+            return False
+        if self.truck_id is not None and event.get('truck_id') != self.truck_id:
+            return False
+        return True
+
+    def push(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class EventBus:
+    """
+    Bus publish/subscribe local au processus
+
+    Suffisant pour un serveur ASGI mono-processus et pour les tests ;
+    avec plusieurs workers, chaque worker ne voit que ses propres événements.
+    """
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, driver_id=None, truck_id=None):
+        subscription = Subscription(asyncio.get_running_loop(), driver_id, truck_id)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event):
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.matches(event)]
+
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.push, event)
+
+
+bus = EventBus()
+
+
+def publish(event_type, driver_id=None, truck_id=None, **data):
+    """
+    Publie un événement une fois la transaction courante validée
+
+    Les clients ne reçoivent donc jamais un état annulé par un rollback.
+    """
+    event = {
+        'type': event_type,
+        'driver_id': driver_id,
+        'truck_id': truck_id,
+        'timestamp': timezone.now().isoformat(),
+        **data,
+    }
+    transaction.on_commit(lambda: bus.publish(event))
+
+
+def format_sse(event):
+    """Encode un événement au format Server-Sent Events"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
@@ -0,0 +1,83 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+
+
+# =========================
+# EXPORTS EN STREAMING (CSV / NDJSON)
+# =========================
+EXPORT_CHUNK_SIZE = 2000
+
+MISSION_EXPORT_FIELDS = [
+    'id',
+    'driver_id',
+    'driver__name',
+    'truck_id',
+    'truck__plate',
+    'status',
+    'departure_city',
+    'arrival_city',
+    'pickup_time',
+    'expected_dropoff_time',
+    'actual_start_time',
+    'actual_end_time',
+    'container_number',
+    'container_type',
+    'distance',
+    'hours_worked',
+    'estimated_fuel_cost',
+    'actual_fuel_cost',
+    'created_at',
+]
+
+FUEL_EXPORT_FIELDS = [
+    'id',
+    'truck_id',
+    'truck__plate',
+    'mission_id',
+    'quantity',
+    'cost',
+    'location',
+    'notes',
+    'created_at',
+]
+
+
+class _Echo:
+    """Pseudo-fichier : csv.writer renvoie directement la ligne formatée"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(rows, fields):
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), default=str) + '\n'
+
+
+def stream_export(queryset, fields, filename, output='csv'):
+    """
+    Exporte un queryset ligne par ligne, sans ModelSerializer
+
+    values_list + iterator(chunk_size) : la mémoire reste constante,
+    quelle que soit la taille de la table.
+    """
+    rows = queryset.order_by('id').values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    if output == 'ndjson':
+        response = StreamingHttpResponse(_ndjson_lines(rows, fields), content_type='application/x-ndjson')
+        extension = 'ndjson'
+    else:
+        response = StreamingHttpResponse(_csv_lines(rows, fields), content_type='text/csv; charset=utf-8')
+        extension = 'csv'
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    return response
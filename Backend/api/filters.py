@@ -0,0 +1,65 @@
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import models
+from rest_framework import exceptions
+from rest_framework.filters import BaseFilterBackend
+
+
+# =========================
+# FILTRES PAR QUERY PARAMS
+# =========================
+class QueryParamFilterBackend(BaseFilterBackend):
+    """
+    Filtre côté serveur à partir de `query_filters` déclaré sur la ViewSet
+
+    Exemple :
+        query_filters = {
+            'status': 'status__in',
+            'truck': 'truck_id',
+            'created_after': 'created_at__gte',
+        }
+
+    → /missions/?status=pending,in_progress&truck=3&created_after=2026-01-01
+
+    Les lookups `__in` acceptent une liste séparée par des virgules.
+    Les champs booléens acceptent true / false / 1 / 0 (sans tenir compte
+    de la casse), comme les envoient les clients JavaScript.
+    """
+
+    BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+    def filter_queryset(self, request, queryset, view):
+        query_filters = getattr(view, 'query_filters', {})
+        lookups = {}
+
+        for param, lookup in query_filters.items():
+            value = request.query_params.get(param)
+
+            if value in (None, ''):
+                continue
+
+            if lookup.endswith('__in'):
+                value = [v for v in value.split(',') if v]
+            elif self._is_boolean(queryset.model, lookup):
+                if value.lower() not in self.BOOLEAN_VALUES:
+                    raise exceptions.ValidationError({param: 'true ou false attendu'})
+                value = self.BOOLEAN_VALUES[value.lower()]
+
+            lookups[lookup] = value
+
+        if not lookups:
+            return queryset
+
+        try:
+            return queryset.filter(**lookups)
+        except (DjangoValidationError, ValueError, TypeError) as e:
+            raise exceptions.ValidationError({'filters': f'Filtre invalide : {e}'})
+
+    @staticmethod
+    def _is_boolean(model, lookup):
+        """Le lookup vise-t-il directement un BooleanField (ex. 'is_active') ?"""
+        if '__' in lookup:
+            return False
+        try:
+            return isinstance(model._meta.get_field(lookup), models.BooleanField)
+        except FieldDoesNotExist:
+            return False
@@ -0,0 +1,136 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+
+# =========================
+# JOURNALISATION STRUCTURÉE (NON BLOQUANTE)
+# =========================
+# Les vues écrivent dans une file en mémoire ; un thread dédié formate en
+# JSON (une ligne par événement) et écrit sur stdout. Une requête n'attend
+# donc jamais un pipe stdout saturé : si la file est pleine, l'événement est
+# perdu (et compté) plutôt que de bloquer.
+#
+# Usage : logger.info('mission.started', extra={'mission_id': 1, 'duration_ms': 3.2})
+# Niveau par module et échantillonnage : voir LOGGING dans settings.py.
+LOG_QUEUE_SIZE = 10_000
+
+# Attributs standard d'un LogRecord : tout le reste vient de `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def _parse_pairs(value):
+    """"a=1, b=2" → {'a': '1', 'b': '2'} (espaces et éléments vides ignorés)"""
+    pairs = (item.split('=', 1) for item in value.split(',') if '=' in item)
+    return {name.strip(): setting.strip() for name, setting in pairs if name.strip()}
+
+
+def parse_log_levels(value):
+    """LOG_LEVELS "api.views=debug,api.signals=WARNING" → loggers dictConfig"""
+    return {name: {'level': level.upper()} for name, level in _parse_pairs(value).items()}
+
+
+def parse_sampling_rates(value):
+    """LOG_SAMPLING "api.views=0.1" → rates de SamplingFilter"""
+    return {name: float(rate) for name, rate in _parse_pairs(value).items()}
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objet JSON par ligne : ts, level, logger, event + champs `extra`"""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'event': record.getMessage(),
+        }
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Ne garde qu'une fraction des événements DEBUG / INFO d'un logger
+
+    `rates` : {'api.views': 0.1} → 10 % des événements de api.views (et de
+    ses sous-loggers). WARNING et au-delà sont toujours conservés.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        # Le préfixe le plus long l'emporte
+        self.rates = sorted((rates or {}).items(), key=lambda item: -len(item[0]))
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + '.'):
+                return rate >= 1 or random.random() < rate
+
+        return True
+
+
+class NonBlockingHandler(QueueHandler):
+    """
+    QueueHandler borné + QueueListener vers stdout, démarré à la configuration
+
+    Le formateur configuré (dictConfig) est appliqué par le thread d'écriture,
+    pas dans la requête : le thread appelant ne fait que résoudre le message.
+    """
+
+    def __init__(self, maxsize=LOG_QUEUE_SIZE, stream=None):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=False)
+        self.listener.start()
+        self.running = True
+        # Vider la file à l'arrêt du processus
+        atexit.register(self.stop)
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Résoudre message et traceback maintenant (les arguments peuvent changer
+        # ensuite), sans sérialiser : le JSON est produit par le thread d'écriture
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        if self.running:
+            self.running = False
+            self.listener.stop()
+
+    def close(self):
+        self.stop()
+        super().close()
@@ -0,0 +1,423 @@
+"""
+Benchmark de l'API REST : latence p50 / p99, débit et requêtes SQL par route
+Exécuter avec: python manage.py benchmark_api [--dataset small|medium|full] [--url http://127.0.0.1:8000]
+
+- Sans --url : client de test Django (en processus), requêtes SQL comptées,
+  les actions d'écriture sont annulées (rollback) après chaque appel.
+- Avec --url : serveur local déjà lancé (runserver / uvicorn) ; les écritures
+  ne sont jouées qu'avec --writes, car elles modifient réellement la base.
+- --save-baseline enregistre deux références :
+  · benchmarks/api_queries.json (versionnée) : requêtes SQL et status par
+    route, portables d'une machine à l'autre (`--dataset small`, SQLite) ;
+  · benchmarks/api_latency.local.json (ignorée par git) : p50 / p99 de
+    cette machine uniquement.
+- --compare échoue (code de sortie 1) si une route exécute plus de requêtes
+  SQL que la référence versionnée ; --compare-latency compare aussi p50 / p99
+  à la référence locale, à enregistrer d'abord sur la même machine.
+- Les scénarios « (warm cache) » mesurent un cache déjà rempli (0 SQL) ;
+  les « (cold cache) » vident le cache avant chaque requête (client de
+  test uniquement : avec --url, le cache est celui du serveur).
+"""
+
+import json
+import math
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver
+from django.utils import timezone
+
+from api import urls as api_urls
+from api.models import Driver, Truck, Mission, FuelEntry, Notification, WeeklyStats
+from api.seeding import DATASETS, seed_scale_dataset
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'api_queries.json'
+DEFAULT_LATENCY_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'api_latency.local.json'
+
+# Routes qui ne sont pas du requête / réponse (flux SSE continu)
+UNMEASURED_ROUTES = {'api-root', 'events'}
+
+
+def _mission_row():
+    pickup = timezone.now() + timedelta(days=400)
+    return {
+        'departure_city': 'Casablanca',
+        'departure_address': 'Port de Casablanca',
+        'pickup_time': pickup.isoformat(),
+        'arrival_city': 'Rabat',
+        'arrival_address': 'Zone industrielle Hay Riad',
+        'expected_dropoff_time': (pickup + timedelta(hours=4)).isoformat(),
+        'container_number': 'BENCH0001',
+        'container_type': '20ft',
+        'distance': 90,
+        'estimated_fuel_cost': 0,
+    }
+
+
+# (libellé, nom de route, écriture ?, fabrique (ctx) -> (méthode, chemin, corps))
+# Les fabriques sont rappelées à chaque itération : les écritures consomment
+# une cible différente à chaque fois (ctx.take).
+SCENARIOS = [
+    ('drivers list', 'driver-list', False, lambda ctx: ('GET', '/api/drivers/', None)),
+    ('drivers detail', 'driver-detail', False, lambda ctx: ('GET', f'/api/drivers/{ctx.first("driver")}/', None)),
+    ('drivers stats (warm cache)', 'driver-stats', False, lambda ctx: ('GET', f'/api/drivers/{ctx.first("driver")}/stats/', None)),
+    ('drivers stats (cold cache)', 'driver-stats', False, lambda ctx: ('GET', f'/api/drivers/{ctx.first("driver")}/stats/', None)),
+    ('drivers bulk stats (warm cache)', 'driver-bulk-stats', False, lambda ctx: ('GET', f'/api/drivers/stats/?ids={ctx.ids("driver", 20)}', None)),
+    ('drivers bulk stats (cold cache)', 'driver-bulk-stats', False, lambda ctx: ('GET', f'/api/drivers/stats/?ids={ctx.ids("driver", 20)}', None)),
+    ('drivers reset (dry run)', 'driver-reset-weekly-hours', False, lambda ctx: ('POST', '/api/drivers/reset_weekly_hours/', {'dry_run': True})),
+    ('trucks list', 'truck-list', False, lambda ctx: ('GET', '/api/trucks/', None)),
+    ('trucks detail', 'truck-detail', False, lambda ctx: ('GET', f'/api/trucks/{ctx.first("truck")}/', None)),
+    ('trucks refuel', 'truck-refuel', True, lambda ctx: ('POST', f'/api/trucks/{ctx.first("truck")}/refuel/', {'quantity': 1})),
+    ('missions list', 'mission-list', False, lambda ctx: ('GET', '/api/missions/', None)),
+    ('missions list (filtered)', 'mission-list', False, lambda ctx: ('GET', '/api/missions/?status=pending,in_progress', None)),
+    ('missions detail', 'mission-detail', False, lambda ctx: ('GET', f'/api/missions/{ctx.first("mission")}/', None)),
+    ('missions export', 'mission-export', False, lambda ctx: ('GET', f'/api/missions/export/?output=ndjson&truck={ctx.first("truck")}', None)),
+    ('missions check fuel', 'mission-check-fuel', False, lambda ctx: ('POST', '/api/missions/check_fuel/', {'truck_id': ctx.first('truck'), 'distance': 250})),
+    ('missions check fuel batch', 'mission-check-fuel-batch', False, lambda ctx: ('POST', '/api/missions/check_fuel_batch/', {'distance': 250})),
+    ('missions dispatch (plan)', 'mission-auto-dispatch', False, lambda ctx: ('POST', '/api/missions/dispatch/', {'apply': False})),
+    ('missions start', 'mission-start', True, lambda ctx: ('POST', f'/api/missions/{ctx.take("pending")}/start/', {})),
+    ('missions complete', 'mission-complete', True, lambda ctx: ('POST', f'/api/missions/{ctx.take("in_progress")}/complete/', {})),
+    ('missions cancel', 'mission-cancel', True, lambda ctx: ('POST', f'/api/missions/{ctx.take("cancellable")}/cancel/', {})),
+    ('missions bulk (1 row)', 'mission-bulk', True, lambda ctx: ('POST', '/api/missions/bulk/', [_mission_row()])),
+    ('missions refuel and create', 'mission-refuel-and-create', True, lambda ctx: (
+        'POST', '/api/missions/refuel_and_create/',
+        {'truck_id': ctx.first('truck'), 'refuel_amount': 1, 'mission_data': _mission_row()},
+    )),
+    ('fuel list', 'fuel-list', False, lambda ctx: ('GET', '/api/fuel/', None)),
+    ('fuel detail', 'fuel-detail', False, lambda ctx: ('GET', f'/api/fuel/{ctx.first("fuel")}/', None)),
+    ('fuel export', 'fuel-export', False, lambda ctx: ('GET', f'/api/fuel/export/?output=ndjson&truck={ctx.first("truck")}', None)),
+    ('notifications list', 'notification-list', False, lambda ctx: ('GET', '/api/notifications/', None)),
+    ('notifications detail', 'notification-detail', False, lambda ctx: ('GET', f'/api/notifications/{ctx.first("notification")}/', None)),
+    ('notifications mark read', 'notification-mark-as-read', True, lambda ctx: ('POST', f'/api/notifications/{ctx.take("notification")}/mark_as_read/', {})),
+    ('weekly stats list', 'weekly-stats-list', False, lambda ctx: ('GET', '/api/weekly-stats/', None)),
+    ('weekly stats detail', 'weekly-stats-detail', False, lambda ctx: ('GET', f'/api/weekly-stats/{ctx.first("weekly_stats")}/', None)),
+    ('dashboard summary (warm cache)', 'dashboard-summary', False, lambda ctx: ('GET', '/api/dashboard/summary/', None)),
+    ('dashboard summary (cold cache)', 'dashboard-summary', False, lambda ctx: ('GET', '/api/dashboard/summary/', None)),
+    ('sync (first page)', 'sync-list', False, lambda ctx: ('GET', '/api/sync/?limit=200', None)),
+    ('metrics', 'metrics', False, lambda ctx: ('GET', '/api/metrics/', None)),
+    ('availability', 'availability-list', False, lambda ctx: ('GET', f'/api/availability/?trucks={ctx.ids("truck", 20)}&drivers={ctx.ids("driver", 20)}', None)),
+]
+
+
+# Scénarios rejoués avec un cache vide à chaque requête (vidé hors mesure)
+COLD_CACHE_SCENARIOS = {label for label, *_ in SCENARIOS if label.endswith('(cold cache)')}
+
+
+class MissingTarget(Exception):
+    pass
+
+
+class Targets:
+    """Identifiants d'objets réels servant de cibles aux scénarios"""
+
+    def __init__(self, size):
+        pools = {
+            'driver': Driver.objects.order_by('id'),
+            'truck': Truck.objects.order_by('id'),
+            'mission': Mission.objects.order_by('id'),
+            'fuel': FuelEntry.objects.order_by('id'),
+            'notification': Notification.objects.order_by('id'),
+            'weekly_stats': WeeklyStats.objects.order_by('id'),
+            'pending': Mission.objects.filter(status='pending').order_by('id'),
+            'in_progress': Mission.objects.filter(status='in_progress').order_by('id'),
+            'cancellable': Mission.objects.filter(status='pending').order_by('-id'),
+        }
+        self.pools = {name: list(qs.values_list('id', flat=True)[:size]) for name, qs in pools.items()}
+        self.cursors = Counter()
+
+    def first(self, name):
+        if not self.pools[name]:
+            raise MissingTarget(name)
+        return self.pools[name][0]
+
+    def ids(self, name, count):
+        if not self.pools[name]:
+            raise MissingTarget(name)
+        return ','.join(str(i) for i in self.pools[name][:count])
+
+    def take(self, name):
+        """Cible suivante du pool (une écriture ne rejoue jamais la même cible)"""
+        index = self.cursors[name]
+        if index >= len(self.pools[name]):
+            raise MissingTarget(name)
+        self.cursors[name] += 1
+        return self.pools[name][index]
+
+
+class ClientTransport:
+    """Client de test Django : compte les requêtes SQL, annule les écritures"""
+    counts_queries = True
+
+    def __init__(self):
+        self.client = Client()
+
+    def send(self, method, path, body, write):
+        kwargs = {'content_type': 'application/json', 'data': json.dumps(body)} if body is not None else {}
+
+        # Le journal est borné (9000 entrées) : plein, il ne compterait plus rien
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            if write:
+                with transaction.atomic():
+                    start = time.perf_counter()
+                    status = self._call(method, path, kwargs)
+                    elapsed = time.perf_counter() - start
+                    transaction.set_rollback(True)
+            else:
+                start = time.perf_counter()
+                status = self._call(method, path, kwargs)
+                elapsed = time.perf_counter() - start
+
+        return elapsed, status, len(queries)
+
+    def _call(self, method, path, kwargs):
+        response = getattr(self.client, method.lower())(path, **kwargs)
+        if response.streaming:
+            # Le temps d'un export inclut la génération complète du flux
+            for _ in response.streaming_content:
+                pass
+        return response.status_code
+
+
+class HttpTransport:
+    """Serveur local déjà démarré, via urllib (pas de dépendance supplémentaire)"""
+    counts_queries = False
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, method, path, body, write):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={'Content-Type': 'application/json'} if data is not None else {},
+        )
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code
+        return time.perf_counter() - start, status, None
+
+
+def percentile(sorted_values, q):
+    """Percentile par rang (nearest-rank) d'une liste triée"""
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def discover_routes():
+    """Noms de toutes les routes de api/urls.py"""
+    names = set()
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif pattern.name:
+                names.add(pattern.name)
+
+    walk(api_urls.urlpatterns)
+    return names
+
+
+class Command(BaseCommand):
+    help = 'Mesure p50 / p99, débit et requêtes SQL de chaque route de l\'API, avec comparaison à une référence'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', choices=sorted(DATASETS), help='Peuple la base avant de mesurer')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--requests', type=int, default=200, help='Requêtes mesurées par scénario')
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--url', help='Serveur local (ex. http://127.0.0.1:8000) au lieu du client de test')
+        parser.add_argument('--concurrency', type=int, default=1, help='Clients simultanés (avec --url)')
+        parser.add_argument('--writes', action='store_true', help='Jouer les écritures contre --url')
+        parser.add_argument('--only', help='Filtre sur les libellés (sous-chaînes séparées par des virgules)')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Référence SQL versionnée')
+        parser.add_argument('--latency-baseline', default=str(DEFAULT_LATENCY_BASELINE), help='Référence de latence locale')
+        parser.add_argument('--save-baseline', action='store_true')
+        parser.add_argument('--compare', action='store_true', help='Échouer si une route exécute plus de requêtes SQL')
+        parser.add_argument('--compare-latency', action='store_true', help='Comparer aussi p50 / p99 à la référence locale')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='Hausse relative tolérée de p50')
+        parser.add_argument('--p99-tolerance', type=float, default=1.0, help='Hausse relative tolérée de p99 (plus bruité)')
+        parser.add_argument('--min-delta-ms', type=float, default=2.0, help='Hausse absolue toujours tolérée')
+
+    def handle(self, *args, **options):
+        if options['dataset']:
+            sizes = DATASETS[options['dataset']]
+            self.stdout.write(f"🌱 Peuplement « {options['dataset']} » : {sizes}")
+            created = seed_scale_dataset(**sizes, seed=options['seed'], log=self.stdout.write)
+            # WeeklyStats est dérivée des missions terminées
+            call_command('rebuild_weekly_stats', stdout=self.stdout)
+            self.stdout.write(self.style.SUCCESS(f'✅ Créés : {created}'))
+
+        if options['url']:
+            transport = HttpTransport(options['url'])
+            run_writes = options['writes']
+        else:
+            if options['concurrency'] > 1:
+                raise CommandError('--concurrency nécessite --url (le client de test est séquentiel)')
+            transport = ClientTransport()
+            run_writes = True
+
+        per_scenario = options['requests'] + options['warmup']
+        targets = Targets(per_scenario * max(1, options['concurrency']))
+
+        only = [s.strip() for s in options['only'].split(',')] if options['only'] else None
+        results = {}
+        covered = set()
+
+        self.stdout.write(
+            f"\n{'scénario':<30} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>8} {'SQL':>5}  statut"
+        )
+
+        for label, route, write, factory in SCENARIOS:
+            if only and not any(part in label for part in only):
+                continue
+            if write and not run_writes:
+                self.stdout.write(f'{label:<30} {"— écriture ignorée (--writes)":>40}')
+                continue
+            cold = label in COLD_CACHE_SCENARIOS
+            if cold and options['url']:
+                self.stdout.write(f'{label:<30} {"— cache du serveur inaccessible (--url)":>40}')
+                continue
+
+            try:
+                result = self._run(transport, factory, targets, write, options, cold)
+            except MissingTarget as e:
+                self.stdout.write(self.style.WARNING(f'{label:<30} — aucune cible ({e})'))
+                continue
+
+            covered.add(route)
+            results[label] = result
+            self._print_row(label, result)
+
+        missing = discover_routes() - covered - UNMEASURED_ROUTES
+        if missing and not only:
+            self.stdout.write(self.style.WARNING(f"\n⚠️ Routes non mesurées : {', '.join(sorted(missing))}"))
+
+        baseline_path = Path(options['baseline'])
+        latency_path = Path(options['latency_baseline'])
+
+        if options['compare'] or options['compare_latency']:
+            self._compare(results, baseline_path, latency_path if options['compare_latency'] else None, options)
+
+        if options['save_baseline']:
+            self._save(results, baseline_path, latency_path, options)
+
+    def _save(self, results, baseline_path, latency_path, options):
+        """Requêtes SQL → référence versionnée ; latences → référence locale"""
+        context = {
+            'mode': 'http' if options['url'] else 'client',
+            'database': settings.DATABASES['default']['ENGINE'],
+            'counts': {
+                'drivers': Driver.objects.count(),
+                'trucks': Truck.objects.count(),
+                'missions': Mission.objects.count(),
+                'fuel_entries': FuelEntry.objects.count(),
+            },
+        }
+        files = (
+            (baseline_path, {label: {'queries': r['queries'], 'status': r['status']} for label, r in results.items()}),
+            (latency_path, {label: {'p50': r['p50'], 'p99': r['p99'], 'rps': r['rps']} for label, r in results.items()}),
+        )
+
+        for path, routes in files:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({**context, 'routes': routes}, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'💾 Référence enregistrée : {path}'))
+
+    def _run(self, transport, factory, targets, write, options, cold=False):
+        """Échauffement puis mesure d'un scénario ; retourne les statistiques"""
+        # Construire toutes les requêtes d'abord : une cible manquante arrête tout de suite
+        calls = [factory(targets) for _ in range(options['requests'] + options['warmup'])]
+        warmup, measured = calls[:options['warmup']], calls[options['warmup']:]
+
+        def send(method, path, body):
+            if cold:
+                cache.clear()
+            return transport.send(method, path, body, write)
+
+        for call in warmup:
+            send(*call)
+
+        start = time.perf_counter()
+        if options['concurrency'] > 1:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                samples = list(pool.map(lambda call: send(*call), measured))
+        else:
+            samples = [send(*call) for call in measured]
+        wall = time.perf_counter() - start
+
+        latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+        queries = [count for _, _, count in samples if count is not None]
+        statuses = Counter(status for _, status, _ in samples)
+
+        return {
+            'p50': round(percentile(latencies, 0.50), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+            'rps': round(len(samples) / wall, 1) if wall else None,
+            'queries': max(queries) if queries else None,
+            'status': statuses.most_common(1)[0][0],
+        }
+
+    def _print_row(self, label, result):
+        queries = '-' if result['queries'] is None else result['queries']
+        line = f"{label:<30} {result['p50']:>9.2f} {result['p99']:>9.2f} {result['rps']:>8} {queries:>5}  {result['status']}"
+        self.stdout.write(line if result['status'] < 400 else self.style.WARNING(line))
+
+    def _compare(self, results, baseline_path, latency_path, options):
+        """
+        Requêtes SQL : aucune hausse tolérée (déterministe, portable)
+        Latences (latency_path) : uniquement contre une référence de cette machine
+        """
+        baseline = self._load(baseline_path)
+        latency = self._load(latency_path) if latency_path else {}
+        regressions = []
+
+        for label, result in results.items():
+            reference = baseline.get(label, {})
+            if result['queries'] is not None and reference.get('queries') is not None \
+                    and result['queries'] > reference['queries']:
+                regressions.append(f"{label} : {result['queries']} requêtes SQL (référence {reference['queries']})")
+
+            reference = latency.get(label)
+            if not reference:
+                continue
+
+            for metric, tolerance in (('p50', options['tolerance']), ('p99', options['p99_tolerance'])):
+                limit = reference[metric] * (1 + tolerance) + options['min_delta_ms']
+                if result[metric] > limit:
+                    regressions.append(
+                        f"{label} : {metric} {result[metric]:.2f} ms > {limit:.2f} ms (référence {reference[metric]:.2f})"
+                    )
+
+        if regressions:
+            raise CommandError('Régressions détectées :\n  ' + '\n  '.join(regressions))
+
+        compared = ', '.join(str(path) for path in (baseline_path, latency_path) if path)
+        self.stdout.write(self.style.SUCCESS(f'✅ Aucune régression par rapport à {compared}'))
+
+    @staticmethod
+    def _load(path):
+        if not path.exists():
+            raise CommandError(f'Référence introuvable : {path} (lancer avec --save-baseline)')
+        return json.loads(path.read_text())['routes']
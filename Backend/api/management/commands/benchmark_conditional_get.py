@@ -0,0 +1,40 @@
+"""
+Mesure le temps CPU économisé par les GET conditionnels (ETag / 304)
+Exécuter avec: python manage.py benchmark_conditional_get [--repeat 50]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+
+class Command(BaseCommand):
+    help = 'Compare un rechargement complet et un rechargement conditionnel (If-None-Match) des listes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--page-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        client = Client()
+        repeat = options['repeat']
+
+        for endpoint in ('/api/drivers/', '/api/trucks/', '/api/missions/'):
+            url = f"{endpoint}?page_size={options['page_size']}"
+            etag = client.get(url)['ETag']
+
+            full = self._measure(client, url, repeat)
+            conditional = self._measure(client, url, repeat, HTTP_IF_NONE_MATCH=etag)
+
+            saved = 100 * (1 - conditional / full) if full else 0
+            self.stdout.write(
+                f'📊 {endpoint:<16} 200: {full:7.2f} ms CPU   304: {conditional:7.2f} ms CPU   '
+                + self.style.SUCCESS(f'(-{saved:.0f}%)')
+            )
+
+    def _measure(self, client, url, repeat, **headers):
+        start = time.process_time()
+        for _ in range(repeat):
+            client.get(url, **headers)
+        return (time.process_time() - start) * 1000 / repeat
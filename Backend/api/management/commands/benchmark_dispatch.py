@@ -0,0 +1,57 @@
+"""
+Benchmark du moteur d'affectation (sans base de données)
+Exécuter avec: python manage.py benchmark_dispatch [--missions 1000 --drivers 500 --trucks 500]
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from api.dispatch import plan_assignments
+
+
+class Command(BaseCommand):
+    help = 'Mesure le temps de calcul du plan d\'affectation sur un jeu de données synthétique'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missions', type=int, default=1000)
+        parser.add_argument('--drivers', type=int, default=500)
+        parser.add_argument('--trucks', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        week_start = datetime(2026, 1, 5, 6, 0)
+
+        missions = []
+        for mission_id in range(1, options['missions'] + 1):
+            start = week_start + timedelta(hours=rng.randint(0, 24 * 6))
+            missions.append({
+                'id': mission_id,
+                'start': start,
+                'end': start + timedelta(hours=rng.randint(2, 10)),
+                'distance': rng.randint(20, 600),
+            })
+
+        trucks = [
+            {'id': truck_id, 'avg_consumption': rng.uniform(18, 40)}
+            for truck_id in range(1, options['trucks'] + 1)
+        ]
+        drivers = [
+            {'id': driver_id, 'remaining_hours': rng.choice([40, 50, 55, 60])}
+            for driver_id in range(1, options['drivers'] + 1)
+        ]
+
+        start = time.perf_counter()
+        plan = plan_assignments(missions, trucks, drivers)
+        elapsed = time.perf_counter() - start
+
+        total_cost = sum(entry['estimated_fuel_cost'] for entry in plan.values())
+
+        self.stdout.write(
+            f"📊 {options['missions']} missions × {options['drivers']} chauffeurs × {options['trucks']} camions\n"
+            f"   Affectées : {len(plan)} / {len(missions)}\n"
+            f"   Coût carburant total : {total_cost:,.2f} DH\n"
+            + self.style.SUCCESS(f"   Temps de calcul : {elapsed:.2f} s")
+        )
@@ -0,0 +1,50 @@
+"""
+Affiche le plan d'exécution (EXPLAIN) et le temps moyen des requêtes chaudes
+Exécuter avec: python manage.py explain_hot_queries [--repeat 50]
+
+Avant / après les index composites :
+    python manage.py migrate api 0004 && python manage.py explain_hot_queries
+    python manage.py migrate api       && python manage.py explain_hot_queries
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from api.models import Driver, Truck, Mission, FuelEntry, Notification
+
+
+class Command(BaseCommand):
+    help = 'Affiche EXPLAIN et le temps moyen des requêtes Mission/FuelEntry/Notification les plus fréquentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Nombre d\'exécutions pour la mesure')
+
+    def handle(self, *args, **options):
+        truck = Truck.objects.order_by('id').first()
+        driver = Driver.objects.order_by('id').first()
+
+        if not truck or not driver:
+            self.stdout.write(self.style.WARNING('⚠️ Base vide : lancez d\'abord seed_data'))
+            return
+
+        queries = {
+            'Mission(truck, status)': Mission.objects.filter(truck=truck, status='in_progress'),
+            'Mission(driver, status, actual_end_time)': Mission.objects.filter(
+                driver=driver, status='completed', actual_end_time__isnull=False
+            ),
+            'Mission(status, actual_end_time)': Mission.objects.filter(status='completed').order_by('-actual_end_time'),
+            'Mission(-created_at, -id)': Mission.objects.order_by('-created_at', '-id')[:50],
+            'FuelEntry(truck, -created_at)': FuelEntry.objects.filter(truck=truck).order_by('-created_at')[:50],
+            'Notification(driver, is_read, -created_at)': Notification.objects.filter(
+                driver=driver, is_read=False
+            ).order_by('-created_at')[:50],
+        }
+
+        for label, queryset in queries.items():
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                list(queryset.values_list('id', flat=True))
+            elapsed_ms = (time.perf_counter() - start) * 1000 / options['repeat']
+
+            self.stdout.write(self.style.SUCCESS(f'\n📊 {label} — {elapsed_ms:.2f} ms'))
+            self.stdout.write(queryset.explain())
@@ -0,0 +1,124 @@
+"""
+Reconstruit la table WeeklyStats à partir de l'historique des missions terminées
+Exécuter avec: python manage.py rebuild_weekly_stats [--chunk-size 1000]
+
+Upsert par lots sur (driver, week_start) : seules les lignes nouvelles ou
+dont les totaux diffèrent sont écrites (et remontent dans /api/sync/).
+Les lignes archivées par reset_weekly_hours (heures sans mission terminée)
+sont conservées ; seules les lignes de missions qui n'existent plus
+(ou ne sont plus terminées) sont supprimées.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncWeek
+from api.models import Mission, WeeklyStats
+
+TOTAL_FIELDS = ['total_kilometers', 'total_hours_worked', 'completed_missions', 'average_speed']
+
+
+class Command(BaseCommand):
+    help = 'Recalcule toutes les statistiques hebdomadaires (agrégation SQL + upsert par lots)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Taille des lots bulk_create')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        # Une seule requête groupée (driver, semaine) — le lundi est le début de semaine
+        rows = (
+            Mission.objects
+            .filter(status='completed', driver__isnull=False, actual_end_time__isnull=False)
+            .annotate(week=TruncWeek('actual_end_time', output_field=DateField()))
+            .values('driver_id', 'week')
+            .annotate(
+                total_kilometers=Sum('distance'),
+                total_hours_worked=Sum('hours_worked'),
+                completed_missions=Count('id'),
+            )
+            .order_by('driver_id', 'week')
+        )
+
+        seen = set()
+        written = 0
+
+        with transaction.atomic():
+            batch = []
+            for row in rows.iterator(chunk_size=chunk_size):
+                hours = row['total_hours_worked'] or 0
+                km = row['total_kilometers'] or 0
+
+                seen.add((row['driver_id'], row['week']))
+                batch.append(WeeklyStats(
+                    driver_id=row['driver_id'],
+                    week_start=row['week'],
+                    week_end=row['week'] + timedelta(days=6),
+                    total_kilometers=km,
+                    total_hours_worked=hours,
+                    completed_missions=row['completed_missions'],
+                    average_speed=int(km / hours) if hours > 0 else 0,
+                ))
+
+                if len(batch) >= chunk_size:
+                    written += self.upsert(batch)
+                    batch = []
+
+            if batch:
+                written += self.upsert(batch)
+
+            deleted = self.delete_orphans(seen, chunk_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {len(seen)} ligne(s) WeeklyStats recalculée(s) : '
+            f'{written} écrite(s), {deleted} supprimée(s)'
+        ))
+
+    def upsert(self, batch):
+        """Écrit les lignes nouvelles ou modifiées du lot (INSERT … ON CONFLICT DO UPDATE)"""
+        existing = {
+            (driver_id, week_start): totals
+            for driver_id, week_start, *totals in WeeklyStats.objects.filter(
+                driver_id__in={stats.driver_id for stats in batch},
+                week_start__in={stats.week_start for stats in batch},
+            ).values_list('driver_id', 'week_start', *TOTAL_FIELDS)
+        }
+
+        changed = [
+            stats for stats in batch
+            if existing.get((stats.driver_id, stats.week_start)) != [getattr(stats, f) for f in TOTAL_FIELDS]
+        ]
+
+        WeeklyStats.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=['driver', 'week_start'],
+            update_fields=['week_end', *TOTAL_FIELDS, 'updated_at'],
+        )
+        return len(changed)
+
+    def delete_orphans(self, seen, chunk_size):
+        """
+        Supprime les lignes issues de missions terminées qui n'existent plus
+
+        Les lignes archivées (completed_missions = 0) ne viennent pas des
+        missions : elles sont gardées. Les suppressions restantes sont
+        réelles et laissent une pierre tombale pour la synchronisation.
+        """
+        orphans = [
+            pk
+            for pk, driver_id, week_start in WeeklyStats.objects
+            .filter(completed_missions__gt=0)
+            .values_list('id', 'driver_id', 'week_start')
+            .iterator(chunk_size=chunk_size)
+            if (driver_id, week_start) not in seen
+        ]
+
+        deleted = 0
+        for start in range(0, len(orphans), chunk_size):
+            count, _ = WeeklyStats.objects.filter(id__in=orphans[start:start + chunk_size]).delete()
+            deleted += count
+        return deleted
@@ -1,26 +1,39 @@
-from django.core.management.base import BaseCommand
-from logistics.models import Driver
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from api.stats import reset_weekly_hours
 
 
 class Command(BaseCommand):
     help = 'Reset les heures travaillées de tous les chauffeurs (à exécuter chaque dimanche à minuit)'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Affiche le rapport sans rien modifier')
+        parser.add_argument('--week-start', help='Lundi de la semaine à archiver (YYYY-MM-DD), par défaut la semaine de la veille')
+
     def handle(self, *args, **options):
-        drivers = Driver.objects.filter(is_active=True)
-        count = 0
-
-        for driver in drivers:
-            old_hours = driver.hours_worked
-            driver.reset_weekly_hours()
-            count += 1
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f'✅ {driver.name}: {old_hours:.1f}h → 0h'
-                )
-            )
+        week_start = None
+
+        if options['week_start']:
+            try:
+                week_start = date.fromisoformat(options['week_start'])
+            except ValueError:
+                raise CommandError(f"Date invalide : {options['week_start']}")
+
+        report = reset_weekly_hours(week_start=week_start, dry_run=options['dry_run'])
+
+        self.stdout.write(
+            f"📅 Semaine du {report['week_start']} au {report['week_end']}\n"
+            f"   Chauffeurs actifs : {report['drivers']} "
+            f"({report['drivers_with_hours']} avec des heures, {report['total_hours']:.1f}h au total)"
+        )
+
+        if report['dry_run']:
+            self.stdout.write(self.style.WARNING('\n🔎 Dry-run : aucune modification effectuée'))
+            return
 
         self.stdout.write(
             self.style.SUCCESS(
-                f'\n🎉 {count} chauffeur(s) réinitialisé(s) avec succès!'
+                f"\n🎉 {report['reset']} chauffeur(s) réinitialisé(s) avec succès!"
             )
-        )
\ No newline at end of file
+        )
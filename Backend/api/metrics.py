@@ -0,0 +1,106 @@
+import threading
+from bisect import bisect_left
+
+
+# =========================
+# MÉTRIQUES PAR ROUTE (FORMAT PROMETHEUS)
+# =========================
+# Registre en mémoire, par processus : chaque worker (gunicorn / uvicorn)
+# expose ses propres compteurs sur /api/metrics/, Prometheus agrège.
+# Un verrou par observation, pas d'allocation par requête hors première vue
+# d'une route : coût négligeable devant une requête SQL.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Histogramme à seaux fixes, une série par jeu de labels"""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            # [compte par seau (+Inf en dernier), somme, nombre]
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, label_names):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            base = _format_labels(label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{base}}} {total:.6f}')
+            lines.append(f'{self.name}_count{{{base}}} {count}')
+
+        return lines
+
+
+def _format_labels(names, values):
+    return ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+
+
+class MetricsRegistry:
+    """Compteurs et histogrammes des requêtes HTTP, alimentés par RequestMetricsMiddleware"""
+
+    LABELS = ('route', 'method')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.duration = Histogram('api_request_duration_seconds', 'Durée totale de la requête', DURATION_BUCKETS)
+        self.db_duration = Histogram('api_db_duration_seconds', 'Temps passé en base par requête', DURATION_BUCKETS)
+        self.db_queries = Histogram('api_db_queries', 'Requêtes SQL par requête HTTP', QUERY_BUCKETS)
+        self.app_duration = Histogram(
+            'api_app_duration_seconds', 'Temps Python hors base (vue, sérialiseurs)', DURATION_BUCKETS
+        )
+        self.render_duration = Histogram(
+            'api_render_duration_seconds', 'Temps de rendu de la réponse (JSON)', DURATION_BUCKETS
+        )
+        self.response_bytes = Histogram('api_response_bytes', 'Taille du corps de la réponse', BYTES_BUCKETS)
+
+    def observe(self, route, method, status, timings, response_bytes):
+        """`timings` : {'total', 'db', 'queries', 'app', 'render'} (secondes)"""
+        labels = (route, method)
+
+        with self.lock:
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            self.duration.observe(labels, timings['total'])
+            self.db_duration.observe(labels, timings['db'])
+            self.db_queries.observe(labels, timings['queries'])
+            self.app_duration.observe(labels, timings['app'])
+            self.render_duration.observe(labels, timings['render'])
+            if response_bytes is not None:
+                self.response_bytes.observe(labels, response_bytes)
+
+    def render(self):
+        """Exposition texte Prometheus (version 0.0.4)"""
+        with self.lock:
+            lines = ['# HELP api_requests_total Requêtes HTTP traitées', '# TYPE api_requests_total counter']
+            for labels, count in sorted(self.requests.items()):
+                lines.append(f'api_requests_total{{{_format_labels(self.LABELS + ("status",), labels)}}} {count}')
+
+            for histogram in (
+                self.duration, self.db_duration, self.db_queries,
+                self.app_duration, self.render_duration, self.response_bytes,
+            ):
+                lines.extend(histogram.render(self.LABELS))
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,109 @@
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .metrics import registry
+
+
+# =========================
+# INSTRUMENTATION DES REQUÊTES
+# =========================
+class QueryRecorder:
+    """execute_wrapper : compte les requêtes SQL et leur durée (sans DEBUG=True)"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Mesure chaque requête : durée totale, requêtes SQL et temps en base,
+    temps Python hors base (vue + sérialiseurs), rendu JSON, taille de la réponse
+
+    - en-tête `Server-Timing` (onglet Réseau du navigateur / Flipper)
+    - histogrammes par route sur /api/metrics/ (format Prometheus)
+
+    Les réponses en flux (exports) sont mesurées jusqu'au dernier octet envoyé ;
+    le flux SSE (asynchrone, sans fin) n'est pas instrumenté.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'SERVER_TIMING_ENABLED', True)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request._metrics_view_end = None
+        start = time.perf_counter()
+
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        if getattr(response, 'is_async', False):
+            return response
+
+        if response.streaming:
+            response.streaming_content = self._measure_stream(
+                request, response, response.streaming_content, recorder, start
+            )
+            return response
+
+        end = time.perf_counter()
+        timings = self._timings(request, recorder, start, end)
+
+        if self.server_timing:
+            response['Server-Timing'] = self._server_timing(timings)
+
+        self._observe(request, response, timings, len(response.content))
+        return response
+
+    def process_template_response(self, request, response):
+        # Appelé juste après la vue, avant le rendu des Response DRF
+        request._metrics_view_end = time.perf_counter()
+        return response
+
+    def _measure_stream(self, request, response, content, recorder, start):
+        size = 0
+        # La génération (requêtes + sérialisation) a lieu pendant l'itération
+        with connection.execute_wrapper(recorder):
+            for chunk in content:
+                size += len(chunk)
+                yield chunk
+
+        self._observe(request, response, self._timings(request, recorder, start, time.perf_counter()), size)
+
+    def _timings(self, request, recorder, start, end):
+        view_end = request._metrics_view_end
+        render = end - view_end if view_end else 0.0
+        total = end - start
+
+        return {
+            'total': total,
+            'db': recorder.duration,
+            'queries': recorder.count,
+            'render': render,
+            'app': max(0.0, total - recorder.duration - render),
+        }
+
+    def _server_timing(self, timings):
+        return ', '.join([
+            f'db;dur={timings["db"] * 1000:.1f};desc="{timings["queries"]} queries"',
+            f'app;dur={timings["app"] * 1000:.1f}',
+            f'render;dur={timings["render"] * 1000:.1f}',
+            f'total;dur={timings["total"] * 1000:.1f}',
+        ])
+
+    def _observe(self, request, response, timings, size):
+        match = request.resolver_match
+        route = match.view_name if match else 'unmatched'
+        registry.observe(route, request.method, response.status_code, timings, size)
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_truck_avg_consumption'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fuelentry',
+            index=models.Index(fields=['truck', '-created_at'], name='fuel_truck_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuelentry',
+            index=models.Index(fields=['-created_at', '-id'], name='fuel_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['truck', 'status'], name='mission_truck_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['driver', 'status', 'actual_end_time'], name='mission_driver_status_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['status', 'actual_end_time'], name='mission_status_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['-created_at', '-id'], name='mission_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['driver', 'is_read', '-created_at'], name='notif_driver_read_created_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_completed_missions(apps, schema_editor):
+    # Les missions déjà terminées ont été créditées par l'ancien signal (cache) :
+    # on les inscrit au journal pour ne jamais les compter une seconde fois
+    Mission = apps.get_model('api', 'Mission')
+    DriverHoursCredit = apps.get_model('api', 'DriverHoursCredit')
+
+    missions = Mission.objects.filter(status='completed', driver__isnull=False).values_list(
+        'id', 'driver_id', 'pickup_time', 'expected_dropoff_time'
+    )
+
+    batch = []
+    for mission_id, driver_id, pickup_time, dropoff_time in missions.iterator(chunk_size=1000):
+        hours = (dropoff_time - pickup_time).total_seconds() / 3600
+        batch.append(DriverHoursCredit(mission_id=mission_id, driver_id=driver_id, hours=max(0, hours)))
+
+        if len(batch) >= 1000:
+            DriverHoursCredit.objects.bulk_create(batch)
+            batch = []
+
+    DriverHoursCredit.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_mission_fuel_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriverHoursCredit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hours', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('driver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hours_credits', to='api.driver')),
+                ('mission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='hours_credit', to='api.mission')),
+            ],
+            options={
+                'db_table': 'driver_hours_credits',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.RunPython(backfill_completed_missions, migrations.RunPython.noop),
+    ]
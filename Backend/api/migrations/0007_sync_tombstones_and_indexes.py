@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_driver_hours_credit'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'tombstones',
+                'ordering': ['deleted_at', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='driver',
+            index=models.Index(fields=['updated_at', 'id'], name='driver_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['updated_at', 'id'], name='mission_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='truck',
+            index=models.Index(fields=['updated_at', 'id'], name='truck_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weeklystats',
+            index=models.Index(fields=['updated_at', 'id'], name='weekly_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_idx'),
+        ),
+    ]
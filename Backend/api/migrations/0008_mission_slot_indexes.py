@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_sync_tombstones_and_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['truck', 'status', 'pickup_time'], name='mission_truck_slot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['driver', 'status', 'pickup_time'], name='mission_driver_slot_idx'),
+        ),
+    ]
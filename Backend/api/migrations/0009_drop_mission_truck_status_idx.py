@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_mission_slot_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='mission',
+            name='mission_truck_status_idx',
+        ),
+    ]
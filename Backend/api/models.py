@@ -1,5 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+from django.db.models.functions import Cast, Floor, Greatest, Least
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from . import events
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
@@ -21,6 +26,10 @@ class Driver(models.Model):
     class Meta:
         db_table = 'drivers'
         ordering = ['-created_at']
+        indexes = [
+            # Synchronisation incrémentale (/api/sync/)
+            models.Index(fields=['updated_at', 'id'], name='driver_updated_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -36,12 +45,15 @@ class Driver(models.Model):
     def reset_weekly_hours(self):
         """Reset les heures travaillées à 0 (appelé chaque dimanche à minuit)"""
         self.hours_worked = 0
-        self.save()
+        self.save(update_fields=['hours_worked', 'updated_at'])
 
 
 # ==================================================
 # TRUCK
 # ==================================================
+FUEL_PRICE_PER_LITER = 15.0  # DH
+
+
 class Truck(models.Model):
     """Modèle pour les camions"""
     MOTORIZATION_CHOICES = [
@@ -67,6 +79,10 @@ class Truck(models.Model):
     class Meta:
         db_table = 'trucks'
         ordering = ['-created_at']
+        indexes = [
+            # Synchronisation incrémentale (/api/sync/)
+            models.Index(fields=['updated_at', 'id'], name='truck_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.brand} - {self.plate}"
@@ -76,7 +92,44 @@ class Truck(models.Model):
             self.fuel_percentage = int((self.current_fuel / self.tank_capacity) * 100)
         super().save(*args, **kwargs)
     
-    def calculate_fuel_cost(self, distance_km, price_per_liter=15.0):
+    def adjust_fuel(self, liters):
+        """
+        Ajoute (liters > 0) ou retire (liters < 0) du carburant
+
+        Un seul UPDATE atomique calculé par la base : pas de lecture/écriture
+        côté Python, donc pas de mise à jour perdue entre requêtes concurrentes.
+        Le niveau est borné entre 0 et la capacité du réservoir, et
+        `fuel_percentage` est recalculé dans la même requête.
+
+        Le niveau est relu dans la même transaction que l'UPDATE (la ligne
+        est alors verrouillée) : l'instance reflète la valeur réellement
+        écrite, y compris après une écriture concurrente sur ce camion.
+        """
+        new_fuel = Greatest(
+            Least(F('current_fuel') + liters, F('tank_capacity'), output_field=FloatField()),
+            Value(0.0),
+            output_field=FloatField(),
+        )
+
+        with transaction.atomic(savepoint=False):
+            Truck.objects.filter(pk=self.pk).update(
+                current_fuel=new_fuel,
+                fuel_percentage=Case(
+                    When(tank_capacity__gt=0, then=Cast(Floor(new_fuel * 100 / F('tank_capacity')), IntegerField())),
+                    default=F('fuel_percentage'),
+                ),
+                updated_at=timezone.now(),
+            )
+            self.refresh_from_db(fields=['current_fuel', 'fuel_percentage', 'updated_at'])
+
+        events.publish(
+            'truck.fuel',
+            truck_id=self.pk,
+            current_fuel=self.current_fuel,
+            fuel_percentage=self.fuel_percentage
+        )
+
+    def calculate_fuel_cost(self, distance_km, price_per_liter=FUEL_PRICE_PER_LITER):
         """Calcule le coût estimé du carburant"""
         liters_needed = (distance_km * self.avg_consumption) / 100
         return liters_needed * price_per_liter
@@ -87,16 +140,25 @@ class Truck(models.Model):
     
     def has_enough_fuel(self, distance_km):
         """Vérifie si le camion a assez de carburant pour la distance"""
-        fuel_needed = self.calculate_fuel_needed(distance_km)
-        missing = max(0, fuel_needed - self.current_fuel)
-        
+        return Truck.fuel_check(self.current_fuel, self.avg_consumption, self.tank_capacity, distance_km)
+
+    @staticmethod
+    def fuel_check(current_fuel, avg_consumption, tank_capacity, distance_km, price_per_liter=FUEL_PRICE_PER_LITER):
+        """
+        Calcul pur (sans instance) de has_enough_fuel
+
+        Utilisé aussi par le contrôle en lot, à partir de simples values_list.
+        """
+        fuel_needed = (distance_km * avg_consumption) / 100
+        missing = max(0, fuel_needed - current_fuel)
+
         return {
-            'enough': self.current_fuel >= fuel_needed,
-            'current_fuel': self.current_fuel,
+            'enough': current_fuel >= fuel_needed,
+            'current_fuel': current_fuel,
             'needed': fuel_needed,
             'missing': missing,
-            'refuel_cost': missing * 15.0,
-            'full_tank_cost': (self.tank_capacity - self.current_fuel) * 15.0
+            'refuel_cost': missing * price_per_liter,
+            'full_tank_cost': (tank_capacity - current_fuel) * price_per_liter
         }
 
 
@@ -154,6 +216,20 @@ class Mission(models.Model):
     class Meta:
         db_table = 'missions'
         ordering = ['-created_at']
+        indexes = [
+            # Stats chauffeur / missions actives d'un chauffeur
+            models.Index(fields=['driver', 'status', 'actual_end_time'], name='mission_driver_status_end_idx'),
+            # Dashboard : compteurs par status, terminées aujourd'hui
+            models.Index(fields=['status', 'actual_end_time'], name='mission_status_end_idx'),
+            # Pagination par curseur
+            models.Index(fields=['-created_at', '-id'], name='mission_created_idx'),
+            # Synchronisation incrémentale (/api/sync/)
+            models.Index(fields=['updated_at', 'id'], name='mission_updated_idx'),
+            # Chevauchements / disponibilités (api/scheduling.py) ; le préfixe
+            # (truck, status) sert aussi « camion occupé ? » (validate, destroy)
+            models.Index(fields=['truck', 'status', 'pickup_time'], name='mission_truck_slot_idx'),
+            models.Index(fields=['driver', 'status', 'pickup_time'], name='mission_driver_slot_idx'),
+        ]
 
     def __str__(self):
         return f"Mission {self.id}: {self.departure_city} → {self.arrival_city}"
@@ -186,6 +262,11 @@ class FuelEntry(models.Model):
     class Meta:
         db_table = 'fuel_entries'
         ordering = ['-created_at']
+        indexes = [
+            # Historique carburant d'un camion (/fuel/?truck=ID)
+            models.Index(fields=['truck', '-created_at'], name='fuel_truck_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='fuel_created_idx'),
+        ]
 
     def __str__(self):
         return f"Carburant - {self.truck.plate} - {self.quantity}L"
@@ -213,6 +294,10 @@ class Notification(models.Model):
     class Meta:
         db_table = 'notifications'
         ordering = ['-created_at']
+        indexes = [
+            # Notifications (non lues) d'un chauffeur, les plus récentes d'abord
+            models.Index(fields=['driver', 'is_read', '-created_at'], name='notif_driver_read_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.driver.name}"
@@ -237,6 +322,59 @@ class WeeklyStats(models.Model):
         db_table = 'weekly_stats'
         ordering = ['-week_start']
         unique_together = ['driver', 'week_start']
+        indexes = [
+            # Synchronisation incrémentale (/api/sync/)
+            models.Index(fields=['updated_at', 'id'], name='weekly_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"Stats {self.driver.name} - Semaine du {self.week_start}"
+
+
+# ==================================================
+# HOURS CREDIT (LEDGER)
+# ==================================================
+class DriverHoursCredit(models.Model):
+    """
+    Journal des heures créditées aux chauffeurs
+
+    Une ligne par mission terminée (contrainte unique sur `mission`) :
+    les heures d'une mission ne peuvent être ajoutées qu'une seule fois,
+    quel que soit le nombre de workers ou de redémarrages.
+    """
+    mission = models.OneToOneField(Mission, on_delete=models.CASCADE, related_name='hours_credit')
+    driver = models.ForeignKey(Driver, on_delete=models.CASCADE, related_name='hours_credits')
+    hours = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'driver_hours_credits'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.driver.name} +{self.hours:.1f}h (Mission {self.mission_id})"
+
+
+# ==================================================
+# TOMBSTONE (SYNC)
+# ==================================================
+class Tombstone(models.Model):
+    """
+    Trace d'une suppression, pour la synchronisation incrémentale
+
+    Les clients mobiles reçoivent ces lignes via /api/sync/ et retirent
+    l'objet correspondant de leur cache local.
+    """
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'tombstones'
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_idx'),
+        ]
 
     def __str__(self):
-        return f"Stats {self.driver.name} - Semaine du {self.week_start}"
\ No newline at end of file
+        return f"{self.model} #{self.object_id} supprimé le {self.deleted_at}"
@@ -0,0 +1,21 @@
+from rest_framework.pagination import CursorPagination
+
+
+# =========================
+# PAGINATION PAR CURSEUR (KEYSET)
+# =========================
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Pagination keyset sur (created_at, id)
+
+    Contrairement à LIMIT/OFFSET, le coût d'une page ne dépend pas
+    de sa position dans la table : la latence reste stable même avec
+    des dizaines de milliers de missions.
+
+    - ?page_size=N  → taille de page (max 500)
+    - ?cursor=...   → curseur opaque renvoyé dans `next` / `previous`
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-created_at', '-id')
@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+# =========================
+# CACHE DES REPRÉSENTATIONS SÉRIALISÉES
+# =========================
+class RepresentationCache:
+    """
+    Cache LRU borné des représentations sérialisées (Driver, Truck)
+
+    Clé : (modèle, pk) ; la valeur est stockée avec la version `updated_at`.
+    Une entrée n'est servie que si la version correspond à l'objet chargé :
+    un objet modifié par un autre worker (ou via .update()) est donc
+    re-sérialisé automatiquement. Les signals save/delete retirent
+    l'entrée localement.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(instance):
+        return (instance._meta.label, instance.pk)
+
+    def get_or_render(self, instance, render):
+        key = self._key(instance)
+        version = instance.updated_at
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        data = render()
+
+        with self._lock:
+            self._entries[key] = (version, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return data
+
+    def invalidate(self, instance):
+        with self._lock:
+            self._entries.pop(self._key(instance), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+representation_cache = RepresentationCache(getattr(settings, 'REPRESENTATION_CACHE_SIZE', 2000))
+
+
+class CachedRepresentationMixin:
+    """
+    À placer avant ModelSerializer : la représentation d'un objet est
+    réutilisée tant que son `updated_at` ne change pas, y compris quand
+    le serializer est imbriqué (driver / truck dans chaque mission).
+    """
+
+    def to_representation(self, instance):
+        return representation_cache.get_or_render(
+            instance,
+            lambda: super(CachedRepresentationMixin, self).to_representation(instance)
+        )
@@ -0,0 +1,171 @@
+import bisect
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Driver, Truck, Mission
+
+
+# =========================
+# PLANNING : CHEVAUCHEMENTS ET DISPONIBILITÉS
+# =========================
+# Une mission `pending` ou `in_progress` occupe son camion et son chauffeur
+# sur [pickup_time, expected_dropoff_time[. Les créneaux déjà en base peuvent
+# se chevaucher (données importées, status modifiés à la main) : un nouveau
+# créneau est donc comparé à tous ceux qui commencent avant sa fin, via
+# l'index (ressource, status, pickup_time).
+ACTIVE_STATUSES = ('pending', 'in_progress')
+AVAILABILITY_DEFAULT_DAYS = 7
+AVAILABILITY_MAX_DAYS = 31
+
+
+class Schedule:
+    """
+    Créneaux occupés d'une ressource (triés par début) — test de chevauchement en O(log n)
+
+    `reach[i]` = (fin la plus tardive parmi les créneaux 0..i, sa clé) : un
+    créneau long qui en englobe de plus courts reste détecté.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.keys = []
+        self.reach = []
+
+    def conflict(self, start, end):
+        """Retourne la clé d'un créneau qui chevauche [start, end[, ou None"""
+        i = bisect.bisect_left(self.starts, end)
+        # Parmi les créneaux qui commencent avant `end`, le plus tardif ne doit pas finir après start
+        if i and self.reach[i - 1][0] > start:
+            return self.reach[i - 1][1]
+        return None
+
+    def is_free(self, start, end):
+        i = bisect.bisect_left(self.starts, end)
+        return i == 0 or self.reach[i - 1][0] <= start
+
+    def add(self, start, end, key=None):
+        i = bisect.bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.keys.insert(i, key)
+
+        reach = (end, key)
+        if i and self.reach[i - 1][0] >= end:
+            reach = self.reach[i - 1]
+        self.reach.insert(i, reach)
+
+        # Propager la nouvelle fin tant qu'elle dépasse le maximum déjà connu
+        for j in range(i + 1, len(self.reach)):
+            if self.reach[j][0] >= reach[0]:
+                break
+            self.reach[j] = reach
+
+
+def find_overlapping_mission(field, resource, start, end, exclude_pk=None):
+    """
+    Mission active de `resource` (field = 'truck' ou 'driver') qui chevauche [start, end[
+
+    Une requête sur l'index (ressource, status, pickup_time), sans supposer
+    que les missions existantes ne se chevauchent pas entre elles.
+    """
+    missions = Mission.objects.filter(
+        **{field: resource},
+        status__in=ACTIVE_STATUSES,
+        pickup_time__lt=end,
+        expected_dropoff_time__gt=start,
+    )
+    if exclude_pk:
+        missions = missions.exclude(pk=exclude_pk)
+
+    # Sans ORDER BY : la première ligne trouvée suffit
+    return next(iter(missions.order_by().values_list('id', flat=True)[:1]), None)
+
+
+def load_schedules(field, resource_ids, schedules):
+    """
+    Complète `schedules` ({id: Schedule}) avec les missions actives des
+    ressources pas encore chargées — une requête, pour les imports en masse.
+    """
+    missing = set(resource_ids) - schedules.keys()
+    if not missing:
+        return schedules
+
+    for resource_id in missing:
+        schedules[resource_id] = Schedule()
+
+    for mission_id, resource_id, start, end in Mission.objects.filter(
+        **{f'{field}_id__in': missing},
+        status__in=ACTIVE_STATUSES,
+    ).values_list('id', f'{field}_id', 'pickup_time', 'expected_dropoff_time'):
+        schedules[resource_id].add(start, end, mission_id)
+
+    return schedules
+
+
+def parse_availability_window(date_from, date_to):
+    """Bornes de /availability/ : maintenant → +7 jours par défaut, 31 jours maximum"""
+    start = date_from or timezone.now()
+    end = date_to or start + timedelta(days=AVAILABILITY_DEFAULT_DAYS)
+
+    if end <= start:
+        raise ValueError('`to` doit être postérieur à `from`.')
+    if end - start > timedelta(days=AVAILABILITY_MAX_DAYS):
+        raise ValueError(f'Fenêtre limitée à {AVAILABILITY_MAX_DAYS} jours.')
+
+    return start, end
+
+
+def _free_windows(busy, start, end):
+    """Créneaux libres de [start, end[ entre les créneaux occupés triés `busy`"""
+    windows = []
+    cursor = start
+
+    for busy_start, busy_end in busy:
+        if busy_start > cursor:
+            windows.append({'start': cursor, 'end': busy_start})
+        cursor = max(cursor, busy_end)
+
+    if cursor < end:
+        windows.append({'start': cursor, 'end': end})
+
+    return windows
+
+
+def get_availability(start, end, truck_ids=None, driver_ids=None):
+    """
+    Créneaux libres par camion et par chauffeur sur [start, end[
+
+    Sans liste d'ids : tous les camions disponibles et chauffeurs actifs.
+    Deux requêtes pour les ressources, deux pour leurs missions actives.
+    """
+    result = {}
+
+    for key, field, model, active_filter, ids in (
+        ('trucks', 'truck', Truck, {'is_available': True}, truck_ids),
+        ('drivers', 'driver', Driver, {'is_active': True}, driver_ids),
+    ):
+        resources = model.objects.filter(id__in=ids) if ids else model.objects.filter(**active_filter)
+        resources = dict(resources.order_by('id').values_list('id', 'plate' if field == 'truck' else 'name'))
+
+        busy = {resource_id: [] for resource_id in resources}
+        for resource_id, busy_start, busy_end in Mission.objects.filter(
+            **{f'{field}_id__in': resources.keys()},
+            status__in=ACTIVE_STATUSES,
+            pickup_time__lt=end,
+            expected_dropoff_time__gt=start,
+        ).order_by('pickup_time').values_list(f'{field}_id', 'pickup_time', 'expected_dropoff_time'):
+            busy[resource_id].append((busy_start, busy_end))
+
+        result[key] = [
+            {
+                'id': resource_id,
+                'label': label,
+                'busy': [{'start': s, 'end': e} for s, e in busy[resource_id]],
+                'free': _free_windows(busy[resource_id], start, end),
+            }
+            for resource_id, label in resources.items()
+        ]
+
+    return {'from': start, 'to': end, **result}
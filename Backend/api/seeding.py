@@ -0,0 +1,333 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import islice
+from operator import methodcaller
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Driver, Truck, Mission, FuelEntry, Notification
+
+
+# =========================
+# JEUX DE DONNÉES VOLUMINEUX (BENCHMARKS)
+# =========================
+# Tout passe par des insertions par lots (bulk_create pour les utilisateurs,
+# chauffeurs et camions, INSERT brut pour les grosses tables) : pas de signal,
+# pas de validation, pas de hash de mot de passe par ligne. Les lignes sont
+# générées à la volée (jamais plus d'un lot en mémoire), ce qui permet d'aller
+# jusqu'à plusieurs millions de missions / pleins.
+SEED_BATCH_SIZE = 5000
+# Au-delà, les index de Meta.indexes sont supprimés pendant le chargement puis recréés
+DEFER_INDEXES_MIN_ROWS = 100_000
+
+DATASETS = {
+    'small': {'drivers': 200, 'trucks': 50, 'missions': 10_000, 'fuel_entries': 50_000, 'notifications': 1_000},
+    'medium': {'drivers': 2_000, 'trucks': 200, 'missions': 100_000, 'fuel_entries': 500_000, 'notifications': 10_000},
+    'full': {'drivers': 10_000, 'trucks': 500, 'missions': 1_000_000, 'fuel_entries': 5_000_000, 'notifications': 50_000},
+}
+
+CITIES = [
+    ('Casablanca', 'Port de Casablanca'),
+    ('Rabat', 'Zone industrielle Hay Riad'),
+    ('Tanger', 'Port Tanger Med'),
+    ('Oujda', "Port d'Oujda"),
+    ('Marrakech', 'Zone logistique'),
+    ('Agadir', "Port d'Agadir"),
+]
+CONTAINER_TYPES = ['20ft', '40ft', '40ft HC']
+BRANDS = ['Mercedes Actros', 'Volvo FH16', 'Scania R500', 'MAN TGX', 'Renault T', 'DAF XF']
+MISSION_STATUSES = ['completed'] * 14 + ['pending'] * 4 + ['in_progress', 'cancelled']
+
+
+def _bulk_insert(model, rows, batch_size, log=None):
+    """Insère un générateur de lignes par lots ; retourne le nombre de lignes"""
+    total = 0
+    rows = iter(rows)
+
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=batch_size)
+
+        total += len(batch)
+        if log:
+            log(f'  … {model.__name__} : {total}')
+
+    return total
+
+
+def seed_drivers(count, rng, batch_size=SEED_BATCH_SIZE, log=None):
+    """Crée `count` utilisateurs + chauffeurs ; retourne les ids des chauffeurs créés"""
+    # Suffixe unique : permet de relancer le peuplement sur une base existante
+    base = (User.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+    password = make_password('password123')
+
+    _bulk_insert(User, (
+        User(username=f'driver{base + i}', email=f'driver{base + i}@transport.ma', password=password)
+        for i in range(count)
+    ), batch_size)
+
+    users = User.objects.filter(username__startswith='driver', id__gte=base).values_list('id', 'username')
+
+    _bulk_insert(Driver, (
+        Driver(
+            user_id=user_id,
+            name=f'Chauffeur {username[6:]}',
+            email=f'{username}@transport.ma',
+            phone=f'+212 6 {rng.randint(10_000_000, 99_999_999)}',
+            contractual_hours=rng.choice([40, 50, 55, 60]),
+            hours_worked=round(rng.uniform(0, 40), 1),
+        )
+        for user_id, username in users.iterator()
+    ), batch_size, log)
+
+    return list(Driver.objects.filter(user_id__gte=base).values_list('id', flat=True))
+
+
+def seed_trucks(count, rng, batch_size=SEED_BATCH_SIZE, log=None):
+    """Crée `count` camions ; retourne leurs ids"""
+    base = (Truck.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+    def trucks():
+        for i in range(count):
+            tank_capacity = rng.choice([300, 400, 450, 500])
+            current_fuel = round(rng.uniform(0.1, 1) * tank_capacity, 1)
+            yield Truck(
+                plate=f'{base + i:05d}-B-{rng.randint(1, 9)}',
+                brand=rng.choice(BRANDS),
+                capacity=rng.randint(20_000, 30_000),
+                power=rng.randint(400, 550),
+                motorization='Diesel',
+                tank_capacity=tank_capacity,
+                current_fuel=current_fuel,
+                avg_consumption=round(rng.uniform(22, 38), 1),
+                fuel_percentage=int(current_fuel / tank_capacity * 100),
+            )
+
+    _bulk_insert(Truck, trucks(), batch_size, log)
+    return list(Truck.objects.filter(id__gte=base).values_list('id', flat=True))
+
+
+def _insert_rows(model, columns, batches, log=None):
+    """
+    INSERT multi-lignes brut (executemany) pour les grosses tables
+
+    `batches` produit des listes de tuples dans l'ordre de `columns`, déjà
+    adaptés à la base. On évite ainsi la préparation champ par champ de
+    bulk_create (get_db_prep_save), qui domine au-delà de ~100k lignes.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    names = ', '.join(connection.ops.quote_name(model._meta.get_field(c).column) for c in columns)
+    sql = f'INSERT INTO {table} ({names}) VALUES ({", ".join(["%s"] * len(columns))})'
+
+    total = 0
+    for rows in batches:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+        total += len(rows)
+        if log:
+            log(f'  … {model.__name__} : {total}')
+
+    return total
+
+
+@contextmanager
+def deferred_indexes(model, enabled=True):
+    """
+    Supprime les index secondaires (Meta.indexes) le temps d'un chargement massif
+
+    Les recréer ensuite (un tri par index) est bien plus rapide que de les
+    maintenir ligne à ligne sur des insertions dans le désordre.
+    """
+    if not enabled:
+        yield
+        return
+
+    with connection.schema_editor() as editor:
+        for index in model._meta.indexes:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for index in model._meta.indexes:
+                editor.add_index(model, index)
+
+
+def _clock():
+    """
+    (maintenant, adaptateur) pour générer des dates sans adapt_datetimefield_value
+    par valeur (~3 µs, ×3 par mission)
+
+    SQLite stocke du texte UTC naïf : on génère directement en UTC naïf et on
+    formate avec isoformat. Les autres bases reçoivent le datetime tel quel.
+    """
+    now = timezone.now()
+    if connection.vendor == 'sqlite':
+        return now.replace(tzinfo=None), methodcaller('isoformat', ' ')
+    return now, lambda value: value
+
+
+def _batch_sizes(count, batch_size):
+    for start in range(0, count, batch_size):
+        yield min(batch_size, count - start)
+
+
+MISSION_COLUMNS = [
+    'driver', 'truck', 'departure_city', 'departure_address', 'pickup_time',
+    'arrival_city', 'arrival_address', 'expected_dropoff_time', 'container_number',
+    'container_type', 'distance', 'estimated_fuel_cost', 'actual_fuel_cost', 'status',
+    'actual_start_time', 'actual_end_time', 'hours_worked', 'created_at', 'updated_at',
+]
+
+
+def seed_missions(count, driver_ids, truck_ids, rng, batch_size=SEED_BATCH_SIZE, log=None):
+    """
+    Crée `count` missions réparties sur ±90 jours
+
+    ~70 % terminées (passées), 20 % en attente (futures), 5 % en cours, 5 % annulées.
+    Les créneaux ne sont pas dédoublonnés : données de charge, pas de planning réel.
+    Valeurs tirées colonne par colonne (rng.choices), sans instancier de modèle.
+    """
+    now, adapt = _clock()
+    # timedelta pré-calculés, indexés par minute : pas d'arithmétique par ligne
+    minutes = [timedelta(minutes=m) for m in range(90 * 24 * 60)]
+    routes_pool = [(a, b) for a in CITIES for b in CITIES if a != b]
+
+    def batches():
+        number = 0
+        for size in _batch_sizes(count, batch_size):
+            statuses = rng.choices(MISSION_STATUSES, k=size)
+            routes = rng.choices(routes_pool, k=size)
+            drivers = rng.choices(driver_ids, k=size) if driver_ids else [None] * size
+            trucks = rng.choices(truck_ids, k=size) if truck_ids else [None] * size
+            distances = rng.choices(range(150, 601), k=size)
+            durations = rng.choices(minutes[4 * 60:12 * 60 + 1], k=size)
+            lead_times = rng.choices(minutes[60:7 * 24 * 60], k=size)
+            containers = rng.choices(CONTAINER_TYPES, k=size)
+            # Un tirage par cas, sélectionné selon le status : pending dans le futur,
+            # in_progress démarrée depuis 30 min à 6 h, le reste dans le passé
+            future = rng.choices(minutes[60:], k=size)
+            running = rng.choices(minutes[30:6 * 60], k=size)
+            past = rng.choices(minutes[12 * 60:], k=size)
+            noise = [rng.random() for _ in range(2 * size)]
+
+            rows = []
+            for i, (status, (departure, arrival), driver_id, truck_id, distance, duration, lead, container) in enumerate(zip(
+                statuses, routes, drivers, trucks, distances, durations, lead_times, containers
+            )):
+                if status == 'pending':
+                    pickup_time = now + future[i]
+                    created_at = adapt(now - lead)
+                else:
+                    pickup_time = now - (running[i] if status == 'in_progress' else past[i])
+                    created_at = adapt(pickup_time - lead)
+
+                dropoff_time = pickup_time + duration
+                pickup, dropoff = adapt(pickup_time), adapt(dropoff_time)
+                estimated = round(distance * (4 + 2 * noise[2 * i]), 2)
+                done = status == 'completed'
+
+                rows.append((
+                    driver_id, truck_id, departure[0], departure[1], pickup,
+                    arrival[0], arrival[1], dropoff, f'CONT{number + i:07d}',
+                    container, distance, estimated,
+                    round(estimated * (0.9 + 0.2 * noise[2 * i + 1]), 2) if done else None,
+                    status,
+                    pickup if done or status == 'in_progress' else None,
+                    dropoff if done else None,
+                    round(duration.total_seconds() / 3600, 2) if done else 0,
+                    created_at, created_at,
+                ))
+
+            number += size
+            yield rows
+
+    return _insert_rows(Mission, MISSION_COLUMNS, batches(), log)
+
+
+def seed_fuel_entries(count, truck_ids, rng, batch_size=SEED_BATCH_SIZE, log=None):
+    """Crée `count` pleins répartis sur les camions et les 90 derniers jours (sans ajuster leur niveau)"""
+    now, adapt = _clock()
+    locations = [city for city, _ in CITIES]
+
+    def batches():
+        for size in _batch_sizes(count, batch_size):
+            trucks = rng.choices(truck_ids, k=size)
+            quantities = rng.choices(range(100, 401), k=size)
+            places = rng.choices(locations, k=size)
+            ages = rng.choices(range(90 * 24 * 60), k=size)
+
+            yield [
+                (truck_id, quantity, quantity * 15.0, place, 'Plein de carburant', adapt(now - timedelta(minutes=age)))
+                for truck_id, quantity, place, age in zip(trucks, quantities, places, ages)
+            ]
+
+    return _insert_rows(
+        FuelEntry, ['truck', 'quantity', 'cost', 'location', 'notes', 'created_at'], batches(), log
+    )
+
+
+NOTIFICATION_TEMPLATES = [
+    ('mission', 'Nouvelle mission assignée', 'Une nouvelle mission vous a été assignée.'),
+    ('fuel', 'Niveau de carburant bas', 'Le niveau de carburant de votre camion est bas.'),
+    ('general', 'Rappel', "N'oubliez pas de vérifier votre planning."),
+    ('mission', 'Mission proche', 'Votre prochaine mission commence dans 2 heures.'),
+]
+
+
+def seed_notifications(count, driver_ids, rng, batch_size=SEED_BATCH_SIZE, log=None):
+    """Crée `count` notifications réparties sur les chauffeurs"""
+    now, adapt = _clock()
+
+    def batches():
+        for size in _batch_sizes(count, batch_size):
+            drivers = rng.choices(driver_ids, k=size)
+            templates = rng.choices(NOTIFICATION_TEMPLATES, k=size)
+            read = rng.choices([True, False], k=size)
+            ages = rng.choices(range(30 * 24 * 60), k=size)
+
+            yield [
+                (driver_id, title, message, kind, is_read, adapt(now - timedelta(minutes=age)))
+                for driver_id, (kind, title, message), is_read, age in zip(drivers, templates, read, ages)
+            ]
+
+    return _insert_rows(
+        Notification, ['driver', 'title', 'message', 'notification_type', 'is_read', 'created_at'], batches(), log
+    )
+
+
+def seed_scale_dataset(drivers, trucks, missions, fuel_entries, notifications=0, seed=42,
+                       batch_size=SEED_BATCH_SIZE, log=None):
+    """
+    Peuple la base avec un jeu de données reproductible (même `seed` → mêmes valeurs)
+
+    Retourne le nombre de lignes créées par table.
+    """
+    rng = random.Random(seed)
+
+    driver_ids = seed_drivers(drivers, rng, batch_size, log)
+    truck_ids = seed_trucks(trucks, rng, batch_size, log)
+
+    with deferred_indexes(Mission, enabled=missions >= DEFER_INDEXES_MIN_ROWS):
+        missions = seed_missions(missions, driver_ids, truck_ids, rng, batch_size, log)
+
+    with deferred_indexes(FuelEntry, enabled=fuel_entries >= DEFER_INDEXES_MIN_ROWS):
+        fuel_entries = seed_fuel_entries(fuel_entries, truck_ids, rng, batch_size, log) if truck_ids else 0
+
+    return {
+        'drivers': len(driver_ids),
+        'trucks': len(truck_ids),
+        'missions': missions,
+        'fuel_entries': fuel_entries,
+        'notifications': seed_notifications(notifications, driver_ids, rng, batch_size, log) if driver_ids else 0,
+    }
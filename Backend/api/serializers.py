@@ -1,3 +1,5 @@
+import logging
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
 
@@ -9,6 +11,10 @@ from .models import (
     Notification,
     WeeklyStats
 )
+from .representation_cache import CachedRepresentationMixin
+from .scheduling import find_overlapping_mission
+
+logger = logging.getLogger(__name__)
 
 # =========================
 # USER
@@ -22,7 +28,7 @@ class UserSerializer(serializers.ModelSerializer):
 # =========================
 # DRIVER
 # =========================
-class DriverSerializer(serializers.ModelSerializer):
+class DriverSerializer(CachedRepresentationMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     remaining_hours = serializers.SerializerMethodField()
 
@@ -65,7 +71,7 @@ class DriverSerializer(serializers.ModelSerializer):
 # =========================
 # TRUCK
 # =========================
-class TruckSerializer(serializers.ModelSerializer):
+class TruckSerializer(CachedRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = Truck
         fields = '__all__'
@@ -76,6 +82,8 @@ class TruckSerializer(serializers.ModelSerializer):
 # =========================
 class MissionSerializer(serializers.ModelSerializer):
     # 🔹 LECTURE : Toujours retourner les objets complets
+    # (aussi après cancel / start / complete — les champs imbriqués
+    # suffisent, la ViewSet charge driver/user/truck via select_related)
     driver = DriverSerializer(read_only=True)
     truck = TruckSerializer(read_only=True)
 
@@ -99,20 +107,38 @@ class MissionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Mission
         fields = '__all__'
+        # Le status ne change que via /start/, /complete/, /cancel/ (api/transitions.py)
+        read_only_fields = ['status']
 
     def validate(self, data):
         """
         Validations lors de la création ou modification d'une mission
 
         ⚠️ RÈGLE IMPORTANTE :
-        - Si on modifie UNIQUEMENT le status (cancel / start / complete),
-          on NE BLOQUE PAS avec les validations métier.
+        - Le status ne change que via /start/, /complete/, /cancel/ :
+          un status différent de l'actuel est refusé (400). Renvoyer le
+          status inchangé (objet complet en PUT) reste accepté.
         """
 
         # ==================================================
-        # CAS SPÉCIAL : UPDATE PARTIEL (status seul)
+        # ✅ VALIDATION 0 : Status réservé aux transitions
+        # ==================================================
+        requested_status = getattr(self, 'initial_data', {}).get('status')
+        current_status = self.instance.status if self.instance else 'pending'
+
+        if requested_status not in (None, current_status):
+            raise serializers.ValidationError({
+                'status': (
+                    f'Le status ne peut pas être modifié directement '
+                    f'(actuel : {current_status}). Utilisez /missions/{{id}}/start/, '
+                    f'/complete/ ou /cancel/.'
+                )
+            })
+
+        # ==================================================
+        # CAS SPÉCIAL : UPDATE PARTIEL VIDE (status seul, inchangé)
         # ==================================================
-        if self.instance and set(data.keys()) == {'status'}:
+        if self.instance and not data:
             return data
 
         # ==================================================
@@ -157,6 +183,30 @@ class MissionSerializer(serializers.ModelSerializer):
                     )
                 })
 
+        # ==================================================
+        # ✅ VALIDATION 1 bis : Créneau déjà réservé ?
+        # ==================================================
+        if pickup_time and expected_dropoff_time:
+            exclude_pk = self.instance.pk if self.instance else None
+
+            for field, resource, label in (
+                ('truck', truck, 'Ce camion'),
+                ('driver', driver, 'Ce chauffeur'),
+            ):
+                if not resource:
+                    continue
+
+                conflict_id = find_overlapping_mission(
+                    field, resource, pickup_time, expected_dropoff_time, exclude_pk
+                )
+                if conflict_id:
+                    raise serializers.ValidationError({
+                        field: (
+                            f'{label} est déjà réservé sur ce créneau '
+                            f'(mission #{conflict_id}).'
+                        )
+                    })
+
         # ==================================================
         # ✅ VALIDATION 2 : Heures contractuelles du chauffeur
         # ==================================================
@@ -199,16 +249,17 @@ class MissionSerializer(serializers.ModelSerializer):
         mission = Mission.objects.create(**validated_data)
 
         # ==================================================
-        # LOG DEBUG
+        # LOG
         # ==================================================
-        print(f"✅ Mission #{mission.id} créée")
-        print(f"   Départ : {mission.pickup_time}")
-        print(f"   Arrivée prévue : {mission.expected_dropoff_time}")
-
-        if mission.pickup_time and mission.expected_dropoff_time:
+        if logger.isEnabledFor(logging.INFO):
             duration = mission.expected_dropoff_time - mission.pickup_time
-            hours = duration.total_seconds() / 3600
-            print(f"   Durée prévue : {hours:.1f}h")
+            logger.info('mission.created', extra={
+                'mission_id': mission.id,
+                'truck_id': mission.truck_id,
+                'driver_id': mission.driver_id,
+                'pickup_time': mission.pickup_time,
+                'planned_hours': round(duration.total_seconds() / 3600, 2),
+            })
 
         return mission
 
@@ -240,22 +291,6 @@ class MissionSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
-    def to_representation(self, instance):
-        """
-        Toujours retourner les objets driver et truck complets,
-        même après cancel / start / complete
-        """
-
-        representation = super().to_representation(instance)
-
-        if instance.driver:
-            representation['driver'] = DriverSerializer(instance.driver).data
-
-        if instance.truck:
-            representation['truck'] = TruckSerializer(instance.truck).data
-
-        return representation
-
 # =========================
 # FUEL
 # =========================
@@ -300,13 +335,8 @@ class FuelEntrySerializer(serializers.ModelSerializer):
 
         fuel_entry = FuelEntry.objects.create(**validated_data)
 
-        # ⛽ METTRE À JOUR LE CARBURANT DU CAMION
-        truck = fuel_entry.truck
-        truck.current_fuel = min(
-            truck.current_fuel + fuel_entry.quantity,
-            truck.tank_capacity
-        )
-        truck.save()
+        # ⛽ METTRE À JOUR LE CARBURANT DU CAMION (UPDATE atomique, plafonné au réservoir)
+        fuel_entry.truck.adjust_fuel(fuel_entry.quantity)
 
         return fuel_entry
 
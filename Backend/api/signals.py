@@ -1,46 +1,87 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
+from django.contrib.auth.models import User
 from django.utils import timezone
-from django.core.cache import cache
-from .models import Mission, Driver
+from .models import Mission, Driver, Truck, Notification, WeeklyStats, Tombstone
+from . import events
+from .representation_cache import representation_cache
+from .stats import invalidate_dashboard_summary
+from .transitions import credit_driver_hours
 
 
 @receiver(post_save, sender=Mission)
 def update_driver_hours_on_completion(sender, instance, created, **kwargs):
     """
-    Ajoute automatiquement les heures au driver quand une mission est terminée
-    
-    ⚠️ IMPORTANT: Les heures sont calculées sur la DURÉE PRÉVUE, pas la durée réelle
-    → pickup_time jusqu'à expected_dropoff_time
-    
-    Exemple:
-    - Pickup: 08:00
-    - Expected dropoff: 14:00
-    - Durée prévue: 6 heures ← C'est ce qui est comptabilisé
-    
-    (Peu importe si le driver termine en 5h ou 7h dans la réalité)
+    Crédite les heures du driver quand une mission est enregistrée comme terminée
+
+    Les transitions start / complete / cancel (api/transitions.py) passent par
+    un UPDATE et créditent les heures elles-mêmes (le status est en lecture
+    seule dans l'API) ; ce signal couvre l'admin Django. Le registre
+    DriverHoursCredit évite tout double crédit.
     """
-    # Seulement si la mission vient d'être complétée
-    if not created and instance.status == 'completed' and instance.driver:
-        # Vérifier si les heures n'ont pas déjà été ajoutées
-        cache_key = f'hours_added_mission_{instance.id}'
-        
-        if not cache.get(cache_key):
-            # Calculer les heures basées sur la durée prévue
-            if instance.pickup_time and instance.expected_dropoff_time:
-                duration = instance.expected_dropoff_time - instance.pickup_time
-                hours_to_add = duration.total_seconds() / 3600
-                
-                if hours_to_add > 0:
-                    old_hours = instance.driver.hours_worked
-                    instance.driver.hours_worked += hours_to_add
-                    instance.driver.save()
-                    
-                    # Marquer comme fait (permanent)
-                    cache.set(cache_key, True, None)
-                    
-                    print(f"✅ Mission #{instance.id} terminée")
-                    print(f"   Driver: {instance.driver.name}")
-                    print(f"   Heures ajoutées: {hours_to_add:.1f}h (durée prévue)")
-                    print(f"   Total: {old_hours:.1f}h → {instance.driver.hours_worked:.1f}h")
-                    print(f"   Restantes: {instance.driver.get_remaining_hours():.1f}h/{instance.driver.contractual_hours}h\n")
\ No newline at end of file
+    if created or instance.status != 'completed':
+        return
+
+    credit_driver_hours(instance)
+
+
+@receiver(post_save, sender=Mission)
+@receiver(post_delete, sender=Mission)
+@receiver(post_save, sender=Driver)
+@receiver(post_delete, sender=Driver)
+@receiver(post_save, sender=Truck)
+@receiver(post_delete, sender=Truck)
+def invalidate_dashboard_on_change(sender, **kwargs):
+    """Le résumé du dashboard et les stats chauffeurs sont invalidés dès qu'une mission, un chauffeur ou un camion change"""
+    invalidate_dashboard_summary()
+
+
+@receiver(post_save, sender=Notification)
+def publish_new_notification(sender, instance, created, **kwargs):
+    """Pousse les nouvelles notifications sur le flux temps réel du chauffeur"""
+    if created:
+        events.publish(
+            'notification.created',
+            driver_id=instance.driver_id,
+            notification_id=instance.id,
+            title=instance.title,
+            message=instance.message,
+            notification_type=instance.notification_type
+        )
+
+
+@receiver(post_delete, sender=Driver)
+@receiver(post_delete, sender=Truck)
+@receiver(post_delete, sender=Mission)
+@receiver(post_delete, sender=WeeklyStats)
+def record_tombstone(sender, instance, **kwargs):
+    """Garde une trace des suppressions pour /api/sync/"""
+    Tombstone.objects.create(model=sender._meta.model_name, object_id=instance.pk)
+
+
+@receiver(pre_delete, sender=Driver)
+@receiver(pre_delete, sender=Truck)
+def touch_missions_before_unlink(sender, instance, **kwargs):
+    """
+    Les missions passent à driver/truck = NULL (SET_NULL) sans toucher updated_at :
+    on les marque modifiées pour qu'elles remontent dans /api/sync/
+    """
+    field = 'driver' if sender is Driver else 'truck'
+    Mission.objects.filter(**{field: instance}).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Driver)
+@receiver(post_delete, sender=Driver)
+@receiver(post_save, sender=Truck)
+@receiver(post_delete, sender=Truck)
+def invalidate_cached_representation(sender, instance, **kwargs):
+    """Retire la représentation mise en cache de l'objet modifié / supprimé"""
+    representation_cache.invalidate(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_driver_representation_on_user_change(sender, instance, created, **kwargs):
+    """Le User est imbriqué dans DriverSerializer (username / email)"""
+    if not created:
+        for driver in Driver.objects.filter(user=instance).only('id'):
+            representation_cache.invalidate(driver)
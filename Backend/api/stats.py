@@ -0,0 +1,297 @@
+import hashlib
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Driver, Truck, Mission, WeeklyStats
+from .caching import get_or_compute, get_namespace_version, bump_namespace_version
+
+
+# =========================
+# DASHBOARD ADMIN
+# =========================
+DASHBOARD_SUMMARY_CACHE_KEY = 'dashboard_summary'
+DASHBOARD_SUMMARY_TTL = 30  # secondes
+
+
+def compute_dashboard_summary():
+    """
+    Compteurs du dashboard admin calculés par la base
+
+    - 1 agrégat groupé sur Mission (total / en cours / en attente / terminées aujourd'hui)
+    - 1 COUNT sur Driver, 1 COUNT sur Truck
+
+    La taille de la réponse est constante, quelle que soit la taille des tables.
+    """
+    today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow_start = today_start + timedelta(days=1)
+
+    missions = Mission.objects.aggregate(
+        total_missions=Count('id'),
+        active_missions=Count('id', filter=Q(status='in_progress')),
+        pending_missions=Count('id', filter=Q(status='pending')),
+        completed_today=Count('id', filter=Q(
+            status='completed',
+            actual_end_time__gte=today_start,
+            actual_end_time__lt=tomorrow_start,
+        )),
+    )
+
+    return {
+        'total_drivers': Driver.objects.count(),
+        'total_trucks': Truck.objects.count(),
+        **missions,
+    }
+
+
+def get_dashboard_summary():
+    """Version mise en cache (TTL court, invalidée par les signals, anti-stampede)"""
+    return get_or_compute(DASHBOARD_SUMMARY_CACHE_KEY, compute_dashboard_summary, DASHBOARD_SUMMARY_TTL)
+
+
+def invalidate_dashboard_summary():
+    cache.delete(DASHBOARD_SUMMARY_CACHE_KEY)
+    bump_namespace_version(DRIVER_STATS_NAMESPACE)
+
+
+# =========================
+# STATS CHAUFFEURS
+# =========================
+DRIVER_STATS_NAMESPACE = 'driver_stats'
+DRIVER_STATS_TTL = 60  # secondes
+
+def parse_stats_window(date_from=None, date_to=None):
+    """
+    Convertit ?from=&to= (date ou datetime ISO) en bornes datetime
+
+    - `from` est inclusif, `to` est inclusif pour une date (jusqu'à la fin de la journée)
+    - lève ValueError si une borne est invalide
+    """
+    return _parse_bound(date_from, end=False), _parse_bound(date_to, end=True)
+
+
+def _parse_bound(value, end):
+    if not value:
+        return None
+
+    # Date seule d'abord : parse_datetime accepte aussi '2026-03-08' (minuit)
+    day = parse_date(value)
+
+    if day is not None:
+        parsed = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+        if end:
+            parsed -= timedelta(microseconds=1)
+    else:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f'Date invalide : {value}')
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+
+    return parsed
+
+
+def completed_missions_q(prefix='', date_from=None, date_to=None):
+    """
+    Condition « mission terminée dans la fenêtre »
+
+    `prefix` permet de réutiliser la même condition depuis Driver
+    (prefix='missions__') ou directement sur Mission (prefix='').
+    """
+    q = Q(**{f'{prefix}status': 'completed'})
+
+    if date_from:
+        q &= Q(**{f'{prefix}actual_end_time__gte': date_from})
+    if date_to:
+        q &= Q(**{f'{prefix}actual_end_time__lte': date_to})
+
+    return q
+
+
+def driver_stats_aggregates(prefix='', date_from=None, date_to=None):
+    """Expressions Sum / Count utilisables dans aggregate() ou annotate()"""
+    q = completed_missions_q(prefix, date_from, date_to)
+
+    return {
+        'total_kilometers': Coalesce(Sum(f'{prefix}distance', filter=q), Value(0)),
+        'total_hours_worked': Coalesce(Sum(f'{prefix}hours_worked', filter=q), Value(0.0)),
+        'completed_missions': Count(f'{prefix}id', filter=q),
+    }
+
+
+def get_driver_stats(driver, date_from=None, date_to=None):
+    """Stats d'un chauffeur en une seule requête agrégée"""
+    return Mission.objects.filter(driver=driver).aggregate(
+        **driver_stats_aggregates(date_from=date_from, date_to=date_to)
+    )
+
+
+def _window_key(date_from, date_to):
+    """Bornes sans espace dans la clé (memcached refuse les espaces)"""
+    return ':'.join(bound.isoformat() if bound else '' for bound in (date_from, date_to))
+
+
+def get_cached_driver_stats(driver, date_from=None, date_to=None):
+    key = f'{DRIVER_STATS_NAMESPACE}:{driver.pk}:{_window_key(date_from, date_to)}'
+    return get_or_compute(
+        key,
+        lambda: get_driver_stats(driver, date_from, date_to),
+        DRIVER_STATS_TTL,
+        version=get_namespace_version(DRIVER_STATS_NAMESPACE)
+    )
+
+
+def get_cached_drivers_stats(driver_ids=None, date_from=None, date_to=None):
+    ids = ','.join(str(i) for i in sorted(driver_ids)) if driver_ids is not None else '*'
+    digest = hashlib.sha1(f'{ids}:{date_from}:{date_to}'.encode()).hexdigest()
+    return get_or_compute(
+        f'{DRIVER_STATS_NAMESPACE}:bulk:{digest}',
+        lambda: get_drivers_stats(driver_ids, date_from, date_to),
+        DRIVER_STATS_TTL,
+        version=get_namespace_version(DRIVER_STATS_NAMESPACE)
+    )
+
+
+def get_drivers_stats(driver_ids=None, date_from=None, date_to=None):
+    """
+    Stats de plusieurs chauffeurs en une seule requête groupée
+
+    LEFT JOIN Driver → Mission : les chauffeurs sans mission
+    terminée apparaissent avec des compteurs à 0.
+    """
+    drivers = Driver.objects.all()
+
+    if driver_ids is not None:
+        drivers = drivers.filter(id__in=driver_ids)
+
+    return list(
+        drivers
+        .order_by('id')
+        .values('id', 'name')
+        .annotate(**driver_stats_aggregates('missions__', date_from, date_to))
+    )
+
+
+# =========================
+# STATS HEBDOMADAIRES (MATÉRIALISÉES)
+# =========================
+def week_bounds(moment):
+    """Lundi et dimanche de la semaine (heure locale) contenant `moment`"""
+    day = timezone.localtime(moment).date()
+    week_start = day - timedelta(days=day.weekday())
+    return week_start, week_start + timedelta(days=6)
+
+
+def record_mission_completion(mission):
+    """
+    Ajoute une mission terminée à la ligne WeeklyStats (driver, semaine)
+
+    Upsert incrémental : UPDATE avec des expressions F() — pas de
+    lecture/écriture côté Python, donc pas de perte de mise à jour entre
+    workers. Une seule requête dans le cas courant ; la ligne n'est créée
+    (déjà remplie) que pour la première mission de la semaine.
+    """
+    if not mission.driver_id or not mission.actual_end_time:
+        return
+
+    week_start, week_end = week_bounds(mission.actual_end_time)
+    hours = mission.hours_worked or 0
+    distance = mission.distance or 0
+
+    updates = {
+        'total_kilometers': F('total_kilometers') + distance,
+        'total_hours_worked': F('total_hours_worked') + hours,
+        'completed_missions': F('completed_missions') + 1,
+        'updated_at': timezone.now(),
+    }
+
+    if hours > 0:
+        updates['average_speed'] = Cast(
+            (F('total_kilometers') + distance) / (F('total_hours_worked') + hours),
+            IntegerField()
+        )
+
+    rows = WeeklyStats.objects.filter(driver_id=mission.driver_id, week_start=week_start)
+    if rows.update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            WeeklyStats.objects.create(
+                driver_id=mission.driver_id,
+                week_start=week_start,
+                week_end=week_end,
+                total_kilometers=distance,
+                total_hours_worked=hours,
+                completed_missions=1,
+                average_speed=int(distance / hours) if hours > 0 else 0,
+            )
+    except IntegrityError:
+        # Créée entre-temps par un autre worker
+        rows.update(**updates)
+
+
+# =========================
+# RESET HEBDOMADAIRE
+# =========================
+def reset_weekly_hours(week_start=None, dry_run=False):
+    """
+    Archive les heures de la semaine dans WeeklyStats puis remet
+    `hours_worked` à 0 pour tous les chauffeurs actifs
+
+    Opérations ensemblistes uniquement (quel que soit le nombre de chauffeurs) :
+    - bulk_create des lignes WeeklyStats manquantes (chauffeurs sans mission
+      terminée dans la semaine)
+    - 1 UPDATE de remise à zéro
+
+    Les lignes existantes ne sont pas touchées : leurs totaux (heures,
+    kilomètres, vitesse moyenne) sont tenus à jour par record_mission_completion.
+
+    Par défaut, la semaine archivée est celle de la veille
+    (exécution le dimanche ou le lundi à minuit).
+    """
+    if week_start is None:
+        week_start, week_end = week_bounds(timezone.now() - timedelta(days=1))
+    else:
+        week_end = week_start + timedelta(days=6)
+
+    drivers = Driver.objects.filter(is_active=True)
+    report = drivers.aggregate(
+        drivers=Count('id'),
+        drivers_with_hours=Count('id', filter=Q(hours_worked__gt=0)),
+        total_hours=Coalesce(Sum('hours_worked'), Value(0.0)),
+    )
+    report.update({'week_start': week_start, 'week_end': week_end, 'dry_run': dry_run})
+
+    if dry_run:
+        return report
+
+    now = timezone.now()
+
+    with transaction.atomic():
+        missing = drivers.filter(hours_worked__gt=0).exclude(weekly_stats__week_start=week_start)
+
+        created = WeeklyStats.objects.bulk_create(
+            [
+                WeeklyStats(
+                    driver_id=driver_id,
+                    week_start=week_start,
+                    week_end=week_end,
+                    total_hours_worked=hours,
+                )
+                for driver_id, hours in missing.values_list('id', 'hours_worked').iterator()
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        report['archived'] = len(created)
+
+        report['reset'] = drivers.update(hours_worked=0, updated_at=now)
+
+    return report
@@ -0,0 +1,111 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+
+from .models import Driver, Truck, Mission, WeeklyStats, Tombstone
+from .serializers import (
+    DriverSerializer,
+    TruckSerializer,
+    MissionSerializer,
+    WeeklyStatsSerializer,
+)
+
+
+# =========================
+# SYNCHRONISATION INCRÉMENTALE
+# =========================
+# Chaque flux est parcouru par curseur keyset (horodatage, id) croissant.
+# Le jeton opaque renvoyé au client contient le dernier curseur de chaque flux.
+SYNC_STREAMS = {
+    'drivers': (Driver.objects.select_related('user'), DriverSerializer, 'updated_at'),
+    'trucks': (Truck.objects.all(), TruckSerializer, 'updated_at'),
+    'missions': (Mission.objects.select_related('driver', 'driver__user', 'truck'), MissionSerializer, 'updated_at'),
+    'weekly_stats': (WeeklyStats.objects.select_related('driver', 'driver__user'), WeeklyStatsSerializer, 'updated_at'),
+    'deleted': (Tombstone.objects.all(), None, 'deleted_at'),
+}
+
+# Au début d'un nouveau cycle, on recule les curseurs de quelques secondes :
+# une transaction validée après la lecture précédente mais horodatée avant
+# n'est ainsi jamais perdue (le client déduplique par id).
+SYNC_SAFETY_WINDOW = timedelta(seconds=5)
+
+SYNC_DEFAULT_LIMIT = 500
+SYNC_MAX_LIMIT = 2000
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def encode_token(cursors, has_more):
+    payload = {
+        'c': {name: [moment.isoformat(), pk] for name, (moment, pk) in cursors.items()},
+        'm': has_more,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_token(token):
+    """Retourne {flux: (horodatage, id)} à partir du jeton, ou lève InvalidSyncToken"""
+    if not token:
+        return {}
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        cursors = {
+            name: (datetime.fromisoformat(moment), int(pk))
+            for name, (moment, pk) in payload['c'].items()
+            if name in SYNC_STREAMS
+        }
+        has_more = bool(payload.get('m'))
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidSyncToken('Jeton de synchronisation invalide') from e
+
+    if not has_more:
+        cursors = {
+            name: (moment - SYNC_SAFETY_WINDOW, 0)
+            for name, (moment, pk) in cursors.items()
+        }
+
+    return cursors
+
+
+def get_changes(token=None, limit=SYNC_DEFAULT_LIMIT):
+    """
+    Lignes modifiées / supprimées depuis le jeton
+
+    Retourne un dict {flux: [...], 'next': jeton, 'has_more': bool}.
+    Sans jeton : téléchargement complet, page par page.
+    """
+    cursors = decode_token(token)
+    result = {}
+    has_more = False
+
+    for name, (queryset, serializer_class, field) in SYNC_STREAMS.items():
+        if name in cursors:
+            moment, pk = cursors[name]
+            queryset = queryset.filter(
+                Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'id__gt': pk})
+            )
+
+        rows = list(queryset.order_by(field, 'id')[:limit + 1])
+
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+
+        if rows:
+            last = rows[-1]
+            cursors[name] = (getattr(last, field), last.id)
+
+        if serializer_class:
+            result[name] = serializer_class(rows, many=True).data
+        else:
+            result[name] = [{'model': t.model, 'id': t.object_id} for t in rows]
+
+    result['next'] = encode_token(cursors, has_more)
+    result['has_more'] = has_more
+    return result
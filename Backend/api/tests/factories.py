@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+
+from ..models import Driver, Truck, Mission
+
+
+def create_driver(index):
+    user = User.objects.create(username=f'driver{index}', email=f'driver{index}@example.ma')
+    return Driver.objects.create(user=user, name=f'Chauffeur {index}', email=user.email, phone='0600000000')
+
+
+def create_truck(index, **fields):
+    return Truck.objects.create(
+        plate=f'{index}-A-1',
+        brand='Volvo',
+        capacity=20,
+        power=400,
+        motorization='Diesel',
+        tank_capacity=fields.pop('tank_capacity', 400),
+        current_fuel=fields.pop('current_fuel', 300),
+        **fields,
+    )
+
+
+def create_mission(driver, truck, start, hours=2, **fields):
+    return Mission.objects.create(
+        driver=driver,
+        truck=truck,
+        departure_city='Casablanca',
+        departure_address='Port',
+        arrival_city='Rabat',
+        arrival_address='Zone industrielle',
+        pickup_time=start,
+        expected_dropoff_time=start + timedelta(hours=hours),
+        container_number='MSCU1234567',
+        container_type='20ft',
+        distance=fields.pop('distance', 100),
+        estimated_fuel_cost=0,
+        **fields,
+    )
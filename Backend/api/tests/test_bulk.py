@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..bulk import bulk_create_missions
+from ..models import Mission
+from .factories import create_driver, create_truck, create_mission
+
+CSV_HEADER = (
+    'driver_id,truck_id,departure_city,departure_address,pickup_time,arrival_city,'
+    'arrival_address,expected_dropoff_time,container_number,container_type,distance'
+)
+
+
+# =========================
+# IMPORT EN MASSE (/api/missions/bulk/)
+# =========================
+class BulkImportTests(TestCase):
+
+    def setUp(self):
+        self.start = timezone.now() + timedelta(days=1)
+        self.drivers = [create_driver(i) for i in range(3)]
+        self.trucks = [create_truck(i) for i in range(3)]
+
+    def row(self, index, start_hour=0, hours=2, **fields):
+        start = self.start + timedelta(hours=start_hour)
+        return {
+            'driver_id': self.drivers[index].pk,
+            'truck_id': self.trucks[index].pk,
+            'departure_city': 'Casablanca',
+            'departure_address': 'Port',
+            'pickup_time': start.isoformat(),
+            'arrival_city': 'Rabat',
+            'arrival_address': 'Zone industrielle',
+            'expected_dropoff_time': (start + timedelta(hours=hours)).isoformat(),
+            'container_number': f'MSCU{index:07d}',
+            'container_type': '20ft',
+            'distance': 100,
+            **fields,
+        }
+
+    def post(self, rows, partial=False):
+        url = '/api/missions/bulk/' + ('?partial=1' if partial else '')
+        return self.client.post(url, rows, content_type='application/json')
+
+    def post_csv(self, rows):
+        lines = [CSV_HEADER] + [','.join(str(row[key]) for key in CSV_HEADER.split(',')) for row in rows]
+        return self.client.post('/api/missions/bulk/', '\n'.join(lines) + '\n', content_type='text/csv')
+
+    def test_valid_rows_are_created_with_fuel_cost(self):
+        response = self.post([self.row(0), self.row(1)])
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['created'], 2)
+        costs = Mission.objects.filter(pk__in=response.json()['ids']).values_list('estimated_fuel_cost', flat=True)
+        self.assertTrue(all(cost > 0 for cost in costs))
+
+    def test_one_bad_row_rolls_back_everything(self):
+        response = self.post([self.row(0), self.row(1, truck_id=999_999), self.row(2)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['created'], 0)
+        self.assertEqual(response.json()['errors'], [{'row': 1, 'errors': {'truck_id': 'Camion introuvable.'}}])
+        self.assertFalse(Mission.objects.exists())
+
+    def test_rollback_covers_chunks_already_inserted(self):
+        rows = [self.row(0), self.row(1), self.row(2, container_type=None)]
+
+        result = bulk_create_missions(rows, chunk_size=2)
+
+        # Le premier lot a été inséré avant que le second n'échoue
+        self.assertEqual(result['created'], 0)
+        self.assertEqual([error['row'] for error in result['errors']], [2])
+        self.assertFalse(Mission.objects.exists())
+
+    def test_partial_mode_reports_errors_per_row(self):
+        rows = [
+            self.row(0),
+            self.row(1, driver_id=999_999),
+            self.row(2, pickup_time='pas une date'),
+            self.row(2, start_hour=5),
+        ]
+
+        response = self.post(rows, partial=True)
+
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual(body['created'], 2)
+        self.assertEqual([error['row'] for error in body['errors']], [1, 2])
+        self.assertIn('driver_id', body['errors'][0]['errors'])
+        self.assertIn('pickup_time', body['errors'][1]['errors'])
+        self.assertEqual(Mission.objects.count(), 2)
+
+    def test_partial_mode_without_valid_rows_is_400(self):
+        response = self.post([self.row(0, truck_id=999_999)], partial=True)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Mission.objects.exists())
+
+    def test_csv_conflicts_inside_the_file(self):
+        rows = [
+            self.row(0),
+            # Même camion, créneau chevauchant la ligne 0
+            self.row(1, start_hour=1, truck_id=self.trucks[0].pk),
+            # Même chauffeur, bout à bout avec la ligne 0 : accepté
+            self.row(0, start_hour=2, truck_id=self.trucks[2].pk),
+        ]
+
+        response = self.post_csv(rows)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()['errors'],
+            [{'row': 1, 'errors': {'truck': 'Ce camion est déjà réservé sur ce créneau (ligne 0).'}}]
+        )
+        self.assertFalse(Mission.objects.exists())
+
+    def test_csv_conflict_with_existing_mission(self):
+        existing = create_mission(self.drivers[1], self.trucks[1], self.start)
+
+        response = self.post_csv([self.row(0, start_hour=1, driver_id=self.drivers[1].pk)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()['errors'][0]['errors'],
+            {'driver': f'Ce chauffeur est déjà réservé sur ce créneau (mission #{existing.pk}).'}
+        )
+
+    def test_csv_import(self):
+        response = self.post_csv([self.row(0), self.row(1)])
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(Mission.objects.count(), 2)
+
+    def test_non_list_body_is_rejected(self):
+        response = self.client.post('/api/missions/bulk/', self.row(0), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,112 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from .. import caching
+from ..caching import get_or_compute, get_namespace_version, bump_namespace_version
+
+
+class Compute:
+    """compute() de test : compte ses appels"""
+
+    def __init__(self, value='nouvelle'):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def store(key, value, expires_in, delta=1.0, version=None):
+    cache.set(key, {'value': value, 'delta': delta, 'expires': time.time() + expires_in}, 60, version=version)
+
+
+# =========================
+# GET_OR_COMPUTE (XFETCH + SINGLE-FLIGHT)
+# =========================
+class GetOrComputeTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_miss_computes_and_releases_lock(self):
+        compute = Compute()
+        self.assertEqual(get_or_compute('k', compute, ttl=30), 'nouvelle')
+        self.assertEqual(get_or_compute('k', compute, ttl=30), 'nouvelle')
+        self.assertEqual(compute.calls, 1)
+        self.assertIsNone(cache.get('k:lock'))
+
+    def test_early_recompute_near_expiry(self):
+        # 5 s avant l'échéance, calcul d'1 s : log(1e-9) ≈ -20,7 → recalcul anticipé
+        store('k', 'ancienne', expires_in=5)
+        compute = Compute()
+
+        with mock.patch('api.caching.random.random', return_value=1e-9):
+            self.assertEqual(get_or_compute('k', compute, ttl=30), 'nouvelle')
+        self.assertEqual(compute.calls, 1)
+
+    def test_no_recompute_when_draw_is_late(self):
+        # Tirage à 1 : log(1) = 0, l'entrée reste fraîche jusqu'à l'échéance
+        store('k', 'ancienne', expires_in=5)
+        compute = Compute()
+
+        with mock.patch('api.caching.random.random', return_value=1.0):
+            self.assertEqual(get_or_compute('k', compute, ttl=30), 'ancienne')
+        self.assertEqual(compute.calls, 0)
+
+    def test_stale_value_served_while_another_worker_recomputes(self):
+        store('k', 'ancienne', expires_in=-1)
+        cache.set('k:lock', True, 30)
+        compute = Compute()
+
+        self.assertEqual(get_or_compute('k', compute, ttl=30), 'ancienne')
+        self.assertEqual(compute.calls, 0)
+        self.assertTrue(cache.get('k:lock'))
+
+    def test_foreign_lock_survives_deadline(self):
+        # Pas d'ancienne valeur et verrou d'un autre worker jusqu'à l'échéance :
+        # on calcule quand même, mais sans supprimer ce verrou
+        cache.set('k:lock', True, 30)
+        compute = Compute()
+
+        with mock.patch.object(caching, 'LOCK_TIMEOUT', 0.1):
+            self.assertEqual(get_or_compute('k', compute, ttl=30), 'nouvelle')
+
+        self.assertEqual(compute.calls, 1)
+        self.assertTrue(cache.get('k:lock'))
+
+
+# =========================
+# VERSIONS D'ESPACES DE CLÉS (INVALIDATION)
+# =========================
+class NamespaceVersionTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_invalidates_entries(self):
+        version = get_namespace_version('stats')
+        store('stats:1', 'ancienne', expires_in=30, version=version)
+
+        bump_namespace_version('stats')
+
+        new_version = get_namespace_version('stats')
+        self.assertNotEqual(new_version, version)
+        self.assertEqual(get_or_compute('stats:1', Compute(), ttl=30, version=new_version), 'nouvelle')
+
+    def test_evicted_version_never_reuses_an_old_one(self):
+        used = {get_namespace_version('stats')}
+        for _ in range(3):
+            bump_namespace_version('stats')
+            used.add(get_namespace_version('stats'))
+
+        # Éviction de la clé de version, puis invalidation ou simple lecture
+        cache.delete('stats:version')
+        bump_namespace_version('stats')
+        self.assertNotIn(get_namespace_version('stats'), used)
+
+        cache.delete('stats:version')
+        self.assertNotIn(get_namespace_version('stats'), used)
@@ -0,0 +1,91 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Truck
+from .factories import create_driver, create_truck, create_mission
+
+
+# =========================
+# GET CONDITIONNEL (ETAG / 304)
+# =========================
+class ConditionalGetTests(TestCase):
+    """ETag calculé sur les lignes de la page : 304 tant que la page ne change pas"""
+
+    def setUp(self):
+        self.driver = create_driver(1)
+        self.trucks = [create_truck(i) for i in range(3)]
+        self.mission = create_mission(self.driver, self.trucks[0], timezone.now())
+
+    def get(self, url, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(url, **headers)
+
+    def assertNotModified(self, url, etag):
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def assertModified(self, url, etag):
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response
+
+    def test_unchanged_list_is_not_modified(self):
+        response = self.get('/api/trucks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        self.assertNotModified('/api/trucks/', response['ETag'])
+
+    def test_update_on_page_changes_etag(self):
+        etag = self.get('/api/trucks/')['ETag']
+
+        response = self.client.patch(
+            f'/api/trucks/{self.trucks[1].pk}/', {'brand': 'Renault'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.assertModified('/api/trucks/', etag)
+        self.assertIn('Renault', {row['brand'] for row in response.json()['results']})
+        self.assertNotModified('/api/trucks/', response['ETag'])
+
+    def test_delete_on_page_changes_etag(self):
+        etag = self.get('/api/trucks/')['ETag']
+
+        Truck.objects.get(pk=self.trucks[2].pk).delete()
+
+        response = self.assertModified('/api/trucks/', etag)
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_filter_has_its_own_etag(self):
+        etag = self.get('/api/trucks/')['ETag']
+        self.assertModified(f'/api/trucks/?plate={self.trucks[0].plate}', etag)
+
+    def test_nested_relation_change_changes_etag(self):
+        # Le chauffeur est imbriqué dans la mission : le modifier invalide la liste
+        etag = self.get('/api/missions/')['ETag']
+
+        self.driver.name = 'Chauffeur renommé'
+        self.driver.save()
+
+        self.assertModified('/api/missions/', etag)
+
+    def test_user_fields_change_etag_without_last_modified(self):
+        response = self.get('/api/drivers/')
+        self.assertNotIn('Last-Modified', response)
+
+        # User n'a pas d'updated_at : ses champs exposés entrent dans l'ETag
+        self.driver.user.email = 'nouveau@example.ma'
+        self.driver.user.save()
+
+        self.assertModified('/api/drivers/', response['ETag'])
+
+    def test_detail_is_not_modified_until_saved(self):
+        url = f'/api/trucks/{self.trucks[0].pk}/'
+        etag = self.get(url)['ETag']
+        self.assertNotModified(url, etag)
+
+        self.client.post(f'{url}refuel/', {'quantity': 10}, content_type='application/json')
+
+        self.assertModified(url, etag)
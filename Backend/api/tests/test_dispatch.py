@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .. import dispatch
+from ..dispatch import hungarian, plan_assignments, dispatch_pending_missions, INFEASIBLE, _solve
+from ..models import Mission
+from .factories import create_driver, create_truck, create_mission
+
+
+def at(hour):
+    return datetime(2026, 3, 2, tzinfo=dt_timezone.utc) + timedelta(hours=hour)
+
+
+def mission(mission_id, start, hours=2, distance=100, **fields):
+    return {
+        'id': mission_id, 'start': at(start), 'end': at(start + hours),
+        'distance': distance, 'truck_id': None, 'driver_id': None, **fields,
+    }
+
+
+# =========================
+# ALGORITHME HONGROIS
+# =========================
+class HungarianTests(SimpleTestCase):
+
+    def test_minimal_cost_assignment(self):
+        cost = [
+            [4, 1, 3],
+            [2, 0, 5],
+            [3, 2, 2],
+        ]
+        # Le glouton (ligne 1 → colonne 1 à 0) coûterait 6 ; l'optimum vaut 5
+        self.assertEqual(hungarian(cost), [1, 0, 2])
+
+    def test_more_columns_than_rows(self):
+        self.assertEqual(hungarian([[5, 1, 9], [1, 2, 9]]), [1, 0])
+
+    def test_more_rows_than_columns_and_infeasible_pairs(self):
+        cost = [
+            [3, INFEASIBLE],
+            [1, INFEASIBLE],
+            [INFEASIBLE, INFEASIBLE],
+        ]
+        # Une seule colonne faisable : la ligne la moins chère la prend
+        self.assertEqual(_solve(cost), [(1, 0)])
+        self.assertEqual(_solve([]), [])
+
+
+# =========================
+# PLAN D'AFFECTATION (SANS BASE)
+# =========================
+class PlanAssignmentsTests(SimpleTestCase):
+
+    def test_cheapest_truck_and_balanced_drivers(self):
+        plan = plan_assignments(
+            [mission(1, 8)],
+            trucks=[{'id': 10, 'avg_consumption': 30}, {'id': 11, 'avg_consumption': 20}],
+            drivers=[{'id': 20, 'remaining_hours': 10}, {'id': 21, 'remaining_hours': 30}],
+        )
+
+        self.assertEqual(plan, {1: {'truck_id': 11, 'driver_id': 21, 'estimated_fuel_cost': round(20 * dispatch.FUEL_PRICE_PER_LITER, 2)}})
+
+    def test_more_missions_than_resources(self):
+        # Trois missions simultanées, deux chauffeurs et deux camions
+        plan = plan_assignments(
+            [mission(i, 8) for i in (1, 2, 3)],
+            trucks=[{'id': 10, 'avg_consumption': 25}, {'id': 11, 'avg_consumption': 25}],
+            drivers=[{'id': 20, 'remaining_hours': 40}, {'id': 21, 'remaining_hours': 40}],
+        )
+
+        self.assertEqual(len(plan), 2)
+        self.assertEqual({entry['truck_id'] for entry in plan.values()}, {10, 11})
+        self.assertEqual({entry['driver_id'] for entry in plan.values()}, {20, 21})
+
+    def test_resources_reused_on_successive_slots(self):
+        plan = plan_assignments(
+            [mission(1, 8), mission(2, 10), mission(3, 12)],
+            trucks=[{'id': 10, 'avg_consumption': 25}],
+            drivers=[{'id': 20, 'remaining_hours': 40}],
+        )
+
+        self.assertEqual(set(plan), {1, 2, 3})
+
+    def test_busy_slots_and_remaining_hours_are_respected(self):
+        plan = plan_assignments(
+            [mission(1, 8, hours=3), mission(2, 12, hours=5)],
+            trucks=[{'id': 10, 'avg_consumption': 25}],
+            drivers=[{'id': 20, 'remaining_hours': 4}],
+            busy_slots=[('truck', 10, at(7), at(9))],
+        )
+
+        # Mission 1 : camion occupé ; mission 2 : 5 h > 4 h restantes
+        self.assertEqual(plan, {})
+
+    def test_stranded_mission_returns_its_driver(self):
+        # Le seul chauffeur (4 h) est d'abord donné à la mission 1, qui n'a
+        # aucun camion libre : elle est retirée et ses heures vont à la mission 2
+        plan = plan_assignments(
+            [mission(1, 8, hours=3), mission(2, 12, hours=3)],
+            trucks=[{'id': 10, 'avg_consumption': 25}],
+            drivers=[{'id': 20, 'remaining_hours': 4}],
+            busy_slots=[('truck', 10, at(8), at(11))],
+        )
+
+        self.assertEqual(list(plan), [2])
+        self.assertEqual(plan[2]['driver_id'], 20)
+
+    def test_existing_driver_or_truck_is_kept(self):
+        plan = plan_assignments(
+            [mission(1, 8, driver_id=21)],
+            trucks=[{'id': 10, 'avg_consumption': 25}],
+            drivers=[{'id': 20, 'remaining_hours': 40}],
+        )
+
+        self.assertEqual(plan[1]['driver_id'], 21)
+        self.assertEqual(plan[1]['truck_id'], 10)
+
+
+# =========================
+# APPLICATION DU PLAN
+# =========================
+class DispatchApplyTests(TestCase):
+
+    def setUp(self):
+        self.start = timezone.now() + timedelta(days=1)
+        self.driver = create_driver(1)
+        self.truck = create_truck(1)
+        self.mission = create_mission(None, None, self.start)
+
+    def test_plan_is_applied(self):
+        result = dispatch_pending_missions(apply=True)
+
+        self.assertTrue(result['applied'])
+        self.assertEqual(result['skipped'], [])
+        self.mission.refresh_from_db()
+        self.assertEqual((self.mission.driver_id, self.mission.truck_id), (self.driver.pk, self.truck.pk))
+
+    def test_dry_run_writes_nothing(self):
+        result = dispatch_pending_missions()
+
+        self.assertEqual(result['assigned'], 1)
+        self.assertFalse(result['applied'])
+        self.assertIsNone(Mission.objects.get(pk=self.mission.pk).driver_id)
+
+    def test_slot_booked_after_planning_is_refused(self):
+        plan = dispatch.plan_assignments
+
+        def plan_then_book(*args):
+            result = plan(*args)
+            # Un autre admin réserve le camion sur le même créneau avant l'application
+            create_mission(None, self.truck, self.start + timedelta(hours=1))
+            return result
+
+        with mock.patch.object(dispatch, 'plan_assignments', plan_then_book):
+            result = dispatch_pending_missions(apply=True)
+
+        self.assertEqual(result['skipped'], [self.mission.pk])
+        self.mission.refresh_from_db()
+        self.assertIsNone(self.mission.truck_id)
+        self.assertIsNone(self.mission.driver_id)
+
+    def test_mission_assigned_after_planning_is_skipped(self):
+        plan = dispatch.plan_assignments
+
+        def plan_then_assign(*args):
+            result = plan(*args)
+            Mission.objects.filter(pk=self.mission.pk).update(driver=self.driver)
+            return result
+
+        with mock.patch.object(dispatch, 'plan_assignments', plan_then_assign):
+            result = dispatch_pending_missions(apply=True)
+
+        self.assertEqual(result['skipped'], [self.mission.pk])
+        self.assertIsNone(Mission.objects.get(pk=self.mission.pk).truck_id)
+
+    def test_endpoint(self):
+        response = self.client.post('/api/missions/dispatch/', {'apply': True}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['assigned'], 1)
+        self.assertTrue(response.json()['applied'])
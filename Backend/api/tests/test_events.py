@@ -0,0 +1,124 @@
+import asyncio
+import json
+from contextlib import aclosing, asynccontextmanager
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from ..transitions import transition
+from .factories import create_driver, create_truck, create_mission
+
+
+class Rollback(Exception):
+    pass
+
+
+# =========================
+# FLUX SSE (/api/events/)
+# =========================
+class EventStreamTests(TestCase):
+    """
+    Le flux est lu avec AsyncClient sur le bus en processus : chaque
+    abonné ne reçoit que ses événements, et seulement après le commit.
+    """
+
+    def setUp(self):
+        self.drivers = [create_driver(1), create_driver(2)]
+        self.trucks = [create_truck(1, tank_capacity=400, current_fuel=100), create_truck(2)]
+        self.missions = [
+            create_mission(self.drivers[i], self.trucks[i], timezone.now(), distance=100)
+            for i in range(2)
+        ]
+
+    @asynccontextmanager
+    async def stream(self, query):
+        response = await self.async_client.get(f'/api/events/?{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        # Fermer le flux désabonne le client du bus
+        async with aclosing(response.streaming_content) as content:
+            stream = aiter(content)
+            self.assertEqual(await anext(stream), b': connected\n\n')
+            yield stream
+
+    async def next_event(self, stream):
+        chunk = (await asyncio.wait_for(anext(stream), timeout=2)).decode()
+        event_line, data_line = chunk.strip().split('\n')
+        event = json.loads(data_line.removeprefix('data: '))
+        self.assertEqual(event_line, f"event: {event['type']}")
+        return event
+
+    def commit_transition(self, mission, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(mission, name)
+
+    async def test_transitions_reach_their_driver_only(self):
+        async with self.stream(f'driver={self.drivers[0].pk}') as first, \
+                self.stream(f'driver={self.drivers[1].pk}') as second:
+            await sync_to_async(self.commit_transition)(self.missions[0], 'start')
+            await sync_to_async(self.commit_transition)(self.missions[1], 'start')
+            await sync_to_async(self.commit_transition)(self.missions[0], 'complete')
+
+            started = await self.next_event(first)
+            self.assertEqual(started['type'], 'mission.started')
+            self.assertEqual(started['mission_id'], self.missions[0].pk)
+            self.assertEqual(started['driver_id'], self.drivers[0].pk)
+
+            # `complete` publie aussi truck.fuel (sans driver_id) : filtré
+            completed = await self.next_event(first)
+            self.assertEqual(completed['type'], 'mission.completed')
+            self.assertEqual(completed['mission_id'], self.missions[0].pk)
+
+            # Le second chauffeur ne voit que sa propre mission
+            other = await self.next_event(second)
+            self.assertEqual(other['mission_id'], self.missions[1].pk)
+
+    async def test_events_wait_for_commit(self):
+        def rolled_back_then_deferred():
+            # Transaction annulée : son événement n'est jamais publié
+            try:
+                with transaction.atomic():
+                    transition(self.missions[0], 'start')
+                    raise Rollback
+            except Rollback:
+                pass
+
+            # Transaction pas encore validée : l'événement attend le commit
+            with self.captureOnCommitCallbacks() as pending:
+                transition(self.missions[0], 'start')
+            return pending
+
+        async with self.stream(f'truck={self.trucks[0].pk}') as stream:
+            pending = await sync_to_async(rolled_back_then_deferred)()
+            self.assertEqual(len(pending), 1)
+
+            await sync_to_async(self.commit_transition)(self.missions[0], 'cancel')
+            for callback in pending:
+                callback()
+
+            # Le cancel, validé en premier, arrive avant le start encore en attente
+            self.assertEqual((await self.next_event(stream))['type'], 'mission.cancelled')
+            self.assertEqual((await self.next_event(stream))['type'], 'mission.started')
+
+    async def test_refuel_publishes_fuel_event(self):
+        def refuel():
+            with self.captureOnCommitCallbacks(execute=True):
+                return self.client.post(
+                    f'/api/trucks/{self.trucks[0].pk}/refuel/', {'quantity': 50}, content_type='application/json'
+                )
+
+        async with self.stream(f'truck={self.trucks[0].pk}') as stream:
+            response = await sync_to_async(refuel)()
+            self.assertEqual(response.status_code, 200)
+
+            event = await self.next_event(stream)
+            self.assertEqual(event['type'], 'truck.fuel')
+            self.assertEqual(event['truck_id'], self.trucks[0].pk)
+            self.assertEqual(event['current_fuel'], 150)
+
+    async def test_invalid_filter_is_rejected(self):
+        response = await self.async_client.get('/api/events/?driver=abc')
+        self.assertEqual(response.status_code, 400)
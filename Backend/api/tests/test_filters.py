@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Driver, Notification
+from .factories import create_driver, create_truck, create_mission
+
+
+# =========================
+# FILTRES PAR QUERY PARAMS
+# =========================
+class QueryParamFilterTests(TestCase):
+    """Filtres des listes, avec les valeurs telles que les envoient les clients JavaScript"""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.drivers = [create_driver(i) for i in range(3)]
+        Driver.objects.filter(pk=cls.drivers[2].pk).update(is_active=False)
+
+        cls.trucks = [create_truck(i) for i in range(3)]
+        cls.trucks[0].is_available = False
+        cls.trucks[0].save()
+
+        cls.pending = create_mission(cls.drivers[0], cls.trucks[0], now)
+        cls.in_progress = create_mission(cls.drivers[1], cls.trucks[1], now, status='in_progress')
+        cls.completed = create_mission(cls.drivers[0], cls.trucks[2], now - timedelta(days=1), status='completed')
+
+        Notification.objects.create(driver=cls.drivers[0], title='Lue', message='-', is_read=True)
+        Notification.objects.create(driver=cls.drivers[0], title='Non lue', message='-')
+
+    def ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return {row['id'] for row in response.json()['results']}
+
+    def test_boolean_values(self):
+        active = {self.drivers[0].pk, self.drivers[1].pk}
+        for value in ('true', 'True', 'TRUE', '1'):
+            self.assertEqual(self.ids(f'/api/drivers/?is_active={value}'), active)
+        for value in ('false', 'False', '0'):
+            self.assertEqual(self.ids(f'/api/drivers/?is_active={value}'), {self.drivers[2].pk})
+
+    def test_truck_availability(self):
+        self.assertEqual(self.ids('/api/trucks/?is_available=false'), {self.trucks[0].pk})
+        self.assertEqual(len(self.ids('/api/trucks/?is_available=true')), 2)
+
+    def test_unread_notifications(self):
+        unread = self.ids(f'/api/notifications/?driver={self.drivers[0].pk}&is_read=false')
+        self.assertEqual(unread, set(Notification.objects.filter(is_read=False).values_list('id', flat=True)))
+
+    def test_invalid_boolean_is_rejected(self):
+        response = self.client.get('/api/drivers/?is_active=maybe')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('is_active', response.json())
+
+    def test_mission_status_list_and_driver(self):
+        self.assertEqual(
+            self.ids('/api/missions/?status=pending,in_progress'),
+            {self.pending.pk, self.in_progress.pk}
+        )
+        self.assertEqual(
+            self.ids(f'/api/missions/?driver={self.drivers[0].pk}&status=completed'),
+            {self.completed.pk}
+        )
+
+    def test_invalid_id_is_rejected(self):
+        self.assertEqual(self.client.get('/api/missions/?driver=abc').status_code, 400)
+
+    def test_driver_email_is_case_insensitive(self):
+        self.assertEqual(self.ids('/api/drivers/?email=DRIVER1@Example.ma'), {self.drivers[1].pk})
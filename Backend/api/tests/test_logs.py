@@ -0,0 +1,154 @@
+import io
+import json
+import logging
+import logging.config
+import sys
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..logs import JsonFormatter, SamplingFilter, NonBlockingHandler, parse_log_levels, parse_sampling_rates
+
+
+def make_record(name='api.views', level=logging.INFO, msg='mission.started', args=(), exc_info=None, **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, exc_info)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+# =========================
+# FORMAT JSON
+# =========================
+class JsonFormatterTests(SimpleTestCase):
+
+    def test_one_json_object_with_extra_fields(self):
+        line = JsonFormatter().format(make_record(mission_id=7, duration_ms=3.2, _private='x'))
+
+        self.assertNotIn('\n', line)
+        payload = json.loads(line)
+        self.assertEqual(payload['level'], 'INFO')
+        self.assertEqual(payload['logger'], 'api.views')
+        self.assertEqual(payload['event'], 'mission.started')
+        self.assertEqual(payload['mission_id'], 7)
+        self.assertEqual(payload['duration_ms'], 3.2)
+        self.assertNotIn('_private', payload)
+        self.assertNotIn('args', payload)
+        self.assertTrue(payload['ts'].endswith('+00:00'))
+
+    def test_message_arguments_and_non_serializable_values(self):
+        payload = json.loads(JsonFormatter().format(
+            make_record(msg='%s → %s', args=('Casablanca', 'Rabat'), truck=object())
+        ))
+
+        self.assertEqual(payload['event'], 'Casablanca → Rabat')
+        self.assertIn('object object', payload['truck'])
+
+    def test_exception_is_included(self):
+        try:
+            raise ValueError('réservoir vide')
+        except ValueError:
+            record = make_record(level=logging.ERROR, exc_info=sys.exc_info())
+
+        payload = json.loads(JsonFormatter().format(record))
+        self.assertIn('ValueError: réservoir vide', payload['exception'])
+
+
+# =========================
+# ÉCHANTILLONNAGE
+# =========================
+class SamplingFilterTests(SimpleTestCase):
+
+    def test_without_rates_everything_is_kept(self):
+        self.assertTrue(SamplingFilter().filter(make_record()))
+
+    def test_longest_prefix_wins(self):
+        sampling = SamplingFilter({'api': 1.0, 'api.views': 0.0})
+
+        self.assertFalse(sampling.filter(make_record('api.views')))
+        self.assertFalse(sampling.filter(make_record('api.views.missions')))
+        self.assertTrue(sampling.filter(make_record('api.signals')))
+        # Préfixe de nom, pas de chaîne : api.viewsets n'est pas sous api.views
+        self.assertTrue(sampling.filter(make_record('api.viewsets')))
+
+    def test_rate_uses_random_draw(self):
+        sampling = SamplingFilter({'api.views': 0.1})
+
+        with mock.patch('api.logs.random.random', return_value=0.05):
+            self.assertTrue(sampling.filter(make_record()))
+        with mock.patch('api.logs.random.random', return_value=0.5):
+            self.assertFalse(sampling.filter(make_record()))
+
+    def test_warnings_are_never_sampled(self):
+        sampling = SamplingFilter({'api.views': 0.0})
+
+        self.assertTrue(sampling.filter(make_record(level=logging.WARNING)))
+        self.assertTrue(sampling.filter(make_record(level=logging.ERROR)))
+        self.assertFalse(sampling.filter(make_record(level=logging.DEBUG)))
+
+
+# =========================
+# HANDLER NON BLOQUANT
+# =========================
+class NonBlockingHandlerTests(SimpleTestCase):
+
+    def test_lines_written_by_listener_thread(self):
+        stream = io.StringIO()
+        handler = NonBlockingHandler(stream=stream)
+        handler.setFormatter(JsonFormatter())
+
+        args = ['Casablanca']
+        record = make_record(msg='départ %s', args=(args,), mission_id=3)
+        handler.handle(record)
+        # Le message est résolu à l'appel, pas quand le thread l'écrit
+        args[0] = 'Rabat'
+        handler.close()
+
+        payload = json.loads(stream.getvalue())
+        self.assertEqual(payload['event'], "départ ['Casablanca']")
+        self.assertEqual(payload['mission_id'], 3)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = NonBlockingHandler(maxsize=1, stream=io.StringIO())
+        handler.listener.stop()
+        handler.running = False
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        self.assertEqual(handler.dropped, 1)
+
+
+# =========================
+# CONFIGURATION (LOG_LEVELS / LOG_SAMPLING)
+# =========================
+class LogSettingsParsingTests(SimpleTestCase):
+
+    def test_per_module_levels(self):
+        self.assertEqual(
+            parse_log_levels('api.views=debug, api.signals = WARNING,,ignored'),
+            {'api.views': {'level': 'DEBUG'}, 'api.signals': {'level': 'WARNING'}}
+        )
+
+    def test_empty_values(self):
+        self.assertEqual(parse_log_levels(''), {})
+        self.assertEqual(parse_sampling_rates(''), {})
+
+    def test_sampling_rates(self):
+        self.assertEqual(parse_sampling_rates('api.views=0.1,api=1'), {'api.views': 0.1, 'api': 1.0})
+
+    def test_invalid_rate_fails_at_startup(self):
+        with self.assertRaises(ValueError):
+            parse_sampling_rates('api.views=beaucoup')
+
+    def test_parsed_levels_configure_loggers(self):
+        logger = logging.getLogger('api.tests.logs')
+        self.addCleanup(logger.setLevel, logger.level)
+
+        logging.config.dictConfig({
+            'version': 1,
+            'incremental': True,
+            'loggers': parse_log_levels('api.tests.logs=error'),
+        })
+
+        self.assertEqual(logger.level, logging.ERROR)
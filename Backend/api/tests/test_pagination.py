@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Mission
+from .factories import create_driver, create_truck, create_mission
+
+
+# =========================
+# PAGINATION PAR CURSEUR
+# =========================
+class CursorPaginationTests(TestCase):
+
+    def setUp(self):
+        driver = create_driver(1)
+        truck = create_truck(1)
+        start = timezone.now()
+        self.missions = [create_mission(driver, truck, start + timedelta(hours=3 * i)) for i in range(5)]
+
+    def walk(self, url):
+        """Suit les liens `next` jusqu'à la dernière page ; retourne les ids dans l'ordre"""
+        ids = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            ids += [row['id'] for row in body['results']]
+            url = body['next']
+            pages += 1
+        return ids, pages
+
+    def test_next_link_walks_newest_first(self):
+        ids, pages = self.walk('/api/missions/?page_size=2')
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, [m.pk for m in reversed(self.missions)])
+
+    def test_equal_created_at_is_ordered_by_id(self):
+        # Import en masse : même created_at pour toutes les lignes
+        Mission.objects.update(created_at=timezone.now())
+
+        ids, _ = self.walk('/api/missions/?page_size=2')
+
+        self.assertEqual(ids, sorted((m.pk for m in self.missions), reverse=True))
+
+    def test_insert_during_walk_does_not_shift_pages(self):
+        first = self.client.get('/api/missions/?page_size=2').json()
+
+        # Une mission créée entre deux pages n'en décale pas le contenu
+        create_mission(None, None, timezone.now() + timedelta(days=2))
+
+        ids, _ = self.walk(first['next'])
+        self.assertEqual(
+            [row['id'] for row in first['results']] + ids,
+            [m.pk for m in reversed(self.missions)]
+        )
+
+    def test_page_size_is_capped(self):
+        response = self.client.get('/api/missions/?page_size=10000')
+        self.assertEqual(len(response.json()['results']), 5)
+        self.assertIsNone(response.json()['next'])
+
+
+# =========================
+# DASHBOARD (/api/dashboard/summary/)
+# =========================
+class DashboardSummaryTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.driver = create_driver(1)
+        self.truck = create_truck(1)
+        self.mission = create_mission(self.driver, self.truck, timezone.now())
+
+    def summary(self):
+        response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_counts(self):
+        self.assertEqual(self.summary(), {
+            'total_drivers': 1,
+            'total_trucks': 1,
+            'total_missions': 1,
+            'active_missions': 0,
+            'pending_missions': 1,
+            'completed_today': 0,
+        })
+
+    def test_transitions_invalidate_counts(self):
+        self.summary()
+
+        self.client.post(f'/api/missions/{self.mission.pk}/start/')
+        summary = self.summary()
+        self.assertEqual((summary['pending_missions'], summary['active_missions']), (0, 1))
+
+        self.client.post(f'/api/missions/{self.mission.pk}/complete/')
+        summary = self.summary()
+        self.assertEqual((summary['active_missions'], summary['completed_today']), (0, 1))
+
+    def test_creation_invalidates_counts(self):
+        self.summary()
+
+        create_mission(self.driver, self.truck, timezone.now() + timedelta(days=1))
+
+        self.assertEqual(self.summary()['total_missions'], 2)
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..representation_cache import representation_cache
+from .factories import create_driver, create_truck, create_mission
+
+
+# =========================
+# NOMBRE DE REQUÊTES (N+1)
+# =========================
+class QueryCountTests(TestCase):
+    """
+    Le nombre de requêtes SQL des listes et des détails ne dépend pas du
+    nombre de lignes : driver / user / truck sont chargés par select_related.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.drivers = [create_driver(i) for i in range(5)]
+        cls.trucks = [create_truck(i) for i in range(5)]
+        cls.missions = [
+            create_mission(cls.drivers[i], cls.trucks[i], now + timedelta(hours=3 * i))
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        # Les représentations en cache masqueraient les requêtes de sérialisation
+        representation_cache.clear()
+
+    def assertQueries(self, url, count):
+        with self.assertNumQueries(count):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_mission_list(self):
+        response = self.assertQueries('/api/missions/', 1)
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_mission_retrieve(self):
+        self.assertQueries(f'/api/missions/{self.missions[0].pk}/', 1)
+
+    def test_driver_list(self):
+        response = self.assertQueries('/api/drivers/', 1)
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_driver_retrieve(self):
+        self.assertQueries(f'/api/drivers/{self.drivers[0].pk}/', 1)
+
+    def test_truck_list(self):
+        response = self.assertQueries('/api/trucks/', 1)
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_truck_retrieve(self):
+        self.assertQueries(f'/api/trucks/{self.trucks[0].pk}/', 1)
@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from ..scheduling import Schedule
+from .factories import create_driver, create_truck, create_mission
+
+
+def at(hour):
+    return datetime(2026, 3, 2, tzinfo=dt_timezone.utc) + timedelta(hours=hour)
+
+
+# =========================
+# SCHEDULE (BISECT + MAXIMUM PRÉFIXE)
+# =========================
+class ScheduleTests(SimpleTestCase):
+
+    def test_overlap_and_back_to_back(self):
+        schedule = Schedule()
+        schedule.add(at(8), at(10), 'a')
+
+        self.assertEqual(schedule.conflict(at(9), at(11)), 'a')
+        self.assertEqual(schedule.conflict(at(7), at(9)), 'a')
+        # Intervalles semi-ouverts : bout à bout n'est pas un chevauchement
+        self.assertIsNone(schedule.conflict(at(10), at(12)))
+        self.assertIsNone(schedule.conflict(at(6), at(8)))
+        self.assertTrue(schedule.is_free(at(10), at(12)))
+        self.assertFalse(schedule.is_free(at(9), at(11)))
+
+    def test_long_slot_enclosing_shorter_ones(self):
+        schedule = Schedule()
+        schedule.add(at(9), at(10), 'court')
+        schedule.add(at(8), at(20), 'long')
+        schedule.add(at(11), at(12), 'autre')
+
+        # Le dernier créneau commencé (11 h → 12 h) est fini, mais `long` couvre encore 15 h
+        self.assertEqual(schedule.conflict(at(15), at(16)), 'long')
+        self.assertTrue(schedule.is_free(at(20), at(21)))
+
+    def test_insertion_out_of_order_propagates_reach(self):
+        schedule = Schedule()
+        for start, end, key in ((at(10), at(11), 'b'), (at(12), at(13), 'c'), (at(1), at(14), 'a')):
+            schedule.add(start, end, key)
+
+        self.assertEqual(schedule.starts, [at(1), at(10), at(12)])
+        self.assertEqual([key for _, key in schedule.reach], ['a', 'a', 'a'])
+        self.assertEqual(schedule.conflict(at(13), at(15)), 'a')
+
+
+# =========================
+# CHEVAUCHEMENTS À LA CRÉATION / MODIFICATION
+# =========================
+class MissionOverlapTests(TestCase):
+
+    def setUp(self):
+        self.start = timezone.now() + timedelta(days=1)
+        self.drivers = [create_driver(i) for i in range(2)]
+        self.trucks = [create_truck(i) for i in range(2)]
+        self.mission = create_mission(self.drivers[0], self.trucks[0], self.start, hours=4)
+
+    def post(self, driver, truck, start, hours=2):
+        return self.client.post('/api/missions/', {
+            'driver_id': driver.pk,
+            'truck_id': truck.pk,
+            'departure_city': 'Casablanca',
+            'departure_address': 'Port',
+            'arrival_city': 'Rabat',
+            'arrival_address': 'Zone industrielle',
+            'pickup_time': start.isoformat(),
+            'expected_dropoff_time': (start + timedelta(hours=hours)).isoformat(),
+            'container_number': 'MSCU7654321',
+            'container_type': '20ft',
+            'distance': 90,
+            'estimated_fuel_cost': 0,
+        }, content_type='application/json')
+
+    def test_truck_overlap_is_rejected(self):
+        response = self.post(self.drivers[1], self.trucks[0], self.start + timedelta(hours=3))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(f'#{self.mission.pk}', response.json()['truck'][0])
+
+    def test_driver_overlap_is_rejected(self):
+        response = self.post(self.drivers[0], self.trucks[1], self.start - timedelta(hours=1))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(f'#{self.mission.pk}', response.json()['driver'][0])
+
+    def test_back_to_back_is_allowed(self):
+        after = self.post(self.drivers[0], self.trucks[0], self.start + timedelta(hours=4))
+        before = self.post(self.drivers[0], self.trucks[0], self.start - timedelta(hours=2))
+
+        self.assertEqual(after.status_code, 201, after.content)
+        self.assertEqual(before.status_code, 201, before.content)
+
+    def test_finished_missions_do_not_block(self):
+        self.assertEqual(self.client.post(f'/api/missions/{self.mission.pk}/cancel/').status_code, 200)
+
+        response = self.post(self.drivers[1], self.trucks[0], self.start)
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_update_does_not_conflict_with_itself(self):
+        response = self.client.patch(f'/api/missions/{self.mission.pk}/', {
+            'expected_dropoff_time': (self.start + timedelta(hours=5)).isoformat(),
+        }, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_update_into_another_slot_is_rejected(self):
+        other = create_mission(self.drivers[1], self.trucks[1], self.start + timedelta(hours=6))
+
+        response = self.client.patch(f'/api/missions/{other.pk}/', {
+            'truck_id': self.trucks[0].pk,
+            'pickup_time': (self.start + timedelta(hours=2)).isoformat(),
+        }, content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('truck', response.json())
+
+
+# =========================
+# DISPONIBILITÉS (/api/availability/)
+# =========================
+class AvailabilityTests(TestCase):
+
+    def setUp(self):
+        self.driver = create_driver(1)
+        self.trucks = [create_truck(i) for i in range(2)]
+        create_mission(self.driver, self.trucks[0], at(8), hours=2)
+        create_mission(self.driver, self.trucks[0], at(14), hours=3)
+        cancelled = create_mission(self.driver, self.trucks[1], at(9), hours=2)
+        self.client.post(f'/api/missions/{cancelled.pk}/cancel/')
+
+    def availability(self, **params):
+        return self.client.get('/api/availability/', {'from': at(0).isoformat(), 'to': at(24).isoformat(), **params})
+
+    @staticmethod
+    def windows(slots):
+        return [(slot['start'], slot['end']) for slot in slots]
+
+    def test_busy_and_free_windows(self):
+        response = self.availability(trucks=f'{self.trucks[0].pk},{self.trucks[1].pk}')
+        self.assertEqual(response.status_code, 200)
+        trucks = {row['id']: row for row in response.json()['trucks']}
+
+        iso = lambda hour: at(hour).isoformat().replace('+00:00', 'Z')
+        self.assertEqual(self.windows(trucks[self.trucks[0].pk]['busy']), [(iso(8), iso(10)), (iso(14), iso(17))])
+        self.assertEqual(
+            self.windows(trucks[self.trucks[0].pk]['free']),
+            [(iso(0), iso(8)), (iso(10), iso(14)), (iso(17), iso(24))]
+        )
+        # Mission annulée : le camion est libre toute la journée
+        self.assertEqual(self.windows(trucks[self.trucks[1].pk]['free']), [(iso(0), iso(24))])
+
+    def test_driver_is_busy_on_every_truck(self):
+        drivers = self.availability(drivers=str(self.driver.pk)).json()['drivers']
+
+        self.assertEqual(len(drivers), 1)
+        self.assertEqual(len(drivers[0]['busy']), 2)
+
+    def test_invalid_windows_are_rejected(self):
+        self.assertEqual(self.availability(to=at(-1).isoformat()).status_code, 400)
+        self.assertEqual(self.availability(to=at(24 * 40).isoformat()).status_code, 400)
+        self.assertEqual(self.availability(trucks='abc').status_code, 400)
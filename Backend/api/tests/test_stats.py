@@ -0,0 +1,236 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Driver, Mission, WeeklyStats, Tombstone
+from ..stats import week_bounds, record_mission_completion, reset_weekly_hours, parse_stats_window
+from ..transitions import transition
+from .factories import create_driver, create_truck, create_mission
+
+
+def complete_mission(driver, truck, start, **fields):
+    mission = create_mission(driver, truck, start, **fields)
+    transition(mission, 'start')
+    transition(mission, 'complete')
+    return mission
+
+
+# =========================
+# RECONSTRUCTION DES STATS HEBDOMADAIRES
+# =========================
+class RebuildWeeklyStatsTests(TestCase):
+    """rebuild_weekly_stats : upsert par (driver, semaine), sans suppression massive"""
+
+    def setUp(self):
+        self.drivers = [create_driver(i) for i in range(2)]
+        self.truck = create_truck(1)
+        now = timezone.now()
+        self.missions = [
+            complete_mission(self.drivers[0], self.truck, now - timedelta(hours=5), distance=120),
+            complete_mission(self.drivers[0], self.truck, now - timedelta(hours=2), distance=80),
+        ]
+        self.week_start, self.week_end = week_bounds(now)
+
+    def rebuild(self):
+        out = StringIO()
+        call_command('rebuild_weekly_stats', stdout=out)
+        return out.getvalue()
+
+    def stats(self, driver):
+        return WeeklyStats.objects.get(driver=driver, week_start=self.week_start)
+
+    def test_matching_rows_are_left_alone(self):
+        before = self.stats(self.drivers[0])
+
+        output = self.rebuild()
+
+        self.assertIn('0 écrite(s), 0 supprimée(s)', output)
+        after = self.stats(self.drivers[0])
+        self.assertEqual(after.updated_at, before.updated_at)
+        self.assertEqual(after.completed_missions, 2)
+        self.assertEqual(after.total_kilometers, 200)
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_wrong_totals_are_corrected_in_place(self):
+        row = self.stats(self.drivers[0])
+        WeeklyStats.objects.filter(pk=row.pk).update(total_kilometers=1, completed_missions=9)
+
+        self.assertIn('1 écrite(s)', self.rebuild())
+
+        fixed = self.stats(self.drivers[0])
+        self.assertEqual(fixed.pk, row.pk)
+        self.assertEqual((fixed.total_kilometers, fixed.completed_missions), (200, 2))
+        self.assertGreater(fixed.updated_at, row.updated_at)
+
+    def test_missing_rows_are_created(self):
+        WeeklyStats.objects.all().delete()
+        Tombstone.objects.all().delete()
+
+        self.rebuild()
+
+        self.assertEqual(self.stats(self.drivers[0]).total_hours_worked, 4)
+
+    def test_archived_rows_are_kept(self):
+        archived = WeeklyStats.objects.create(
+            driver=self.drivers[1], week_start=date(2026, 1, 5), week_end=date(2026, 1, 11),
+            total_hours_worked=6,
+        )
+
+        self.rebuild()
+
+        self.assertTrue(WeeklyStats.objects.filter(pk=archived.pk, total_hours_worked=6).exists())
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_orphan_rows_are_deleted_with_a_tombstone(self):
+        orphan = WeeklyStats.objects.create(
+            driver=self.drivers[1], week_start=date(2026, 1, 5), week_end=date(2026, 1, 11),
+            total_kilometers=50, total_hours_worked=1, completed_missions=1,
+        )
+
+        self.assertIn('1 supprimée(s)', self.rebuild())
+
+        self.assertFalse(WeeklyStats.objects.filter(pk=orphan.pk).exists())
+        self.assertEqual(
+            list(Tombstone.objects.values_list('model', 'object_id')),
+            [('weeklystats', orphan.pk)]
+        )
+
+
+# =========================
+# STATS HEBDOMADAIRES INCRÉMENTALES
+# =========================
+class RecordMissionCompletionTests(TestCase):
+
+    def setUp(self):
+        self.driver = create_driver(1)
+        self.truck = create_truck(1)
+        self.week_start, _ = week_bounds(timezone.now())
+
+    def stats(self):
+        return WeeklyStats.objects.get(driver=self.driver, week_start=self.week_start)
+
+    def test_completions_accumulate(self):
+        complete_mission(self.driver, self.truck, timezone.now() - timedelta(hours=5), distance=120)
+        complete_mission(self.driver, self.truck, timezone.now() - timedelta(hours=2), distance=80)
+
+        stats = self.stats()
+        self.assertEqual((stats.completed_missions, stats.total_kilometers), (2, 200))
+        self.assertEqual(stats.total_hours_worked, 4)
+        self.assertEqual(stats.average_speed, 50)
+
+    def test_row_created_concurrently_is_updated(self):
+        mission = create_mission(
+            self.driver, self.truck, timezone.now(), distance=100,
+            status='completed', actual_end_time=timezone.now(), hours_worked=2,
+        )
+        update = QuerySet.update
+
+        def inserted_by_another_worker(queryset, **fields):
+            # Notre UPDATE ne trouve aucune ligne, puis l'autre worker insère la sienne
+            # avant notre INSERT : celui-ci lève IntegrityError et on retombe sur l'UPDATE
+            if queryset.model is WeeklyStats and not WeeklyStats.objects.exists():
+                WeeklyStats.objects.create(
+                    driver=self.driver, week_start=self.week_start, week_end=self.week_start + timedelta(days=6),
+                    total_kilometers=50, total_hours_worked=1, completed_missions=1, average_speed=50,
+                )
+                return 0
+            return update(queryset, **fields)
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=inserted_by_another_worker):
+            record_mission_completion(mission)
+
+        stats = self.stats()
+        self.assertEqual((stats.completed_missions, stats.total_kilometers), (2, 150))
+        self.assertEqual(stats.total_hours_worked, 3)
+        self.assertEqual(stats.average_speed, 50)
+
+    def test_missions_without_driver_are_ignored(self):
+        mission = create_mission(None, self.truck, timezone.now(), status='completed', actual_end_time=timezone.now())
+
+        record_mission_completion(mission)
+
+        self.assertFalse(WeeklyStats.objects.exists())
+
+
+# =========================
+# RESET HEBDOMADAIRE
+# =========================
+class ResetWeeklyHoursTests(TestCase):
+
+    def setUp(self):
+        self.truck = create_truck(1)
+        self.with_missions, self.hours_only, self.idle = [create_driver(i) for i in range(3)]
+        self.week_start, _ = week_bounds(timezone.now())
+
+        complete_mission(self.with_missions, self.truck, timezone.now() - timedelta(hours=3), distance=150)
+        # Heures saisies hors mission terminée (ex. correction manuelle)
+        Driver.objects.filter(pk=self.hours_only.pk).update(hours_worked=6)
+
+    def test_archives_drivers_with_hours_only_and_resets(self):
+        report = reset_weekly_hours(self.week_start)
+
+        self.assertEqual(report['archived'], 1)
+        self.assertEqual(report['reset'], 3)
+        archived = WeeklyStats.objects.get(driver=self.hours_only, week_start=self.week_start)
+        self.assertEqual((archived.total_hours_worked, archived.completed_missions), (6, 0))
+        self.assertFalse(WeeklyStats.objects.filter(driver=self.idle).exists())
+        self.assertFalse(Driver.objects.filter(hours_worked__gt=0).exists())
+
+    def test_materialized_totals_are_left_alone(self):
+        before = WeeklyStats.objects.get(driver=self.with_missions, week_start=self.week_start)
+
+        reset_weekly_hours(self.week_start)
+
+        after = WeeklyStats.objects.get(pk=before.pk)
+        self.assertEqual(
+            (after.total_kilometers, after.total_hours_worked, after.average_speed, after.updated_at),
+            (before.total_kilometers, before.total_hours_worked, before.average_speed, before.updated_at)
+        )
+
+    def test_dry_run_changes_nothing(self):
+        report = reset_weekly_hours(self.week_start, dry_run=True)
+
+        self.assertEqual((report['drivers_with_hours'], report['total_hours']), (2, 8))
+        self.assertEqual(WeeklyStats.objects.count(), 1)
+        self.assertTrue(Driver.objects.filter(hours_worked=6).exists())
+
+
+# =========================
+# FENÊTRES ?from=&to=
+# =========================
+class StatsWindowTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_dates_cover_whole_days(self):
+        start, end = parse_stats_window('2026-03-02', '2026-03-08')
+
+        self.assertEqual(timezone.localtime(start).isoformat()[:19], '2026-03-02T00:00:00')
+        self.assertEqual(timezone.localtime(end).isoformat()[:26], '2026-03-08T23:59:59.999999')
+
+    def test_invalid_date_is_rejected(self):
+        with self.assertRaises(ValueError):
+            parse_stats_window('hier')
+        response = self.client.get(f'/api/drivers/{create_driver(1).pk}/stats/', {'from': 'hier'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_driver_stats_window(self):
+        driver = create_driver(1)
+        truck = create_truck(1)
+        complete_mission(driver, truck, timezone.now() - timedelta(hours=3), distance=150)
+        Mission.objects.filter(driver=driver).update(actual_end_time=timezone.now() - timedelta(days=10))
+        complete_mission(driver, truck, timezone.now() - timedelta(hours=1), distance=40)
+
+        since = (timezone.localdate() - timedelta(days=1)).isoformat()
+        window = self.client.get(f'/api/drivers/{driver.pk}/stats/', {'from': since}).json()
+        total = self.client.get(f'/api/drivers/{driver.pk}/stats/').json()
+
+        self.assertEqual(window['total_kilometers'], 40)
+        self.assertEqual(total['total_kilometers'], 190)
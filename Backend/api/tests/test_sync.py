@@ -0,0 +1,147 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Driver, Truck, Mission, WeeklyStats
+from .factories import create_driver, create_truck, create_mission
+
+
+# =========================
+# SYNCHRONISATION (/api/sync/)
+# =========================
+def backdate(objects):
+    """updated_at une heure dans le passé, une minute d'écart entre chaque ligne"""
+    start = timezone.now() - timedelta(hours=1)
+    for index, instance in enumerate(objects):
+        type(instance).objects.filter(pk=instance.pk).update(updated_at=start + timedelta(minutes=index))
+
+
+class SyncTests(TestCase):
+    """
+    Jetons, pierres tombales et missions détachées
+
+    Les lignes sont antidatées à des instants distincts : un nouveau cycle
+    ne renvoie que les lignes modifiées, plus la dernière lue (même
+    horodatage que le curseur, renvoyée par la fenêtre de sécurité).
+    """
+
+    def setUp(self):
+        now = timezone.now()
+        self.drivers = [create_driver(i) for i in range(3)]
+        self.trucks = [create_truck(i) for i in range(3)]
+        self.missions = [
+            create_mission(self.drivers[i], self.trucks[i], now + timedelta(hours=3 * i))
+            for i in range(3)
+        ]
+        self.stats = WeeklyStats.objects.create(
+            driver=self.drivers[0], week_start=date(2026, 1, 5), week_end=date(2026, 1, 11)
+        )
+        for objects in (self.drivers, self.trucks, self.missions, [self.stats]):
+            backdate(objects)
+
+    def sync(self, token=None, **params):
+        if token:
+            params['since'] = token
+        response = self.client.get('/api/sync/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    @staticmethod
+    def ids(changes, stream):
+        return {row['id'] for row in changes[stream]}
+
+    def test_full_download_then_only_changes(self):
+        first = self.sync()
+        self.assertFalse(first['has_more'])
+        self.assertEqual(self.ids(first, 'missions'), {m.pk for m in self.missions})
+        self.assertEqual(self.ids(first, 'drivers'), {d.pk for d in self.drivers})
+        self.assertEqual(self.ids(first, 'weekly_stats'), {self.stats.pk})
+
+        last = self.missions[-1].pk
+        self.assertEqual(self.ids(self.sync(first['next']), 'missions'), {last})
+
+        mission = Mission.objects.get(pk=self.missions[0].pk)
+        mission.departure_city = 'Tanger'
+        mission.save()
+
+        second = self.sync(first['next'])
+        self.assertEqual(self.ids(second, 'missions'), {mission.pk, last})
+        self.assertEqual(second['missions'][-1]['departure_city'], 'Tanger')
+        self.assertEqual(self.ids(second, 'drivers'), {self.drivers[-1].pk})
+        self.assertEqual(self.ids(second, 'trucks'), {self.trucks[-1].pk})
+        self.assertEqual(second['deleted'], [])
+
+    def test_pages_follow_next_token(self):
+        seen = set()
+        token = None
+
+        for _ in range(5):
+            page = self.sync(token, limit=1)
+            self.assertLessEqual(len(page['missions']), 1)
+            seen |= self.ids(page, 'missions')
+            token = page['next']
+            if not page['has_more']:
+                break
+
+        self.assertFalse(page['has_more'])
+        self.assertEqual(seen, {m.pk for m in self.missions})
+
+    def test_deletes_are_tombstones(self):
+        token = self.sync()['next']
+        mission, stats, truck, driver = self.missions[1], self.stats, self.trucks[1], self.drivers[1]
+        expected = [
+            {'model': 'mission', 'id': mission.pk},
+            {'model': 'weeklystats', 'id': stats.pk},
+            {'model': 'truck', 'id': truck.pk},
+            {'model': 'driver', 'id': driver.pk},
+        ]
+
+        for instance in (mission, stats, truck, driver):
+            instance.delete()
+
+        self.assertCountEqual(self.sync(token)['deleted'], expected)
+
+    def test_cascade_deletes_are_tombstones(self):
+        token = self.sync()['next']
+        driver_id, stats_id = self.drivers[0].pk, self.stats.pk
+
+        self.drivers[0].delete()
+
+        deleted = self.sync(token)['deleted']
+        self.assertIn({'model': 'driver', 'id': driver_id}, deleted)
+        self.assertIn({'model': 'weeklystats', 'id': stats_id}, deleted)
+
+    def test_deleted_driver_resurfaces_missions(self):
+        token = self.sync()['next']
+
+        Driver.objects.get(pk=self.drivers[0].pk).delete()
+        Truck.objects.get(pk=self.trucks[1].pk).delete()
+
+        changes = self.sync(token)
+        by_id = {row['id']: row for row in changes['missions']}
+        self.assertEqual(set(by_id), {m.pk for m in self.missions})
+        self.assertIsNone(by_id[self.missions[0].pk]['driver'])
+        self.assertIsNone(by_id[self.missions[1].pk]['truck'])
+
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get('/api/sync/', {'since': 'pas-un-jeton'})
+        self.assertEqual(response.status_code, 400)
+
+
+class SyncSafetyWindowTests(TestCase):
+    """Une ligne validée en retard, horodatée juste avant le jeton, n'est pas perdue"""
+
+    def test_late_commit_is_not_lost(self):
+        driver = create_driver(1)
+        truck = create_truck(1)
+        synced = create_mission(driver, truck, timezone.now())
+
+        token = self.client.get('/api/sync/').json()['next']
+
+        # Transaction commencée avant la lecture, validée après : horodatée avant le curseur
+        late = create_mission(driver, truck, timezone.now() + timedelta(hours=5))
+        Mission.objects.filter(pk=late.pk).update(updated_at=synced.updated_at - timedelta(seconds=2))
+
+        changes = self.client.get('/api/sync/', {'since': token}).json()
+        self.assertIn(late.pk, {row['id'] for row in changes['missions']})
@@ -0,0 +1,235 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .. import events
+from ..models import Driver, Truck, Mission, DriverHoursCredit
+from ..representation_cache import representation_cache
+from ..serializers import MissionSerializer
+from ..transitions import transition, TransitionError
+from .factories import create_driver, create_truck, create_mission
+
+
+# =========================
+# EFFETS DE BORD : VALEURS RELUES
+# =========================
+class CompleteSideEffectsTests(TestCase):
+    """
+    `complete` expose le carburant et les heures réellement écrits en base,
+    même si le camion / le chauffeur a changé depuis le chargement de la mission.
+    """
+
+    def setUp(self):
+        representation_cache.clear()
+        self.driver = create_driver(1)
+        self.truck = create_truck(1, tank_capacity=400, current_fuel=300, avg_consumption=25)
+        self.mission = create_mission(
+            self.driver, self.truck, timezone.now(), hours=2, distance=100, status='in_progress'
+        )
+
+    def load_mission(self):
+        return Mission.objects.select_related('driver', 'truck').get(pk=self.mission.pk)
+
+    def test_fuel_is_read_back_after_concurrent_refuel(self):
+        mission = self.load_mission()
+
+        # Ravitaillement par une autre requête entre le chargement et `complete`
+        self.client.post(f'/api/trucks/{self.truck.pk}/refuel/', {'quantity': 50}, content_type='application/json')
+
+        transition(mission, 'complete')
+
+        # 300 + 50 - 25 (100 km à 25 L/100)
+        self.assertEqual(mission.truck.current_fuel, 325)
+        self.assertEqual(MissionSerializer(mission).data['truck']['current_fuel'], 325)
+
+        response = self.client.get(f'/api/trucks/{self.truck.pk}/')
+        self.assertEqual(response.json()['current_fuel'], 325)
+
+    def test_hours_are_read_back_after_concurrent_credit(self):
+        mission = self.load_mission()
+        Driver.objects.filter(pk=self.driver.pk).update(hours_worked=10)
+
+        transition(mission, 'complete')
+
+        self.assertEqual(mission.driver.hours_worked, 12)
+        self.driver.refresh_from_db()
+        self.assertEqual(mission.driver.updated_at, self.driver.updated_at)
+
+
+# =========================
+# ÉVÉNEMENT truck.fuel
+# =========================
+class FuelEventTests(TestCase):
+    """Chaque variation de carburant publie `truck.fuel`, après le commit"""
+
+    def setUp(self):
+        self.truck = create_truck(1, tank_capacity=400, current_fuel=100)
+
+    def assertFuelEvent(self, send, current_fuel):
+        with mock.patch.object(events.bus, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                send()
+
+        published = [call.args[0] for call in publish.call_args_list if call.args[0]['type'] == 'truck.fuel']
+        self.assertEqual(len(published), 1)
+        self.assertEqual(published[0]['truck_id'], self.truck.pk)
+        self.assertEqual(published[0]['current_fuel'], current_fuel)
+
+    def test_refuel_action_publishes(self):
+        self.assertFuelEvent(
+            lambda: self.client.post(
+                f'/api/trucks/{self.truck.pk}/refuel/', {'quantity': 50}, content_type='application/json'
+            ),
+            150,
+        )
+
+    def test_fuel_entry_publishes(self):
+        self.assertFuelEvent(
+            lambda: self.client.post(
+                '/api/fuel/',
+                {'truck': self.truck.pk, 'quantity': 40, 'price_per_liter': 15, 'location': 'Casablanca'},
+                content_type='application/json',
+            ),
+            140,
+        )
+
+    def test_complete_publishes(self):
+        mission = create_mission(create_driver(1), self.truck, timezone.now(), distance=100, status='in_progress')
+        self.assertFuelEvent(lambda: transition(mission, 'complete'), 75)
+
+    def test_refuel_is_capped_by_tank(self):
+        self.truck.adjust_fuel(1000)
+        self.assertEqual(self.truck.current_fuel, 400)
+        self.assertEqual(Truck.objects.get(pk=self.truck.pk).fuel_percentage, 100)
+
+
+# =========================
+# ENDPOINTS DE TRANSITION
+# =========================
+class TransitionEndpointTests(TestCase):
+    """Le status ne change que par /start/, /complete/, /cancel/ ; les transitions invalides renvoient 400"""
+
+    def setUp(self):
+        self.driver = create_driver(1)
+        self.truck = create_truck(1)
+        self.mission = create_mission(self.driver, self.truck, timezone.now())
+
+    def post(self, name, mission=None):
+        return self.client.post(f'/api/missions/{(mission or self.mission).pk}/{name}/')
+
+    def status(self):
+        return Mission.objects.values_list('status', flat=True).get(pk=self.mission.pk)
+
+    def test_patch_status_is_rejected(self):
+        response = self.client.patch(
+            f'/api/missions/{self.mission.pk}/', {'status': 'completed'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('/complete/', response.json()['status'][0])
+        self.assertEqual(self.status(), 'pending')
+
+    def test_patch_unchanged_status_is_accepted(self):
+        response = self.client.patch(
+            f'/api/missions/{self.mission.pk}/', {'status': 'pending'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_lifecycle(self):
+        self.assertEqual(self.post('start').status_code, 200)
+        self.assertEqual(self.post('complete').status_code, 200)
+        self.assertEqual(self.status(), 'completed')
+
+    def test_complete_from_pending_is_rejected(self):
+        response = self.post('complete')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pending', response.json()['error'])
+
+    def test_start_twice_is_rejected(self):
+        self.post('start')
+        self.assertEqual(self.post('start').status_code, 400)
+        self.assertEqual(self.status(), 'in_progress')
+
+    def test_double_complete_credits_once(self):
+        self.post('start')
+        self.assertEqual(self.post('complete').status_code, 200)
+        self.assertEqual(self.post('complete').status_code, 400)
+
+        self.assertEqual(DriverHoursCredit.objects.filter(mission=self.mission).count(), 1)
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.hours_worked, 2)
+
+    def test_cancel_completed_is_rejected(self):
+        self.post('start')
+        self.post('complete')
+        self.assertEqual(self.post('cancel').status_code, 400)
+        self.assertEqual(self.status(), 'completed')
+
+    def test_transition_error_reports_current_status(self):
+        with self.assertRaises(TransitionError) as context:
+            transition(self.mission, 'complete')
+        self.assertEqual(context.exception.current_status, 'pending')
+
+    def test_driver_destroy_cancels_missions_in_progress(self):
+        other = create_mission(self.driver, create_truck(2), timezone.now() + timedelta(hours=5))
+        self.post('start')
+
+        response = self.client.delete(f'/api/drivers/{self.driver.pk}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.status(), 'cancelled')
+        self.assertEqual(Mission.objects.get(pk=other.pk).status, 'pending')
+        self.assertFalse(Driver.objects.filter(pk=self.driver.pk).exists())
+
+
+# =========================
+# CONCURRENCE : FIN DE MISSION
+# =========================
+class ConcurrentCompleteTests(TransactionTestCase):
+    """
+    Des `complete` concurrents sur le même camion ne perdent aucune
+    consommation, et une mission terminée deux fois n'est comptée qu'une fois.
+    """
+
+    missions_count = 20
+    attempts_per_mission = 3
+
+    def test_concurrent_complete_keeps_fuel_exact(self):
+        initial_fuel = 5000.0
+        truck = create_truck(1, tank_capacity=10000, current_fuel=initial_fuel, avg_consumption=30)
+        driver = create_driver(1)
+        now = timezone.now()
+
+        missions = [
+            create_mission(driver, truck, now + timedelta(hours=3 * i), distance=100 + i, status='in_progress')
+            for i in range(self.missions_count)
+        ]
+
+        def complete(mission_id):
+            try:
+                # Chaque thread charge sa propre instance, comme une requête HTTP
+                mission = Mission.objects.select_related('driver', 'truck').get(pk=mission_id)
+                transition(mission, 'complete')
+                return True
+            except TransitionError:
+                return False
+            finally:
+                connection.close()
+
+        ids = [mission.pk for mission in missions] * self.attempts_per_mission
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outcomes = list(pool.map(complete, ids))
+
+        self.assertEqual(sum(outcomes), self.missions_count)
+
+        truck.refresh_from_db()
+        consumed = sum(mission.distance * 30 / 100 for mission in missions)
+        self.assertAlmostEqual(truck.current_fuel, initial_fuel - consumed, places=6)
+
+        driver.refresh_from_db()
+        self.assertAlmostEqual(driver.hours_worked, 2 * self.missions_count, places=6)
+        self.assertEqual(DriverHoursCredit.objects.count(), self.missions_count)
+        self.assertEqual(Mission.objects.filter(status='completed').count(), self.missions_count)
@@ -0,0 +1,197 @@
+import logging
+from collections import defaultdict
+from contextlib import nullcontext
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Driver, Mission, DriverHoursCredit, FUEL_PRICE_PER_LITER
+from . import events
+from .stats import invalidate_dashboard_summary, record_mission_completion
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# MACHINE À ÉTATS DES MISSIONS
+# =========================
+#   pending ──start──▶ in_progress ──complete──▶ completed
+#      └──────────────────┴─────────cancel─────▶ cancelled
+#
+# Chaque transition est un seul UPDATE conditionnel :
+#   UPDATE missions SET status = …, … WHERE id = … AND status IN (états sources)
+# La base arbitre : de deux `start` concurrents, un seul modifie la ligne,
+# l'autre voit 0 ligne modifiée → TransitionError, sans aucun effet de bord.
+# Les effets (carburant, heures, stats, événements) sont des hooks exécutés
+# dans la même transaction que l'UPDATE : tout est validé ou rien.
+TRANSITIONS = {
+    'start': {'from': ('pending',), 'to': 'in_progress', 'event': 'mission.started'},
+    'complete': {'from': ('in_progress',), 'to': 'completed', 'event': 'mission.completed'},
+    'cancel': {'from': ('pending', 'in_progress'), 'to': 'cancelled', 'event': 'mission.cancelled'},
+}
+EVENTS_BY_STATUS = {spec['to']: spec['event'] for spec in TRANSITIONS.values()}
+
+_hooks = defaultdict(list)
+# Transitions dont un hook écrit en base : UPDATE + hooks dans une transaction
+_atomic = set()
+
+
+class TransitionError(Exception):
+    """La mission n'est pas (ou plus) dans un état source de la transition"""
+
+    def __init__(self, name, current_status):
+        super().__init__(f'Transition {name} impossible depuis le status {current_status}')
+        self.name = name
+        self.current_status = current_status
+
+
+def on_transition(*names, writes=False):
+    """
+    Décorateur : enregistre un effet de bord `hook(mission)` exécuté après les transitions `names`
+
+    writes=True si le hook écrit en base : la transition est alors exécutée
+    dans une transaction (sinon l'UPDATE seul suffit, sans BEGIN / COMMIT).
+    """
+    def register(hook):
+        for name in names:
+            _hooks[name].append(hook)
+            if writes:
+                _atomic.add(name)
+        return hook
+    return register
+
+
+def planned_hours(mission):
+    """Durée prévue (pickup_time → expected_dropoff_time) en heures"""
+    if not (mission.pickup_time and mission.expected_dropoff_time):
+        return 0
+    return (mission.expected_dropoff_time - mission.pickup_time).total_seconds() / 3600
+
+
+def fuel_consumed(mission):
+    """Litres consommés selon la distance et la consommation moyenne du camion (None sans camion)"""
+    if not mission.truck or mission.distance <= 0:
+        return None
+    return (mission.distance * mission.truck.avg_consumption) / 100
+
+
+def _changes(name, mission, now):
+    """Champs écrits par la transition, en plus du status"""
+    if name == 'start':
+        return {'actual_start_time': now}
+
+    changes = {'actual_end_time': now}
+
+    if name == 'complete':
+        changes['hours_worked'] = planned_hours(mission)
+        liters = fuel_consumed(mission)
+        if liters is not None:
+            changes['actual_fuel_cost'] = liters * FUEL_PRICE_PER_LITER
+
+    return changes
+
+
+def transition(mission, name):
+    """
+    Applique la transition `name` à une mission déjà chargée
+
+    Un UPDATE conditionnel limité aux champs modifiés, puis les hooks ;
+    l'instance est mise à jour en mémoire (pas de relecture).
+    Lève TransitionError si la mission a quitté les états sources.
+    """
+    spec = TRANSITIONS[name]
+    now = timezone.now()
+    values = {'status': spec['to'], 'updated_at': now, **_changes(name, mission, now)}
+
+    with transaction.atomic() if name in _atomic else nullcontext():
+        updated = Mission.objects.filter(pk=mission.pk, status__in=spec['from']).update(**values)
+
+        if not updated:
+            current = Mission.objects.filter(pk=mission.pk).values_list('status', flat=True).first()
+            raise TransitionError(name, current)
+
+        for field, value in values.items():
+            setattr(mission, field, value)
+
+        for hook in _hooks[name]:
+            hook(mission)
+
+    return mission
+
+
+# =========================
+# EFFETS DE BORD
+# =========================
+@on_transition('complete', writes=True)
+def consume_fuel(mission):
+    liters = fuel_consumed(mission)
+    if liters is not None:
+        mission.truck.adjust_fuel(-liters)
+
+
+@on_transition('complete', writes=True)
+def credit_driver_hours(mission):
+    """
+    Ajoute les heures de la mission au chauffeur
+
+    ⚠️ Heures calculées sur la DURÉE PRÉVUE (pickup_time → expected_dropoff_time),
+    pas sur la durée réelle. Le registre DriverHoursCredit (unique par mission)
+    garantit un seul crédit, même avec plusieurs workers.
+    """
+    hours_to_add = planned_hours(mission)
+
+    if not mission.driver_id or hours_to_add <= 0:
+        return
+
+    try:
+        with transaction.atomic():
+            DriverHoursCredit.objects.create(
+                mission_id=mission.pk,
+                driver_id=mission.driver_id,
+                hours=hours_to_add
+            )
+
+            drivers = Driver.objects.filter(pk=mission.driver_id)
+            drivers.update(
+                hours_worked=F('hours_worked') + hours_to_add,
+                updated_at=timezone.now()
+            )
+            # Relu dans la transaction (ligne verrouillée) : le total réellement écrit
+            hours_total, updated_at = drivers.values_list('hours_worked', 'updated_at').get()
+    except IntegrityError:
+        # Heures déjà créditées pour cette mission
+        return
+
+    # Chauffeur déjà chargé (réponse de la vue) : valeurs relues, jamais estimées
+    if Mission.driver.is_cached(mission) and mission.driver is not None:
+        mission.driver.hours_worked = hours_total
+        mission.driver.updated_at = updated_at
+
+    logger.info('driver.hours_credited', extra={
+        'mission_id': mission.id,
+        'driver_id': mission.driver_id,
+        'truck_id': mission.truck_id,
+        'hours_added': round(hours_to_add, 2),
+        'hours_total': round(hours_total, 2),
+    })
+
+
+on_transition('complete', writes=True)(record_mission_completion)
+
+
+@on_transition(*TRANSITIONS)
+def invalidate_dashboard(mission):
+    # L'UPDATE ne déclenche pas post_save : les compteurs par status sont invalidés ici
+    invalidate_dashboard_summary()
+
+
+@on_transition(*TRANSITIONS)
+def publish_transition(mission):
+    events.publish(
+        EVENTS_BY_STATUS[mission.status],
+        driver_id=mission.driver_id,
+        truck_id=mission.truck_id,
+        mission_id=mission.id,
+        status=mission.status
+    )
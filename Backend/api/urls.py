@@ -8,6 +8,11 @@ from .views import (
     FuelEntryViewSet,
     NotificationViewSet,
     WeeklyStatsViewSet,
+    DashboardViewSet,
+    SyncViewSet,
+    AvailabilityViewSet,
+    event_stream,
+    metrics,
 )
 
 router = DefaultRouter()
@@ -17,11 +22,20 @@ router.register(r'missions', MissionViewSet, basename='mission')
 router.register(r'fuel', FuelEntryViewSet, basename='fuel')
 router.register(r'notifications', NotificationViewSet, basename='notification')
 router.register(r'weekly-stats', WeeklyStatsViewSet, basename='weekly-stats')
+router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+router.register(r'sync', SyncViewSet, basename='sync')
+router.register(r'availability', AvailabilityViewSet, basename='availability')
 
 urlpatterns = [
     # API REST STANDARD
     path('', include(router.urls)),
 
+    # FLUX TEMPS RÉEL (SSE, serveur ASGI)
+    path('events/', event_stream, name='events'),
+
+    # MÉTRIQUES (PROMETHEUS)
+    path('metrics/', metrics, name='metrics'),
+
     # ⚠️ PRÊT POUR GOOGLE MAPS (SANS L'ACTIVER ENCORE)
     # Ces routes seront utilisées PLUS TARD par le mobile
     # Elles ne cassent RIEN aujourd’hui
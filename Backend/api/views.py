@@ -1,9 +1,15 @@
-from rest_framework.viewsets import ModelViewSet
+import asyncio
+import logging
+import time
+
+from rest_framework.viewsets import ModelViewSet, ViewSet
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from django.utils import timezone
 from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils.cache import patch_cache_control
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 
 from .models import (
     Driver,
@@ -23,26 +29,75 @@ from .serializers import (
     WeeklyStatsSerializer
 )
 
+from . import events
+from .metrics import registry as metrics_registry
+from .bulk import bulk_create_missions, read_csv_rows
+from .dispatch import dispatch_pending_missions
+from .exports import stream_export, MISSION_EXPORT_FIELDS, FUEL_EXPORT_FIELDS
+from .conditional import ConditionalGetMixin
+from .scheduling import get_availability, parse_availability_window
+from .transitions import transition, fuel_consumed, TransitionError
+from .sync import get_changes, InvalidSyncToken, SYNC_DEFAULT_LIMIT, SYNC_MAX_LIMIT
+from .stats import (
+    get_dashboard_summary,
+    get_cached_driver_stats,
+    get_cached_drivers_stats,
+    parse_stats_window,
+    reset_weekly_hours,
+    DASHBOARD_SUMMARY_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
 # ======================================================
 # DRIVER
 # ======================================================
-class DriverViewSet(ModelViewSet):
-    queryset = Driver.objects.all()
+class DriverViewSet(ConditionalGetMixin, ModelViewSet):
+    queryset = Driver.objects.select_related('user')
     serializer_class = DriverSerializer
+    etag_related_fields = {'user': ('username', 'email')}
+    query_filters = {
+        'is_active': 'is_active',
+        'email': 'email__iexact',
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lte',
+    }
 
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
         driver = self.get_object()
-        missions = driver.missions.filter(status='completed')
 
-        total_km = sum(m.distance for m in missions)
-        total_hours = sum(m.hours_worked for m in missions)
+        try:
+            date_from, date_to = parse_stats_window(
+                request.query_params.get('from'),
+                request.query_params.get('to')
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response({
-            "total_kilometers": total_km,
-            "total_hours_worked": total_hours,
-            "completed_missions": missions.count()
-        })
+        return Response(get_cached_driver_stats(driver, date_from, date_to))
+
+    @action(detail=False, methods=['get'], url_path='stats')
+    def bulk_stats(self, request):
+        """/drivers/stats/?ids=1,2,3&from=&to= → stats de plusieurs chauffeurs"""
+        ids = request.query_params.get('ids')
+
+        try:
+            driver_ids = [int(i) for i in ids.split(',') if i] if ids else None
+            date_from, date_to = parse_stats_window(
+                request.query_params.get('from'),
+                request.query_params.get('to')
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(get_cached_drivers_stats(driver_ids, date_from, date_to))
+
+    @action(detail=False, methods=['post'])
+    def reset_weekly_hours(self, request):
+        """Archive la semaine dans WeeklyStats et remet toutes les heures à 0 (ensembliste)"""
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+        return Response(reset_weekly_hours(dry_run=dry_run))
 
     def update(self, request, *args, **kwargs):
         driver = self.get_object()
@@ -69,12 +124,12 @@ class DriverViewSet(ModelViewSet):
 
         try:
             with transaction.atomic():
-                active_missions = Mission.objects.filter(driver=driver, status='in_progress')
-
-                for mission in active_missions:
-                    mission.status = 'cancelled'
-                    mission.actual_end_time = timezone.now()
-                    mission.save()
+                for mission in Mission.objects.filter(driver=driver, status='in_progress'):
+                    try:
+                        transition(mission, 'cancel')
+                    except TransitionError:
+                        # Terminée / annulée entre-temps
+                        pass
 
                 driver.is_active = False
                 driver.save()
@@ -96,9 +151,15 @@ class DriverViewSet(ModelViewSet):
 # ======================================================
 # TRUCK
 # ======================================================
-class TruckViewSet(ModelViewSet):
+class TruckViewSet(ConditionalGetMixin, ModelViewSet):
     queryset = Truck.objects.all()
     serializer_class = TruckSerializer
+    query_filters = {
+        'is_available': 'is_available',
+        'motorization': 'motorization',
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lte',
+    }
 
     def destroy(self, request, *args, **kwargs):  # ✅ CORRECTION ICI
         truck = self.get_object()
@@ -124,14 +185,16 @@ class TruckViewSet(ModelViewSet):
                 fuel_entries = FuelEntry.objects.filter(truck=truck)
                 fuel_count = fuel_entries.count()
                 fuel_entries.delete()
-                
-                print(f"🗑️ {fuel_count} entrées de carburant supprimées")
 
                 truck_id = truck.id
                 truck_plate = truck.plate
                 truck.delete()
-                
-                print(f"✅ Camion #{truck_id} ({truck_plate}) supprimé avec succès")
+
+                logger.info('truck.deleted', extra={
+                    'truck_id': truck_id,
+                    'plate': truck_plate,
+                    'fuel_entries_deleted': fuel_count,
+                })
 
                 return Response(
                     {
@@ -142,10 +205,8 @@ class TruckViewSet(ModelViewSet):
                 )
 
         except Exception as e:
-            print(f"❌ Erreur suppression camion: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            
+            logger.exception('truck.delete_failed', extra={'truck_id': truck.id})
+
             return Response(
                 {"error": f"Erreur lors de la suppression: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -163,8 +224,7 @@ class TruckViewSet(ModelViewSet):
         if quantity <= 0:
             return Response({"error": "La quantité doit être positive"}, status=status.HTTP_400_BAD_REQUEST)
 
-        truck.current_fuel += quantity
-        truck.save()
+        truck.adjust_fuel(quantity)
 
         return Response({"status": "Camion ravitaillé", "current_fuel": truck.current_fuel})
 
@@ -172,9 +232,20 @@ class TruckViewSet(ModelViewSet):
 # ======================================================
 # MISSION
 # ======================================================
-class MissionViewSet(ModelViewSet):
-    queryset = Mission.objects.all()
+class MissionViewSet(ConditionalGetMixin, ModelViewSet):
+    queryset = Mission.objects.select_related('driver', 'driver__user', 'truck')
     serializer_class = MissionSerializer
+    etag_related = ('driver', 'truck')
+    etag_related_fields = {'driver__user': ('username', 'email')}
+    query_filters = {
+        'status': 'status__in',
+        'driver': 'driver_id',
+        'truck': 'truck_id',
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lte',
+        'pickup_after': 'pickup_time__gte',
+        'pickup_before': 'pickup_time__lte',
+    }
 
     @action(detail=False, methods=['post'])
     def check_fuel(self, request):
@@ -193,6 +264,114 @@ class MissionViewSet(ModelViewSet):
         except Truck.DoesNotExist:
             return Response({"error": "Camion introuvable"}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Import en masse : tableau JSON ou CSV (Content-Type: text/csv, avec en-tête)
+
+        ?partial=1 → crée les lignes valides même si d'autres sont en erreur
+        """
+        partial = str(request.query_params.get('partial', '')).lower() in ('1', 'true')
+
+        if request.content_type.startswith('text/csv'):
+            rows = read_csv_rows(request.stream) if request.stream else []
+        else:
+            rows = request.data
+            if not isinstance(rows, list):
+                return Response({"error": "Un tableau de missions est attendu"}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = bulk_create_missions(rows, partial=partial)
+
+        if result['errors'] and not result['created']:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(result, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """/missions/export/?output=csv|ndjson (mêmes filtres que la liste)"""
+        return stream_export(
+            self.filter_queryset(self.get_queryset()),
+            MISSION_EXPORT_FIELDS,
+            'missions',
+            request.query_params.get('output', 'csv')
+        )
+
+    @action(detail=False, methods=['post'])
+    def check_fuel_batch(self, request):
+        """
+        Contrôle carburant de plusieurs camions en une requête SQL
+
+        - {"pairs": [{"truck_id": 1, "distance": 250}, ...]}
+        - {"distance": 250} → tous les camions disponibles (hors mission en cours)
+
+        Résultats triés par coût de ravitaillement croissant ; les paires dont
+        la distance n'est pas > 0 sont listées dans `errors`.
+        """
+        pairs = request.data.get('pairs')
+        trucks = Truck.objects.all()
+
+        try:
+            if pairs:
+                wanted = [(int(p['truck_id']), float(p['distance'])) for p in pairs]
+                trucks = trucks.filter(id__in={truck_id for truck_id, _ in wanted})
+            else:
+                distance = float(request.data.get('distance', 0))
+                if distance <= 0:
+                    raise ValueError
+                trucks = trucks.filter(is_available=True).exclude(
+                    Exists(Mission.objects.filter(truck=OuterRef('pk'), status='in_progress'))
+                )
+                wanted = None
+        except (KeyError, TypeError, ValueError):
+            return Response(
+                {"error": "pairs [{truck_id, distance}] ou distance > 0 requis"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = {
+            row[0]: row
+            for row in trucks.values_list('id', 'plate', 'current_fuel', 'avg_consumption', 'tank_capacity')
+        }
+
+        if wanted is None:
+            wanted = [(truck_id, distance) for truck_id in rows]
+
+        results = []
+        errors = []
+        for index, (truck_id, distance) in enumerate(wanted):
+            if truck_id not in rows:
+                continue
+            # Même règle que check_fuel : une distance nulle ou négative n'a pas de sens
+            if not distance > 0:
+                errors.append({'index': index, 'truck_id': truck_id, 'error': 'distance > 0 requise'})
+                continue
+            _, plate, current_fuel, avg_consumption, tank_capacity = rows[truck_id]
+            results.append({
+                'truck_id': truck_id,
+                'plate': plate,
+                'distance': distance,
+                **Truck.fuel_check(current_fuel, avg_consumption, tank_capacity, distance)
+            })
+
+        results.sort(key=lambda r: (r['refuel_cost'], r['needed']))
+
+        return Response({
+            "results": results,
+            "errors": errors,
+            "not_found": sorted({truck_id for truck_id, _ in wanted} - rows.keys())
+        })
+
+    @action(detail=False, methods=['post'], url_path='dispatch')
+    def auto_dispatch(self, request):
+        """
+        Affectation automatique des missions `pending` sans chauffeur / camion
+
+        {"apply": false} → propose le plan ; {"apply": true} → l'enregistre
+        """
+        apply = str(request.data.get('apply', '')).lower() in ('1', 'true')
+        return Response(dispatch_pending_missions(apply=apply))
+
     @action(detail=False, methods=['post'])
     def refuel_and_create(self, request):
         try:
@@ -214,8 +393,7 @@ class MissionViewSet(ModelViewSet):
                     notes='Ravitaillement automatique lors de création de mission'
                 )
                 
-                truck.current_fuel += refuel_amount
-                truck.save()
+                truck.adjust_fuel(refuel_amount)
 
             serializer = MissionSerializer(data=mission_data)
             if serializer.is_valid():
@@ -234,86 +412,67 @@ class MissionViewSet(ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def start(self, request, pk=None):
+        started = time.perf_counter()
+        mission = self.get_object()
         try:
-            mission = self.get_object()
-            
-            print(f"🔍 Mission {mission.id} status: {mission.status}")
-
-            if mission.status != 'pending':
-                return Response(
-                    {"error": f"Cette mission ne peut pas être démarrée. Status actuel: {mission.status}"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            mission.status = 'in_progress'
-            mission.actual_start_time = timezone.now()
-            mission.save()
+            transition(mission, 'start')
 
-            print(f"✅ Mission {mission.id} démarrée avec succès")
+            logger.info('mission.started', extra={
+                'mission_id': mission.id,
+                'truck_id': mission.truck_id,
+                'driver_id': mission.driver_id,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            })
 
             serializer = self.get_serializer(mission)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
+        except TransitionError as e:
+            return Response(
+                {"error": f"Cette mission ne peut pas être démarrée. Status actuel: {e.current_status}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
-            print(f"❌ Erreur lors du démarrage: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception('mission.start_failed', extra={'mission_id': pk})
             return Response({"error": f"Erreur serveur: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
+        started = time.perf_counter()
+        mission = self.get_object()
         try:
-            mission = self.get_object()
-
-            print(f"🔍 Completing mission {mission.id}, status: {mission.status}")
-
-            if mission.status != 'in_progress':
-                return Response(
-                    {"error": f"Cette mission n'est pas en cours. Status: {mission.status}"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            mission.status = 'completed'
-            mission.actual_end_time = timezone.now()
-
-            if mission.pickup_time and mission.expected_dropoff_time:
-                duration = mission.expected_dropoff_time - mission.pickup_time
-                mission.hours_worked = duration.total_seconds() / 3600
-
-            if mission.truck and mission.distance > 0:
-                liters_consumed = (mission.distance * mission.truck.avg_consumption) / 100
-                old_fuel = mission.truck.current_fuel
-                mission.truck.current_fuel = max(0, mission.truck.current_fuel - liters_consumed)
-                mission.truck.save()
-                mission.actual_fuel_cost = liters_consumed * 15.0
-                
-                print(f"⛽ Carburant consommé: {liters_consumed:.2f}L")
-                print(f"   Avant: {old_fuel:.2f}L → Après: {mission.truck.current_fuel:.2f}L")
-
-            mission.save()
-
-            print(f"✅ Mission {mission.id} terminée avec succès")
+            transition(mission, 'complete')
+            liters_consumed = fuel_consumed(mission)
+
+            logger.info('mission.completed', extra={
+                'mission_id': mission.id,
+                'truck_id': mission.truck_id,
+                'driver_id': mission.driver_id,
+                'fuel_liters': round(liters_consumed, 2) if liters_consumed is not None else None,
+                'fuel_after': mission.truck.current_fuel if mission.truck else None,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            })
 
             serializer = self.get_serializer(mission)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
+        except TransitionError as e:
+            return Response(
+                {"error": f"Cette mission n'est pas en cours. Status: {e.current_status}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
-            print(f"❌ Erreur lors de la complétion: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception('mission.complete_failed', extra={'mission_id': pk})
             return Response({"error": f"Erreur serveur: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
+
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         mission = self.get_object()
-
-        if mission.status not in ['pending', 'in_progress']:
+        try:
+            transition(mission, 'cancel')
+        except TransitionError:
             return Response({"error": "Cette mission ne peut pas être annulée"}, status=status.HTTP_400_BAD_REQUEST)
 
-        mission.status = 'cancelled'
-        mission.actual_end_time = timezone.now()
-        mission.save()
-
         return Response(self.get_serializer(mission).data, status=status.HTTP_200_OK)
 
 
@@ -323,6 +482,22 @@ class MissionViewSet(ModelViewSet):
 class FuelEntryViewSet(ModelViewSet):
     queryset = FuelEntry.objects.all()
     serializer_class = FuelEntrySerializer
+    query_filters = {
+        'truck': 'truck_id',
+        'mission': 'mission_id',
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lte',
+    }
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """/fuel/export/?output=csv|ndjson (mêmes filtres que la liste)"""
+        return stream_export(
+            self.filter_queryset(self.get_queryset()),
+            FUEL_EXPORT_FIELDS,
+            'fuel_entries',
+            request.query_params.get('output', 'csv')
+        )
 
 
 # ======================================================
@@ -331,6 +506,13 @@ class FuelEntryViewSet(ModelViewSet):
 class NotificationViewSet(ModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
+    query_filters = {
+        'driver': 'driver_id',
+        'is_read': 'is_read',
+        'notification_type': 'notification_type',
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lte',
+    }
 
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
@@ -344,5 +526,120 @@ class NotificationViewSet(ModelViewSet):
 # WEEKLY STATS
 # ======================================================
 class WeeklyStatsViewSet(ModelViewSet):
-    queryset = WeeklyStats.objects.all()
-    serializer_class = WeeklyStatsSerializer
\ No newline at end of file
+    queryset = WeeklyStats.objects.select_related('driver', 'driver__user')
+    serializer_class = WeeklyStatsSerializer
+    query_filters = {
+        'driver': 'driver_id',
+        'week_after': 'week_start__gte',
+        'week_before': 'week_start__lte',
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lte',
+    }
+
+
+# ======================================================
+# DASHBOARD
+# ======================================================
+class DashboardViewSet(ViewSet):
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        response = Response(get_dashboard_summary())
+        patch_cache_control(response, private=True, max_age=DASHBOARD_SUMMARY_TTL)
+        return response
+
+
+# ======================================================
+# DISPONIBILITÉS (PLANNING)
+# ======================================================
+class AvailabilityViewSet(ViewSet):
+
+    def list(self, request):
+        """
+        /api/availability/?from=&to=&trucks=1,2&drivers=3,4
+
+        Créneaux libres et occupés (missions pending / in_progress) par camion
+        et par chauffeur. Par défaut : maintenant → +7 jours, tous les camions
+        disponibles et chauffeurs actifs.
+        """
+        params = request.query_params
+
+        try:
+            truck_ids = [int(i) for i in params['trucks'].split(',') if i] if params.get('trucks') else None
+            driver_ids = [int(i) for i in params['drivers'].split(',') if i] if params.get('drivers') else None
+            start, end = parse_availability_window(*parse_stats_window(params.get('from'), params.get('to')))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(get_availability(start, end, truck_ids, driver_ids))
+
+
+# ======================================================
+# SYNC (DELTA)
+# ======================================================
+class SyncViewSet(ViewSet):
+
+    def list(self, request):
+        """
+        /api/sync/?since=<jeton>&limit=N
+
+        Retourne uniquement les chauffeurs, camions, missions et stats
+        modifiés depuis le jeton, plus les suppressions (`deleted`).
+        Rappeler avec `next` tant que `has_more` est vrai.
+        """
+        try:
+            limit = min(int(request.query_params.get('limit', SYNC_DEFAULT_LIMIT)), SYNC_MAX_LIMIT)
+            changes = get_changes(request.query_params.get('since'), max(limit, 1))
+        except (InvalidSyncToken, ValueError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(changes)
+
+
+# ======================================================
+# MÉTRIQUES (PROMETHEUS)
+# ======================================================
+def metrics(request):
+    """/api/metrics/ : histogrammes par route (durée, SQL, rendu, taille) du processus courant"""
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# ======================================================
+# EVENTS (SERVER-SENT EVENTS, ASGI)
+# ======================================================
+EVENT_KEEPALIVE = 15  # secondes
+
+
+async def event_stream(request):
+    """
+    Flux temps réel : /api/events/?driver=ID&truck=ID
+
+    Pousse les transitions de mission (start / complete / cancel),
+    les changements de carburant et les nouvelles notifications,
+    filtrés par chauffeur et/ou camion. Nécessite un serveur ASGI.
+    """
+    try:
+        driver_id = int(request.GET['driver']) if request.GET.get('driver') else None
+        truck_id = int(request.GET['truck']) if request.GET.get('truck') else None
+    except ValueError:
+        return JsonResponse({"error": "driver et truck doivent être des IDs"}, status=400)
+
+    subscription = events.bus.subscribe(driver_id=driver_id, truck_id=truck_id)
+
+    async def stream():
+        try:
+            yield ': connected\n\n'
+            while True:
+                try:
+                    event = await subscription.get(timeout=EVENT_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield events.format_sse(event)
+        finally:
+            events.bus.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,7 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+# Servir avec un serveur ASGI (uvicorn / daphne) pour le flux /api/events/
+application = get_asgi_application()
@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+from api.logs import parse_log_levels, parse_sampling_rates
+
 # =========================
 # BASE DIR
 # =========================
@@ -42,6 +45,7 @@ INSTALLED_APPS = [
 # =========================
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # CORS en premier
+    'api.middleware.RequestMetricsMiddleware',  # Server-Timing + /api/metrics/
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,6 +68,54 @@ CORS_ALLOW_ALL_ORIGINS = True
 ROOT_URLCONF = 'backend.urls'
 
 
+# =========================
+# INSTRUMENTATION
+# =========================
+# En-tête Server-Timing (db / app / render / total) sur chaque réponse ;
+# les métriques /api/metrics/ restent collectées même si désactivé
+SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING', '1') == '1'
+
+
+# =========================
+# LOGGING (JSON, NON BLOQUANT)
+# =========================
+# - LOG_LEVEL : niveau des loggers `api.*`, WARNING par défaut (zéro coût
+#   pour les événements INFO / DEBUG, filtrés avant toute construction) ;
+#   en développement : LOG_LEVEL=INFO python manage.py runserver
+# - LOG_LEVELS : niveaux par module, ex. "api.views=DEBUG,api.signals=WARNING"
+# - LOG_SAMPLING : fraction conservée par module, ex. "api.views=0.1"
+LOG_LEVEL = (os.environ.get('LOG_LEVEL') or 'WARNING').upper()
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'api.logs.JsonFormatter'},
+    },
+    'filters': {
+        'sampling': {
+            '()': 'api.logs.SamplingFilter',
+            'rates': parse_sampling_rates(os.environ.get('LOG_SAMPLING', '')),
+        },
+    },
+    'handlers': {
+        'async_json': {
+            'class': 'api.logs.NonBlockingHandler',
+            'formatter': 'json',
+            'filters': ['sampling'],
+        },
+    },
+    'loggers': {
+        'api': {
+            'handlers': ['async_json'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+        **parse_log_levels(os.environ.get('LOG_LEVELS', '')),
+    },
+}
+
+
 # =========================
 # TEMPLATES
 # =========================
@@ -93,12 +145,61 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # =========================
 # DATABASE
 # =========================
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Profil choisi par variable d'environnement :
+#   DB_ENGINE=sqlite      → mono-serveur (défaut), SQLite en mode WAL
+#   DB_ENGINE=postgresql  → production (psycopg 3 requis)
+#
+# Les mêmes variables servent pour lancer les tests sur les deux bases :
+#   DB_ENGINE=postgresql DB_NAME=logistics python manage.py test
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    # DB_POOL=1 → pool de connexions psycopg (Django ≥ 5.1),
+    # sinon connexions persistantes (CONN_MAX_AGE) avec health checks
+    DB_POOL = os.environ.get('DB_POOL', '0') == '1'
+
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'logistics'),
+            'USER': os.environ.get('DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+                    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+                },
+            } if DB_POOL else {},
+        }
+    }
+else:
+    # WAL : les lectures ne bloquent plus pendant les écritures (start / complete / refuel)
+    # IMMEDIATE : le verrou d'écriture est pris en début de transaction (pas de deadlock)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Attente max (s) d'un verrou d'écriture : seul réglage du busy timeout
+                'timeout': 20,
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA mmap_size=134217728;'
+                    'PRAGMA cache_size=-20000;'
+                ),
+            },
+            # Base de test sur fichier (et non en mémoire partagée) : WAL et busy
+            # timeout s'appliquent, les tests multi-threads écrivent en parallèle
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        }
     }
-}
 
 
 # =========================
@@ -135,18 +236,45 @@ USE_TZ = True
 
 
 # =========================
-# CACHE (POUR LE WEEKLY RESET)
+# CACHE
 # =========================
-# ✅ AJOUTÉ: Configuration du cache pour éviter les resets multiples
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'logistics-cache',
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000
+# Backend choisi par variable d'environnement :
+#   CACHE_BACKEND=locmem → par processus (défaut, tests)
+#   CACHE_BACKEND=file   → partagé entre workers d'une même machine (CACHE_LOCATION)
+#   CACHE_BACKEND=redis  → partagé entre machines (CACHE_LOCATION=redis://host:6379/0)
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://127.0.0.1:6379/0'),
+            'KEY_PREFIX': 'logistics',
         }
     }
-}
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', BASE_DIR / 'cache'),
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000
+            }
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'logistics-cache',
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000
+            }
+        }
+    }
+
+# Cache LRU (par processus) des représentations Driver / Truck sérialisées
+REPRESENTATION_CACHE_SIZE = 2000
 
 
 # =========================
@@ -167,7 +295,16 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+
+    # Pagination keyset (created_at, id) sur toutes les listes
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': 50,
+
+    # Filtres côté serveur (voir `query_filters` sur chaque ViewSet)
+    'DEFAULT_FILTER_BACKENDS': [
+        'api.filters.QueryParamFilterBackend',
+    ],
 }
 
 
@@ -6,4 +6,4 @@ pip install -r requirements.txt
 python manage.py migrate
 python manage.py createsuperuser
 python manage.py seed_data
-python manage.py runserver
+LOG_LEVEL=INFO python manage.py runserver
@@ -16,9 +16,8 @@ import { auth } from '../../firebaseConfig';
 
 // 🌐 API
 import {
-  getDrivers,
-  getTrucks,
-  getMissions,
+  getDashboardSummary,
+  resetWeeklyHours,
 } from '../../services/api';
 
 // =====================================
@@ -50,45 +49,22 @@ const AdminDashboardScreen = ({ navigation }) => {
     pendingMissions: 0,
   });
 
-  const [driversData, setDriversData] = useState([]);
-
   // =====================================
   // LOAD ADMIN STATS (GLOBAL)
   // =====================================
+  // Compteurs calculés côté serveur (/dashboard/summary/) :
+  // la réponse a une taille constante, quelle que soit la flotte.
   const loadDashboard = async () => {
     try {
-      const [drivers, trucks, missions] = await Promise.all([
-        getDrivers(),
-        getTrucks(),
-        getMissions(),
-      ]);
-
-      setDriversData(drivers);
-
-      const today = new Date().toDateString();
-
-      const activeMissions = missions.filter(
-        (m) => m.status === 'in_progress'
-      );
-
-      const pendingMissions = missions.filter(
-        (m) => m.status === 'pending'
-      );
-
-      const completedToday = missions.filter(
-        (m) =>
-          m.status === 'completed' &&
-          m.actual_end_time &&
-          new Date(m.actual_end_time).toDateString() === today
-      );
+      const summary = await getDashboardSummary();
 
       setStats({
-        totalDrivers: drivers.length,
-        totalTrucks: trucks.length,
-        activeMissions: activeMissions.length,
-        totalMissions: missions.length,
-        completedToday: completedToday.length,
-        pendingMissions: pendingMissions.length,
+        totalDrivers: summary.total_drivers,
+        totalTrucks: summary.total_trucks,
+        activeMissions: summary.active_missions,
+        totalMissions: summary.total_missions,
+        completedToday: summary.completed_today,
+        pendingMissions: summary.pending_missions,
       });
     } catch (e) {
       console.error('Admin dashboard error:', e);
@@ -116,51 +92,16 @@ const AdminDashboardScreen = ({ navigation }) => {
           style: 'destructive',
           onPress: async () => {
             try {
-              // Appeler l'API pour reset tous les drivers
-              const API_URL = 'http://192.168.3.50:8000/api';
-              
-              let resetCount = 0;
-              const errors = [];
-
-              for (const driver of driversData) {
-                try {
-                  const response = await fetch(`${API_URL}/drivers/${driver.id}/`, {
-                    method: 'PUT',
-                    headers: {
-                      'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({
-                      ...driver,
-                      hours_worked: 0,
-                    }),
-                  });
-
-                  if (response.ok) {
-                    resetCount++;
-                  } else {
-                    errors.push(driver.name);
-                  }
-                } catch (err) {
-                  errors.push(driver.name);
-                  console.error(`Erreur reset ${driver.name}:`, err);
-                }
-              }
+              // Un seul appel : archivage WeeklyStats + remise à zéro côté serveur
+              const report = await resetWeeklyHours();
 
               // Recharger le dashboard
               await loadDashboard();
 
-              // Afficher le résultat
-              if (errors.length === 0) {
-                Alert.alert(
-                  '✅ Succès',
-                  `Les heures de ${resetCount} chauffeur(s) ont été réinitialisées avec succès !`
-                );
-              } else {
-                Alert.alert(
-                  '⚠️ Partiellement réussi',
-                  `${resetCount} chauffeur(s) réinitialisé(s).\n\nErreurs: ${errors.join(', ')}`
-                );
-              }
+              Alert.alert(
+                '✅ Succès',
+                `Les heures de ${report.reset} chauffeur(s) ont été réinitialisées avec succès !`
+              );
             } catch (error) {
               console.error('Reset error:', error);
               Alert.alert(
@@ -176,7 +176,8 @@ const CreateMissionScreen = ({ navigation }) => {
         const [driversData, trucksData, missionsData] = await Promise.all([
           getDrivers(),
           getTrucks(),
-          getMissions(),
+          // Les missions terminées / annulées n'entrent pas dans les contrôles
+          getMissions({ status: 'pending,in_progress' }),
         ]);
         setDrivers(driversData);
         setTrucks(trucksData);
@@ -12,7 +12,7 @@ import {
 // 🌐 API
 import {
   getDriverById,
-  getMissions,
+  getMissionsPage,
   deleteDriver,
 } from '../../services/api';
 
@@ -50,15 +50,12 @@ const DriverDetailsScreen = ({ route, navigation }) => {
         const driverData = await getDriverById(driverId);
         setDriver(driverData);
 
-        const missions = await getMissions();
-
-        const driverMissions = missions.filter(
-          (m) => m.driver && m.driver.id === driverId
-        );
-
-        const active = driverMissions.find(
-          (m) => m.status === 'in_progress'
-        );
+        // Seule la mission en cours est affichée : une page filtrée suffit
+        const page = await getMissionsPage({
+          driver: driverId,
+          status: 'in_progress',
+        });
+        const active = page.results[0];
 
         setCurrentMission(
           active
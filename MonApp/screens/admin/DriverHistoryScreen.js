@@ -19,8 +19,7 @@ const DriverHistoryScreen = ({ route, navigation }) => {
 
   useEffect(() => {
     const load = async () => {
-      const all = await getMissions();
-      const completed = all.filter(m => m.driver?.id === driverId && m.status === 'completed');
+      const completed = await getMissions({ driver: driverId, status: 'completed' });
       setMissions(completed);
     };
     load();
@@ -44,7 +44,8 @@ const DriversScreen = ({ navigation }) => {
         try {
           const [driversData, missionsData] = await Promise.all([
             getDrivers(),
-            getMissions(),
+            // Seules les missions en cours servent au statut des chauffeurs
+            getMissions({ status: 'in_progress' }),
           ]);
 
           setDrivers(driversData);
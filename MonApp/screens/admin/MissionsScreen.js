@@ -9,7 +9,7 @@ import {
 } from 'react-native';
 
 // 🌐 API
-import { getMissions } from '../../services/api';
+import { getMissionsPage, getNextPage } from '../../services/api';
 
 // =====================================
 // COULEURS LOCALES (SAFE)
@@ -32,23 +32,47 @@ const COLORS = {
 // =====================================
 const MissionsScreen = ({ navigation }) => {
   const [missions, setMissions] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [filter, setFilter] = useState('all');
 
   // =====================================
-  // LOAD MISSIONS
+  // LOAD MISSIONS (PAGE PAR PAGE, FILTRÉES CÔTÉ SERVEUR)
   // =====================================
   useEffect(() => {
+    let isActive = true;
+
     const loadMissions = async () => {
       try {
-        const data = await getMissions();
-        setMissions(data);
+        const page = await getMissionsPage({
+          status: filter === 'all' ? undefined : filter,
+        });
+        if (!isActive) return;
+        setMissions(page.results);
+        setNextPage(page.next);
       } catch (e) {
         console.error('Missions load error:', e);
       }
     };
 
     loadMissions();
-  }, []);
+
+    return () => {
+      isActive = false;
+    };
+  }, [filter]);
+
+  // Page suivante au défilement (curseur `next`)
+  const loadMore = async () => {
+    if (!nextPage) return;
+
+    try {
+      const page = await getNextPage(nextPage);
+      setMissions((current) => [...current, ...page.results]);
+      setNextPage(page.next);
+    } catch (e) {
+      console.error('Missions load more error:', e);
+    }
+  };
 
   // =====================================
   // STATUS HELPERS
@@ -188,14 +212,6 @@ const MissionsScreen = ({ navigation }) => {
     );
   };
 
-  // =====================================
-  // FILTER
-  // =====================================
-  const filteredMissions = missions.filter((m) => {
-    if (filter === 'all') return true;
-    return m.status === filter;
-  });
-
   // =====================================
   // RENDER
   // =====================================
@@ -256,9 +272,11 @@ const MissionsScreen = ({ navigation }) => {
 
       {/* LIST */}
       <FlatList
-        data={filteredMissions}
+        data={missions}
         keyExtractor={(item) => String(item.id)}
         renderItem={({ item }) => <MissionCard mission={item} />}
+        onEndReached={loadMore}
+        onEndReachedThreshold={0.5}
         contentContainerStyle={styles.list}
         showsVerticalScrollIndicator={false}
       />
@@ -43,7 +43,8 @@ const TruckScreen = ({ navigation }) => {
       try {
         const [trucksData, missionsData] = await Promise.all([
           getTrucks(),
-          getMissions(),
+          // Seules les missions en cours servent au statut des camions
+          getMissions({ status: 'in_progress' }),
         ]);
 
         setTrucks(trucksData);
@@ -12,7 +12,8 @@ import { useFocusEffect } from '@react-navigation/native';
 
 import {
   getMissions,
-  getDrivers,
+  getDriverByEmail,
+  getDriverStats,
 } from '../../services/api';
 
 import { useAuth } from '../../context/AuthContext';
@@ -60,22 +61,18 @@ const DashboardScreen = ({ navigation }) => {
     try {
       if (!user?.email) return;
 
-      // 🔐 RÉCUPÉRER LE DRIVER PAR EMAIL
-      const drivers = await getDrivers();
-      const currentDriver = drivers.find(
-        (d) => d.email === user.email
-      );
+      // 🔐 RÉCUPÉRER LE DRIVER PAR EMAIL (filtré côté serveur)
+      const currentDriver = await getDriverByEmail(user.email);
 
       if (!currentDriver) return;
 
       setDriver(currentDriver);
 
-      const missions = await getMissions();
-
-      // 🔐 MISSIONS DU DRIVER CONNECTÉ
-      const driverMissions = missions.filter(
-        (m) => m.driver && m.driver.email === user.email
-      );
+      // 🔐 MISSIONS À VENIR / EN COURS DU DRIVER CONNECTÉ
+      const driverMissions = await getMissions({
+        driver: currentDriver.id,
+        status: 'pending,in_progress',
+      });
 
       const active = driverMissions.find(
         (m) => m.status === 'in_progress'
@@ -88,15 +85,8 @@ const DashboardScreen = ({ navigation }) => {
       setActiveMission(active || null);
       setPendingMissions(pending);
 
-      // 🔢 STATS SEMAINE
-      const completed = driverMissions.filter(
-        (m) => m.status === 'completed'
-      );
-
-      const totalKm = completed.reduce(
-        (sum, m) => sum + (m.distance || 0),
-        0
-      );
+      // 🔢 STATS : agrégées côté serveur (missions terminées)
+      const stats = await getDriverStats(currentDriver.id);
 
       // ✅ Utiliser les heures du DRIVER directement
       const totalHours = parseFloat(currentDriver.hours_worked) || 0;
@@ -110,9 +100,9 @@ const DashboardScreen = ({ navigation }) => {
       });
 
       setWeeklyStats({
-        totalKilometers: totalKm,
+        totalKilometers: stats.total_kilometers,
         totalHoursWorked: totalHours,
-        completedMissions: completed.length,
+        completedMissions: stats.completed_missions,
         remainingHours: remainingHours,
         contractualHours: contractualHours,
       });
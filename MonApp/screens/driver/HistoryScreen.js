@@ -10,7 +10,7 @@ import {
 import { useFocusEffect } from '@react-navigation/native';
 
 import MissionCard from '../../components/MissionCard';
-import { getMissions, getDrivers } from '../../services/api';
+import { getMissions, getDriverByEmail } from '../../services/api';
 import { useAuth } from '../../context/AuthContext';
 
 // =====================================
@@ -60,8 +60,7 @@ const HistoryScreen = ({ navigation }) => {
             return;
           }
 
-          const drivers = await getDrivers();
-          const currentDriver = drivers.find((d) => d.email === user.email);
+          const currentDriver = await getDriverByEmail(user.email);
 
           if (!currentDriver) {
             console.log('❌ Driver non trouvé');
@@ -74,15 +73,11 @@ const HistoryScreen = ({ navigation }) => {
 
           console.log('✅ Driver trouvé:', currentDriver.name);
 
-          const missions = await getMissions();
-
-          // 🔐 MISSIONS TERMINÉES DU DRIVER CONNECTÉ
-          const completed = missions.filter(
-            (m) =>
-              m.driver &&
-              m.driver.email === user.email &&
-              m.status === 'completed'
-          );
+          // 🔐 MISSIONS TERMINÉES DU DRIVER CONNECTÉ (filtrées côté serveur)
+          const completed = await getMissions({
+            driver: currentDriver.id,
+            status: 'completed',
+          });
 
           console.log(`📦 ${completed.length} missions terminées trouvées`);
 
@@ -10,7 +10,7 @@ import {
 import { useFocusEffect } from '@react-navigation/native';
 
 import MissionCard from '../../components/MissionCard';
-import { getMissions } from '../../services/api';
+import { getDriverByEmail, getMissions } from '../../services/api';
 import { useAuth } from '../../context/AuthContext';
 
 
@@ -51,12 +51,15 @@ const MissionsScreen = ({ navigation }) => {
     useCallback(() => {
       const loadMissions = async () => {
         try {
-          const missions = await getMissions();
+          // 🔐 DRIVER CONNECTÉ (filtré par email côté serveur)
+          const driver = await getDriverByEmail(user.email);
+          if (!driver) return;
 
-          // 🔐 FILTRAGE PAR EMAIL DU DRIVER CONNECTÉ
-          const myMissions = missions.filter(
-            (m) => m.driver && m.driver.email === user.email
-          );
+          // Seules les missions à venir / en cours sont affichées
+          const myMissions = await getMissions({
+            driver: driver.id,
+            status: 'pending,in_progress',
+          });
 
           const active = myMissions.find(
             (m) => m.status === 'in_progress'
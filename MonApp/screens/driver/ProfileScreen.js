@@ -15,7 +15,7 @@ import { useAuth } from '../../context/AuthContext';
 
 // ⬇️ API DJANGO (OPTIONNEL)
 import {
-  getDrivers,
+  getDriverByEmail,
   getWeeklyStats,
   getNotifications,
 } from '../../services/api';
@@ -54,20 +54,8 @@ export default function ProfileScreen({ navigation }) {
       try {
         if (!user?.email) return;
 
-        const drivers = await getDrivers();
-
-        const matched = drivers.find((d) => {
-          const email =
-            d.email ||
-            d.user?.email ||
-            d.account?.email;
-
-          return (
-            email &&
-            email.toLowerCase().trim() ===
-              user.email.toLowerCase().trim()
-          );
-        });
+        // Email comparé sans tenir compte de la casse, côté serveur
+        const matched = await getDriverByEmail(user.email.trim());
 
         if (!matched) return;
 
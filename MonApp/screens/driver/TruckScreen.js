@@ -9,7 +9,7 @@ import {
 } from 'react-native';
 import { useFocusEffect } from '@react-navigation/native';
 
-import { getMissions } from '../../services/api';
+import { getMissionsPage } from '../../services/api';
 
 // =====================================
 // COULEURS LOCALES (SAFE)
@@ -50,33 +50,20 @@ const TruckScreen = ({ navigation, route }) => {
         try {
           console.log('🔍 Loading truck for driver:', currentDriverId);
 
-          // 📡 RÉCUPÉRER TOUTES LES MISSIONS
-          const missions = await getMissions();
-          console.log('📦 Total missions:', missions.length);
+          // 📡 UNE PAGE DE MISSIONS EN COURS (filtrées côté serveur)
+          // Sans driver ID (mode démo/test), n'importe quelle mission en cours
+          if (!currentDriverId) {
+            console.log('⚠️ Mode démo: aucun driver ID fourni');
+          }
+
+          const page = await getMissionsPage({
+            driver: currentDriverId,
+            status: 'in_progress',
+          });
 
           if (!isActive) return;
 
-          // ✅ SI PAS DE DRIVER ID, CHERCHER N'IMPORTE QUELLE MISSION EN COURS
-          // (Pour le mode démo/test)
-          let myMissionInProgress;
-          
-          if (currentDriverId) {
-            // Mode authentifié: chercher les missions de CE chauffeur
-            myMissionInProgress = missions.find(
-              (m) => {
-                const isInProgress = m.status === 'in_progress';
-                const isMyMission = m.driver?.id === currentDriverId;
-                console.log(`Mission ${m.id}: status=${m.status}, driver=${m.driver?.id}, match=${isInProgress && isMyMission}`);
-                return isInProgress && isMyMission;
-              }
-            );
-          } else {
-            // Mode démo: chercher N'IMPORTE QUELLE mission en cours
-            myMissionInProgress = missions.find(
-              (m) => m.status === 'in_progress'
-            );
-            console.log('⚠️ Mode démo: aucun driver ID fourni');
-          }
+          const myMissionInProgress = page.results[0];
 
           // 🚫 AUCUNE MISSION EN COURS
           if (!myMissionInProgress) {
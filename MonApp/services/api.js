@@ -6,33 +6,86 @@ const API_URL = 'http://192.168.3.50:8000/api';
 // ===============================
 // HELPER REQUEST
 // ===============================
+// Cache ETag des GET : on renvoie If-None-Match et, sur 304,
+// on réutilise la réponse déjà reçue (rien n'a changé côté serveur).
+const etagCache = new Map();
+
 const request = async (endpoint, options = {}) => {
+  const isGet = !options.method || options.method === 'GET';
+  const cached = isGet ? etagCache.get(endpoint) : undefined;
+
   try {
     const response = await fetch(`${API_URL}${endpoint}`, {
       headers: {
         'Content-Type': 'application/json',
+        ...(cached ? { 'If-None-Match': cached.etag } : {}),
         ...(options.headers || {}),
       },
       ...options,
     });
 
+    if (response.status === 304 && cached) {
+      return cached.data;
+    }
+
     if (!response.ok) {
       const errorText = await response.text();
       console.error('API Error:', errorText);
       throw new Error(`HTTP error! status: ${response.status}`);
     }
 
-    return await response.json();
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+
+    if (isGet && etag) {
+      etagCache.set(endpoint, { etag, data });
+    }
+
+    return data;
   } catch (error) {
     console.error('API Error:', error);
     throw error;
   }
 };
 
+// ===============================
+// HELPER LISTES PAGINÉES (CURSEUR)
+// ===============================
+// Le backend renvoie { next, previous, results } sur toutes les listes.
+// requestPage → une seule page ; requestList → suit `next` jusqu'au bout
+// (à réserver aux listes filtrées côté serveur, jamais à une table entière).
+const buildQuery = (params = {}) => {
+  const query = Object.entries(params)
+    .filter(([, value]) => value !== undefined && value !== null && value !== '')
+    .map(([key, value]) => `${encodeURIComponent(key)}=${encodeURIComponent(value)}`)
+    .join('&');
+  return query ? `?${query}` : '';
+};
+
+const requestPage = (endpoint, params = {}) =>
+  request(`${endpoint}${buildQuery(params)}`);
+
+// `next` est une URL absolue : on rejoue son chemin + curseur
+const requestNext = (next) => request(next.replace(/^.*?\/api/, ''));
+
+const requestList = async (endpoint, params = {}) => {
+  let page = await requestPage(endpoint, params);
+  const results = [...(page.results || [])];
+
+  while (page.next) {
+    page = await requestNext(page.next);
+    results.push(...(page.results || []));
+  }
+
+  return results;
+};
+
 // ===============================
 // MISSIONS
 // ===============================
-export const getMissions = () => request('/missions/');
+export const getMissions = (params) => requestList('/missions/', params);
+export const getMissionsPage = (params) => requestPage('/missions/', params);
+export const getNextPage = (next) => requestNext(next);
 export const getMissionById = (id) => request(`/missions/${id}/`);
 
 export const createMission = (data) => {
@@ -86,11 +139,22 @@ export const completeMission = (id) =>
     method: 'POST',
   });
 
+// ===============================
+// DASHBOARD
+// ===============================
+export const getDashboardSummary = () => request('/dashboard/summary/');
+
 // ===============================
 // DRIVERS
 // ===============================
-export const getDrivers = () => request('/drivers/');
+export const getDrivers = (params) => requestList('/drivers/', params);
 export const getDriverById = (id) => request(`/drivers/${id}/`);
+export const getDriverByEmail = async (email) => {
+  const page = await requestPage('/drivers/', { email });
+  return page.results[0] || null;
+};
+export const getDriverStats = (id, params) =>
+  request(`/drivers/${id}/stats/${buildQuery(params)}`);
 
 export const createDriver = (data) =>
   request('/drivers/', {
@@ -104,6 +168,11 @@ export const updateDriver = (id, data) =>
     body: JSON.stringify(data),
   });
 
+export const resetWeeklyHours = () =>
+  request('/drivers/reset_weekly_hours/', {
+    method: 'POST',
+  });
+
 export const deleteDriver = async (id) => {
   try {
     await request(`/drivers/${id}/`, {
@@ -121,7 +190,7 @@ export const deleteDriver = async (id) => {
 // ===============================
 // TRUCKS
 // ===============================
-export const getTrucks = () => request('/trucks/');
+export const getTrucks = (params) => requestList('/trucks/', params);
 export const getTruckById = (id) => request(`/trucks/${id}/`);
 
 export const createTruck = (data) => {
@@ -180,10 +249,10 @@ export const deleteTruck = async (id) => {
 // ===============================
 // FUEL
 // ===============================
-export const getFuelData = () => request('/fuel/');
+export const getFuelData = (params) => requestList('/fuel/', params);
 
 export const getFuelByTruck = (truckId) =>
-  request(`/fuel/?truck=${truckId}`);
+  requestList('/fuel/', { truck: truckId });
 
 /**
  * payload attendu :